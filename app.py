@@ -1,16 +1,34 @@
 from flask import Flask, request, jsonify, session
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 import secrets
+import threading
 import uuid
 import bcrypt
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
+import json
 import logging
 from supabase_service import get_supabase_service
+from session_store import get_session_store
+from questionnaire_registry import build_question_plans, SymptomMatcher
+from risk_scoring import RiskScorer, severity_for
+from response_codec import init_codecs, encode_json, splice_json, spliced_response
+from compression import get_response_compressor, compressed, static_tail
+from frontend import get_frontend_assets
+from password_pool import get_password_pool, PoolSaturated
+from user_directory import get_user_directory, public_profile, SQLAlchemyUserSource, SupabaseUserSource
+from conditional_get import get_etag_cache, questionnaire_etag, list_etag, not_modified, with_etag
+from pagination import parse_page_args, split_page, page_fields
+from projection import (parse_fields, project, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS,
+                        REPORT_FIELDS, REPORT_SUMMARY_FIELDS)
+from report_catalog import build_catalog, recommendation_catalog, EMPTY_ENTRY, STATIC_REPORT_KEYS, DISCLAIMER
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,14 +40,31 @@ try:
 except Exception as e:
     logger.warning(f"Could not load .env file: {e}. Using default configuration.")
 
-app = Flask(__name__)
+# Static files are served by frontend.py with hashed URLs instead of Flask's static route
+app = Flask(__name__, static_folder=None)
 app.secret_key = os.getenv('SECRET_KEY', secrets.token_hex(16))
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', secrets.token_hex(16))
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///aushadham.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-CORS(app, supports_credentials=True)
+# Browsers cache preflight results for CORS_MAX_AGE seconds (Chromium caps this at 7200)
+app.config['CORS_MAX_AGE'] = int(os.getenv('CORS_MAX_AGE', '7200'))
+
+CORS(app, supports_credentials=True, max_age=app.config['CORS_MAX_AGE'])
+# orjson responses with MessagePack negotiation (see response_codec.py)
+init_codecs(app)
+# gzip/brotli for routes marked @compressed (see compression.py)
+response_compressor = get_response_compressor()
+response_compressor.init_app(app)
+# ETags of saved questionnaires and per-user lists (see conditional_get.py)
+etag_cache = get_etag_cache()
+# Same-origin index.html and hashed static assets (see frontend.py)
+frontend_assets = get_frontend_assets(app.root_path)
+if frontend_assets:
+    frontend_assets.init_app(app)
+# bcrypt checks run on a bounded pool; logins beyond its queue get a 503 (see password_pool.py)
+password_pool = get_password_pool()
 db = SQLAlchemy(app)
 jwt = JWTManager(app)
 
@@ -52,13 +87,15 @@ else:
     logger.info("Using SQLAlchemy for database operations")
 
 # Hardcoded Users (instead of database)
-# Password hashes are for 'password123' for all users
+# Password hashes are for 'password123' for all users; precomputed, since bcrypt.hashpw
+# costs ~300 ms per user and would run on every import (each worker and test process)
+PASSWORD123_HASH = '$2b$12$WXNVANR89OjoqktXQGOwCeSVGTg3yc.Wtpk.g5he2l/2iXWc9uG5O'
 HARDCODED_USERS = {
     'user1': {
         'id': 1,
         'username': 'user1',
         'email': 'user1@aushadham.com',
-        'password_hash': bcrypt.hashpw('password123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+        'password_hash': PASSWORD123_HASH,
         'full_name': 'Test User One',
         'phone': '+1234567890',
         'created_at': '2024-01-01T00:00:00'
@@ -67,7 +104,7 @@ HARDCODED_USERS = {
         'id': 2,
         'username': 'user2',
         'email': 'user2@aushadham.com',
-        'password_hash': bcrypt.hashpw('password123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+        'password_hash': PASSWORD123_HASH,
         'full_name': 'Test User Two',
         'phone': '+1234567891',
         'created_at': '2024-01-01T00:00:00'
@@ -76,34 +113,16 @@ HARDCODED_USERS = {
         'id': 3,
         'username': 'user3',
         'email': 'user3@aushadham.com',
-        'password_hash': bcrypt.hashpw('password123'.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+        'password_hash': PASSWORD123_HASH,
         'full_name': 'Test User Three',
         'phone': '+1234567892',
         'created_at': '2024-01-01T00:00:00'
     }
 }
 
-def get_hardcoded_user_by_username(username):
-    """Get hardcoded user by username"""
-    return HARDCODED_USERS.get(username)
-
-def get_hardcoded_user_by_email(email):
-    """Get hardcoded user by email"""
-    for user in HARDCODED_USERS.values():
-        if user['email'] == email:
-            return user
-    return None
-
-def get_hardcoded_user_by_id(user_id):
-    """Get hardcoded user by ID"""
-    for user in HARDCODED_USERS.values():
-        if user['id'] == user_id:
-            return user
-    return None
-
-def check_hardcoded_password(user, password):
-    """Check if password matches the hardcoded user's hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8'))
+def check_user_password(user, password):
+    """Check if password matches the user's hash (raises PoolSaturated)"""
+    return password_pool.check(password, user['password_hash'], 'login')
 
 # Database Models
 class User(db.Model):
@@ -126,8 +145,8 @@ class User(db.Model):
         self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
     
     def check_password(self, password):
-        """Check if the provided password matches the hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        """Check if the provided password matches the hash (raises PoolSaturated)"""
+        return password_pool.check(password, self.password_hash, 'user')
     
     def to_dict(self):
         """Convert user to dictionary (excluding password)"""
@@ -153,18 +172,24 @@ class SavedQuestionnaire(db.Model):
     severity = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        """Convert saved questionnaire to dictionary"""
-        return {
-            'id': self.id,
-            'session_id': self.session_id,
-            'symptom': self.symptom,
-            'initial_description': self.initial_description,
-            'answers': self.answers,
-            'report': self.report,
-            'severity': self.severity,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    # Keyset pagination of a user's questionnaires
+    __table_args__ = (db.Index('ix_saved_questionnaires_user_page', 'user_id', 'created_at', 'id'),)
+    
+    def to_dict(self, fields=None):
+        """Convert saved questionnaire to dictionary (only the given fields, if any)"""
+        data = {name: getattr(self, name) for name in (fields or QUESTIONNAIRE_FIELDS)}
+        if 'created_at' in data:
+            data['created_at'] = self.created_at.isoformat() if self.created_at else None
+        return data
+    
+    @classmethod
+    def load_options(cls, fields):
+        """Query options deferring the columns a projection does not need"""
+        if fields is None:
+            return []
+        # id and created_at are always needed for ETags and cursors
+        needed = set(fields) | {'id', 'created_at'}
+        return [db.defer(getattr(cls, name)) for name in QUESTIONNAIRE_FIELDS if name not in needed]
 
 class UserFeedback(db.Model):
     __tablename__ = 'user_feedback'
@@ -177,6 +202,9 @@ class UserFeedback(db.Model):
     feedback_type = db.Column(db.String(50))  # 'general', 'questionnaire', 'recommendation'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Keyset pagination of a user's feedback
+    __table_args__ = (db.Index('ix_user_feedback_user_page', 'user_id', 'created_at', 'id'),)
+    
     def to_dict(self):
         """Convert feedback to dictionary"""
         return {
@@ -188,6 +216,66 @@ class UserFeedback(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+def questionnaire_columns(fields):
+    """Supabase columns to select for a questionnaire projection"""
+    if fields is None:
+        return QUESTIONNAIRE_FIELDS
+    needed = set(fields) | {'id', 'created_at'}
+    return tuple(name for name in QUESTIONNAIRE_FIELDS if name in needed)
+
+def keyset_page(query, model, limit, after):
+    """Order a query on model newest first and fetch one keyset page plus one look-ahead row"""
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if after is not None:
+        created_at, row_id = after
+        query = query.filter(db.or_(
+            model.created_at < created_at,
+            db.and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.limit(limit + 1).all()
+
+def insert_questionnaire_once(**values):
+    """Insert a saved questionnaire unless its session_id exists, in one statement
+
+    Returns the new row as a dict, or None on conflict. SQLite and PostgreSQL use
+    INSERT ... ON CONFLICT (session_id) DO NOTHING RETURNING; other databases rely on
+    the unique constraint rejecting the duplicate.
+    """
+    dialect = db.engine.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        statement = insert(SavedQuestionnaire).values(**values)\
+            .on_conflict_do_nothing(index_elements=['session_id'])\
+            .returning(SavedQuestionnaire)
+        saved = db.session.scalars(statement).first()
+        # Serialized before commit expires the instance, which would cost a refresh SELECT
+        saved = saved.to_dict() if saved else None
+        db.session.commit()
+        return saved
+    saved = SavedQuestionnaire(**values)
+    db.session.add(saved)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return saved.to_dict()
+
+def questionnaire_belongs_to(questionnaire_id, user_id):
+    """SELECT EXISTS probe for a user's questionnaire, without loading the row"""
+    return db.session.query(db.exists().where(
+        SavedQuestionnaire.id == questionnaire_id, SavedQuestionnaire.user_id == user_id
+    )).scalar()
+
+# Users by id, username and email: hardcoded accounts first, then (with DATABASE_USERS=true)
+# the users table behind a TTL+LRU cache (see user_directory.py). Off by default because
+# registration is disabled and database ids would collide with the hardcoded ones.
+DATABASE_USERS = os.getenv('DATABASE_USERS', 'false').lower() == 'true'
+user_source = None
+if DATABASE_USERS:
+    user_source = SupabaseUserSource(supabase_service) if USE_SUPABASE else SQLAlchemyUserSource(app, db, User)
+user_directory = get_user_directory(HARDCODED_USERS.values(), user_source)
+
 # Comprehensive medical questionnaire knowledge base
 questionnaire_templates = {
     'stomach': {
@@ -1081,64 +1169,151 @@ questionnaire_templates = {
     }
 }
 
+# Keywords mapping a free-text symptom to a template; earlier entries take priority
+symptom_keywords = {
+    'stomach': ['stomach', 'belly', 'abdomen', 'tummy', 'digestive', 'gastric'],
+    'headache': ['head', 'headache', 'migraine', 'temple'],
+    'fever': ['fever', 'temperature', 'hot', 'feverish'],
+    'cough': ['cough', 'coughing', 'throat', 'respiratory'],
+    'cancer': ['cancer', 'tumor', 'tumour', 'malignancy', 'oncology', 'carcinoma', 'lump', 'mass'],
+    'diabetes': ['diabetes', 'diabetic', 'blood sugar', 'glucose', 'insulin', 'hyperglycemia'],
+    'hypertension': ['hypertension', 'high blood pressure', 'blood pressure', 'bp'],
+    'asthma': ['asthma', 'wheezing', 'breathing difficulty', 'difficulty breathing', 'breathlessness', 'shortness of breath'],
+    'arthritis': ['arthritis', 'joint pain', 'joint', 'rheumatoid', 'osteoarthritis']
+}
+
+# Immutable question plans shared by all sessions (see questionnaire_registry.py)
+question_plans = build_question_plans(questionnaire_templates)
+# Default to stomach if no keyword matches
+symptom_matcher = SymptomMatcher(symptom_keywords, default='stomach')
+# Compiled answer -> points tables for risk scoring
+risk_scorer = RiskScorer(question_plans)
+# Frozen recommendation/medication entries keyed by template id (see report_catalog.py)
+report_catalog = build_catalog(recommendation_catalog)
+# Per-process report memoization counters (reported by /health_check)
+report_cache_stats = {'hits': 0, 'misses': 0}
+
+def dynamic_report_fields(report: Dict) -> Dict:
+    """Report members that come from the session rather than the catalog"""
+    return {key: value for key, value in report.items() if key not in STATIC_REPORT_KEYS}
+
 class QuestionnaireSession:
     def __init__(self, session_id: str, symptom: str, initial_description: str):
         self.session_id = session_id
         self.symptom = symptom
         self.initial_description = initial_description
-        self.questions = []
         self.current_index = 0
         self.answers = {}
         self.completed = False
         self.start_time = datetime.now()
+        # Per-session overlay on the shared plan: ids of inserted conditional questions
+        self._inserted = ()
+        # Running assessment, updated on every answer
+        self.risk_score = 0
+        self.answered_count = 0
+        self.severity, self.urgency = severity_for(0)
+        # Memoized report, valid while _report_version == _answers_version
+        self._answers_version = 0
+        self._report = None
+        self._report_json = None
+        self._report_version = -1
         self._build_questions()
     
     def _build_questions(self):
-        """Build the complete question list based on symptom"""
-        template = self._get_template()
-        if template:
-            self.questions = template.get('initial_questions', [])
+        """Attach the shared question plan for the symptom (matched once per session)"""
+        template_key = symptom_matcher.find(self.symptom)
+        self._plan = question_plans[template_key or symptom_matcher.default]
+        self._scoring = risk_scorer.tables[self._plan.key]
+        # Symptoms that only fell back to the default template get no recommendations
+        self._catalog_entry = report_catalog.get(template_key, EMPTY_ENTRY)
+    
+    @property
+    def questions(self):
+        """Ordered questions for this session (shared plan plus inserted conditionals)"""
+        return self._plan.sequence(self._inserted)
+    
+    def question_index(self, question_id: str) -> Optional[int]:
+        """Get the position of a question in this session's sequence"""
+        return self._plan.index_of(self._inserted).get(question_id)
     
-    def _get_template(self):
-        """Get the appropriate questionnaire template"""
-        symptom_keywords = {
-            'stomach': ['stomach', 'belly', 'abdomen', 'tummy', 'digestive', 'gastric'],
-            'headache': ['head', 'headache', 'migraine', 'temple'],
-            'fever': ['fever', 'temperature', 'hot', 'feverish'],
-            'cough': ['cough', 'coughing', 'throat', 'respiratory'],
-            'cancer': ['cancer', 'tumor', 'tumour', 'malignancy', 'oncology', 'carcinoma', 'lump', 'mass'],
-            'diabetes': ['diabetes', 'diabetic', 'blood sugar', 'glucose', 'insulin', 'hyperglycemia'],
-            'hypertension': ['hypertension', 'high blood pressure', 'blood pressure', 'bp'],
-            'asthma': ['asthma', 'wheezing', 'breathing difficulty', 'difficulty breathing', 'breathlessness', 'shortness of breath'],
-            'arthritis': ['arthritis', 'joint pain', 'joint', 'rheumatoid', 'osteoarthritis']
+    def to_state(self) -> Dict:
+        """Serialize the session to compact JSON-compatible state"""
+        state = {
+            'id': self.session_id,
+            'sym': self.symptom,
+            'desc': self.initial_description,
+            'tpl': self._plan.key,
+            'cat': self._catalog_entry.key,
+            'ins': list(self._inserted),
+            'i': self.current_index,
+            'a': self.answers,
+            'r': self.risk_score,
+            'n': self.answered_count,
+            'c': self.completed,
+            'st': self.start_time.timestamp(),
+            'v': self._answers_version
         }
-        
-        for key, keywords in symptom_keywords.items():
-            if any(word in self.symptom.lower() for word in keywords):
-                return questionnaire_templates.get(key)
-        
-        # Default to stomach if no match
-        return questionnaire_templates.get('stomach')
+        # Keep a current report so a shared backend still serves it without a rebuild
+        if self._report is not None and self._report_version == self._answers_version:
+            state['rpt'] = dynamic_report_fields(self._report)
+        return state
     
-    def get_current_question(self):
-        """Get the current question"""
-        if self.current_index < len(self.questions):
-            question = self.questions[self.current_index]
-            return {
-                'question': question['question'],
-                'type': question['type'],
-                'options': question.get('options', ['Yes', 'No']),
-                'current': self.current_index + 1,
-                'total': len(self.questions),
-                'progress': ((self.current_index + 1) / len(self.questions)) * 100
-            }
+    @classmethod
+    def from_state(cls, state: Dict) -> 'QuestionnaireSession':
+        """Rebuild a session from state produced by to_state()"""
+        session = cls.__new__(cls)
+        session.session_id = state['id']
+        session.symptom = state['sym']
+        session.initial_description = state['desc']
+        session.current_index = state['i']
+        session.answers = state['a']
+        session.completed = state['c']
+        session.start_time = datetime.fromtimestamp(state['st'])
+        session._plan = question_plans[state['tpl']]
+        session._scoring = risk_scorer.tables[session._plan.key]
+        session._catalog_entry = report_catalog.get(state['cat'], EMPTY_ENTRY)
+        session._inserted = tuple(state['ins'])
+        session.risk_score = state['r']
+        session.answered_count = state['n']
+        session.severity, session.urgency = severity_for(session.risk_score)
+        session._answers_version = state.get('v', 0)
+        report = state.get('rpt')
+        session._report = {**report, **session._catalog_entry.static_fields()} if report else None
+        session._report_json = None
+        session._report_version = session._answers_version if report else -1
+        return session
+    
+    def get_plan_json(self) -> str:
+        """Get the pre-serialized decision graph of this session's question plan"""
+        return self._plan.graph_json
+    
+    def get_current_question_json(self) -> str:
+        """Get the current question as JSON, splicing progress into the pre-serialized payload"""
+        questions = self.questions
+        if self.current_index < len(questions):
+            fragment = self._plan.payload_fragments[questions[self.current_index]['id']]
+            current = self.current_index + 1
+            progress = (current / len(questions)) * 100
+            return '{%s,"current":%d,"total":%d,"progress":%r}' % (fragment, current, len(questions), progress)
+        return 'null'
+    
+    def answer_error(self, answer) -> Optional[str]:
+        """Why an answer cannot be recorded for the current question, or None if it can"""
+        if not isinstance(answer, str) or not answer.strip():
+            return 'answer must be a non-empty string'
+        questions = self.questions
+        if self.current_index < len(questions):
+            question_id = questions[self.current_index]['id']
+            if not self._plan.accepts(question_id, answer):
+                return f'Invalid answer for {question_id}: {answer}'
         return None
     
     def submit_answer(self, answer: str):
         """Submit answer for current question"""
-        if self.current_index < len(self.questions):
-            question_id = self.questions[self.current_index]['id']
-            self.answers[question_id] = answer
+        questions = self.questions
+        if self.current_index < len(questions):
+            question_id = questions[self.current_index]['id']
+            self._record_answer(question_id, answer)
             
             # Check for conditional questions
             self._add_conditional_questions(question_id, answer)
@@ -1146,16 +1321,75 @@ class QuestionnaireSession:
             return True
         return False
     
+    def _record_answer(self, question_id: str, answer: str):
+        """Store an answer and apply its delta to the running assessment"""
+        if question_id in self.answers:
+            previous = self.answers[question_id]
+            self.risk_score -= self._scoring.points_for(question_id, previous)
+            self.answered_count -= previous != 'Skipped'
+        self.answers[question_id] = answer
+        self.risk_score += self._scoring.points_for(question_id, answer)
+        self.answered_count += answer != 'Skipped'
+        self.severity, self.urgency = severity_for(self.risk_score)
+        self._answers_version += 1
+    
+    def get_assessment(self) -> Dict:
+        """Get the running risk score and severity band"""
+        return {
+            'risk_score': self.risk_score,
+            'severity': self.severity,
+            'urgency': self.urgency,
+            'questions_answered': self.answered_count
+        }
+    
+    def apply_action(self, action: str, answer: Optional[str] = None) -> bool:
+        """Apply a /submit_answer action: 'next', 'previous' or 'skip'"""
+        # Submit answer if not navigating back
+        if action != 'previous':
+            self.submit_answer(answer)
+        
+        # Handle navigation
+        if action == 'next':
+            return self.next_question()
+        elif action == 'previous':
+            return self.previous_question()
+        elif action == 'skip':
+            return self.skip_question()
+        return True
+    
+    def invalid_answers(self, answers: Dict[str, str]) -> List[str]:
+        """Ids of plan questions whose answer is neither one of their options nor 'Skipped'"""
+        return [
+            question_id for question_id, answer in answers.items()
+            if question_id in self._plan.questions_by_id and answer != 'Skipped'
+            and not self._plan.accepts(question_id, answer)
+        ]
+    
+    def apply_answers(self, answers: Dict[str, str]) -> List[str]:
+        """Apply a whole set of answers in plan order and complete the session
+        
+        Conditional questions are expanded as their parents are answered.
+        Returns the ids of answers that did not match a question in the resulting sequence.
+        Raises ValueError, without changing the session, if any answer is invalid.
+        """
+        invalid = self.invalid_answers(answers)
+        if invalid:
+            raise ValueError(f"Invalid answers for: {', '.join(invalid)}")
+        index = 0
+        while index < len(self.questions):
+            question_id = self.questions[index]['id']
+            if question_id in answers:
+                self.current_index = index
+                self.submit_answer(answers[question_id])
+            index += 1
+        
+        self.current_index = len(self.questions) - 1
+        self.next_question()
+        return [question_id for question_id in answers if self.question_index(question_id) is None]
+    
     def _add_conditional_questions(self, question_id: str, answer: str):
-        """Add conditional questions based on answer"""
-        template = self._get_template()
-        if template and 'conditional_questions' in template:
-            conditionals = template['conditional_questions'].get(question_id, {})
-            if answer.lower() in conditionals:
-                new_questions = conditionals[answer.lower()]
-                # Insert new questions after current one
-                for i, q in enumerate(new_questions):
-                    self.questions.insert(self.current_index + 1 + i, q)
+        """Add conditional questions based on answer (idempotent; the shared plan is never mutated)"""
+        self._inserted = self._plan.expand(self._inserted, question_id, answer)
     
     def next_question(self):
         """Move to next question"""
@@ -1164,6 +1398,8 @@ class QuestionnaireSession:
             return True
         else:
             self.completed = True
+            # Build the report now so the first /get_report is a cache hit
+            self.generate_report()
             return False
     
     def previous_question(self):
@@ -1177,196 +1413,79 @@ class QuestionnaireSession:
         """Skip current question"""
         if self.current_index < len(self.questions):
             question_id = self.questions[self.current_index]['id']
-            self.answers[question_id] = 'Skipped'
+            self._record_answer(question_id, 'Skipped')
             return self.next_question()
         return False
     
     def generate_report(self):
+        """Get the report, rebuilding it only when answers changed since the last build"""
+        if self._report is not None and self._report_version == self._answers_version:
+            report_cache_stats['hits'] += 1
+            return self._report
+        report_cache_stats['misses'] += 1
+        self._report = self._build_report()
+        self._report_json = None
+        self._report_version = self._answers_version
+        return self._report
+    
+    def generate_report_json(self) -> str:
+        """Get the report as JSON, splicing in the catalog's pre-encoded static fragment"""
+        report = self.generate_report()
+        if self._report_json is None:
+            self._report_json = self._catalog_entry.splice(encode_json(dynamic_report_fields(report)))
+        return self._report_json
+    
+    def get_report_static_json(self) -> str:
+        """Get the static suffix every generate_report_json() result ends with"""
+        return self._catalog_entry.fragment + '}'
+    
+    def _build_report(self):
         """Generate comprehensive report"""
-        template = self._get_template()
-        
-        # Analyze answers for risk assessment
-        risk_score = 0
-        recommendations = []
-        medications = []
+        questions = self.questions
         
-        for question in self.questions:
-            answer = self.answers.get(question['id'], 'Not answered')
-            weight = question.get('weight', 'low')
-            
-            # Calculate risk based on certain answers
-            if answer.lower() in ['yes', 'severe', 'more than 3 days', 'above 103°f', '7-9 (severe)', '10 (unbearable)']:
-                if weight == 'high':
-                    risk_score += 3
-                elif weight == 'medium':
-                    risk_score += 2
-                else:
-                    risk_score += 1
+        # Risk assessment is maintained incrementally by _record_answer
+        risk_score = self.risk_score
+        severity = self.severity
+        urgency = self.urgency
         
-        # Determine severity
-        if risk_score >= 15:
-            severity = 'High'
-            urgency = 'Seek immediate medical attention'
-        elif risk_score >= 8:
-            severity = 'Moderate'
-            urgency = 'Consult a doctor within 24 hours'
-        else:
-            severity = 'Low'
-            urgency = 'Monitor symptoms, see doctor if worsens'
-        
-        # Generate recommendations based on symptom type
-        if 'stomach' in self.symptom.lower():
-            recommendations = [
-                'Stay hydrated with small sips of water',
-                'Eat bland foods (BRAT diet: Bananas, Rice, Applesauce, Toast)',
-                'Avoid dairy, caffeine, and fatty foods',
-                'Rest and avoid strenuous activities'
-            ]
-            medications = [
-                {'name': 'Antacids (Tums, Mylanta)', 'purpose': 'For acid reflux or indigestion'},
-                {'name': 'Bismuth subsalicylate (Pepto-Bismol)', 'purpose': 'For general stomach upset'},
-                {'name': 'Simethicone (Gas-X)', 'purpose': 'For gas and bloating'}
-            ]
-        elif 'head' in self.symptom.lower():
-            recommendations = [
-                'Rest in a quiet, dark room',
-                'Apply cold compress to forehead',
-                'Stay hydrated',
-                'Practice relaxation techniques',
-                'Maintain regular sleep schedule'
-            ]
-            medications = [
-                {'name': 'Acetaminophen (Tylenol)', 'purpose': 'For mild to moderate pain'},
-                {'name': 'Ibuprofen (Advil, Motrin)', 'purpose': 'For inflammation and pain'},
-                {'name': 'Aspirin', 'purpose': 'For tension headaches'}
-            ]
-        elif 'fever' in self.symptom.lower():
-            recommendations = [
-                'Rest and get plenty of sleep',
-                'Stay hydrated with water and electrolyte drinks',
-                'Use cool compresses',
-                'Wear light clothing',
-                'Monitor temperature regularly'
-            ]
-            medications = [
-                {'name': 'Acetaminophen (Tylenol)', 'purpose': 'To reduce fever'},
-                {'name': 'Ibuprofen (Advil, Motrin)', 'purpose': 'To reduce fever and body aches'}
-            ]
-        elif 'cough' in self.symptom.lower():
-            recommendations = [
-                'Stay hydrated to thin mucus',
-                'Use a humidifier',
-                'Gargle with warm salt water',
-                'Avoid irritants like smoke',
-                'Elevate head while sleeping'
-            ]
-            medications = [
-                {'name': 'Dextromethorphan (Robitussin)', 'purpose': 'For dry cough'},
-                {'name': 'Guaifenesin (Mucinex)', 'purpose': 'For productive cough'},
-                {'name': 'Throat lozenges', 'purpose': 'For throat irritation'}
-            ]
-        elif 'cancer' in self.symptom.lower() or 'tumor' in self.symptom.lower():
-            recommendations = [
-                'Schedule an appointment with a healthcare provider immediately',
-                'Keep a detailed symptom diary',
-                'Prepare questions for your doctor visit',
-                'Bring a family member or friend to appointments',
-                'Request appropriate screening tests',
-                'Do not delay seeking medical attention'
-            ]
-            medications = [
-                {'name': 'Consult oncologist', 'purpose': 'Professional evaluation and treatment plan required'},
-                {'name': 'Screening tests', 'purpose': 'May include blood work, imaging, or biopsy as recommended'}
-            ]
-        elif 'diabetes' in self.symptom.lower() or 'blood sugar' in self.symptom.lower():
-            recommendations = [
-                'Monitor blood glucose levels regularly',
-                'Follow a balanced diet - limit simple carbohydrates',
-                'Exercise regularly (30 minutes daily)',
-                'Maintain a healthy weight',
-                'Stay hydrated',
-                'Get regular check-ups and A1C tests',
-                'Check feet daily for cuts or sores'
-            ]
-            medications = [
-                {'name': 'Metformin', 'purpose': 'First-line medication for Type 2 diabetes (prescription required)'},
-                {'name': 'Insulin', 'purpose': 'For Type 1 diabetes and some Type 2 cases (prescription required)'},
-                {'name': 'Blood glucose meter', 'purpose': 'For self-monitoring'}
-            ]
-        elif 'hypertension' in self.symptom.lower() or 'blood pressure' in self.symptom.lower():
-            recommendations = [
-                'Monitor blood pressure regularly at home',
-                'Reduce salt intake (less than 2,300 mg/day)',
-                'Maintain a healthy weight',
-                'Exercise regularly (150 minutes/week)',
-                'Limit alcohol consumption',
-                'Manage stress through relaxation techniques',
-                'Quit smoking if applicable',
-                'Follow DASH diet (Dietary Approaches to Stop Hypertension)'
-            ]
-            medications = [
-                {'name': 'ACE inhibitors or ARBs', 'purpose': 'First-line blood pressure medication (prescription required)'},
-                {'name': 'Diuretics', 'purpose': 'Help reduce fluid retention (prescription required)'},
-                {'name': 'Home blood pressure monitor', 'purpose': 'For regular monitoring'}
-            ]
-        elif 'asthma' in self.symptom.lower():
-            recommendations = [
-                'Keep track of triggers and avoid them',
-                'Use air purifiers to reduce allergens',
-                'Take medications as prescribed',
-                'Have an asthma action plan',
-                'Get regular check-ups',
-                'Get annual flu vaccination',
-                'Avoid smoke and air pollution',
-                'Use proper inhaler technique'
-            ]
-            medications = [
-                {'name': 'Albuterol (rescue inhaler)', 'purpose': 'For quick relief of symptoms (prescription required)'},
-                {'name': 'Inhaled corticosteroids', 'purpose': 'For long-term control (prescription required)'},
-                {'name': 'Peak flow meter', 'purpose': 'To monitor lung function'}
-            ]
-        elif 'arthritis' in self.symptom.lower() or 'joint' in self.symptom.lower():
-            recommendations = [
-                'Stay physically active with low-impact exercises',
-                'Maintain a healthy weight to reduce joint stress',
-                'Apply heat or cold therapy',
-                'Use assistive devices if needed',
-                'Practice gentle stretching',
-                'Get adequate rest',
-                'Consider physical therapy',
-                'Protect joints during activities'
-            ]
-            medications = [
-                {'name': 'Acetaminophen (Tylenol)', 'purpose': 'For mild to moderate pain'},
-                {'name': 'NSAIDs (Ibuprofen, Naproxen)', 'purpose': 'For pain and inflammation'},
-                {'name': 'Topical pain relievers', 'purpose': 'For localized joint pain'}
-            ]
+        # Static recommendations and medications for the matched template
+        catalog_entry = self._catalog_entry
         
         return {
             'session_id': self.session_id,
             'symptom': self.symptom,
             'initial_description': self.initial_description,
             'assessment_date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-            'questions_answered': len([a for a in self.answers.values() if a != 'Skipped']),
-            'total_questions': len(self.questions),
+            'questions_answered': self.answered_count,
+            'total_questions': len(questions),
             'severity': severity,
             'urgency': urgency,
             'risk_score': risk_score,
-            'recommendations': recommendations,
-            'suggested_medications': medications,
-            'answers': self.answers,
+            'recommendations': catalog_entry.recommendations,
+            'suggested_medications': catalog_entry.medications,
+            'answers': dict(self.answers),
             'detailed_answers': [
                 {
                     'question': q['question'],
                     'answer': self.answers.get(q['id'], 'Not answered'),
-                    'importance': q.get('weight', 'low')
-                } for q in self.questions
+                    'importance': q['weight']
+                } for q in questions
             ],
-            'disclaimer': 'This assessment is for informational purposes only and does not replace professional medical advice. Please consult a healthcare provider for proper diagnosis and treatment.'
+            'disclaimer': DISCLAIMER
         }
 
-# Session storage
-sessions: Dict[str, QuestionnaireSession] = {}
+def question_response(session, **fields):
+    """JSON response with the session's pre-serialized current question spliced in"""
+    return spliced_response(fields, question=session.get_current_question_json())
+
+def report_response(session, **fields):
+    """JSON response with the session's report spliced in as the last member"""
+    response = spliced_response(fields, report=session.generate_report_json())
+    # The catalog part of the report closes the body; its compressed form is cached
+    return static_tail(response, session.get_report_static_json() + '}')
+
+# Session storage (bounded, expiring, optionally shared across workers; see session_store.py)
+sessions = get_session_store(QuestionnaireSession.to_state, QuestionnaireSession.from_state)
 
 # Authentication Routes
 @app.route("/register", methods=["POST"])
@@ -1389,12 +1508,10 @@ def login():
         if not username or not password:
             return jsonify({'success': False, 'error': 'Username and password are required'}), 400
         
-        # Find hardcoded user by username or email
-        user = get_hardcoded_user_by_username(username)
-        if not user:
-            user = get_hardcoded_user_by_email(username)
+        # Find user by username or email
+        user = user_directory.by_login(username)
         
-        if not user or not check_hardcoded_password(user, password):
+        if not user or not check_user_password(user, password):
             return jsonify({'success': False, 'error': 'Invalid username or password'}), 401
         
         # Create access token
@@ -1403,16 +1520,13 @@ def login():
         return jsonify({
             'success': True,
             'message': 'Login successful',
-            'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email'],
-                'full_name': user.get('full_name', ''),
-                'phone': user.get('phone', ''),
-                'created_at': user.get('created_at')
-            },
+            'user': public_profile(user),
             'access_token': access_token
         })
+    except PoolSaturated as e:
+        logger.warning("Login rejected: password pool saturated")
+        return jsonify({'success': False, 'error': 'Too many login attempts right now. Please retry shortly.'}), \
+            503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         return jsonify({'success': False, 'error': 'Login failed. Please try again.'}), 400
@@ -1424,21 +1538,14 @@ def get_profile():
     try:
         user_id = get_jwt_identity()
         
-        # Get hardcoded user by ID
-        user = get_hardcoded_user_by_id(user_id)
+        # Memory hit for hardcoded and recently seen users
+        user = user_directory.by_id(user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
         return jsonify({
             'success': True,
-            'user': {
-                'id': user['id'],
-                'username': user['username'],
-                'email': user['email'],
-                'full_name': user.get('full_name', ''),
-                'phone': user.get('phone', ''),
-                'created_at': user.get('created_at')
-            }
+            'user': public_profile(user)
         })
     except Exception as e:
         logger.error(f"Get profile error: {str(e)}")
@@ -1451,15 +1558,29 @@ def update_profile():
     try:
         user_id = get_jwt_identity()
         
-        # Profile updates are disabled for hardcoded users
-        user = get_hardcoded_user_by_id(user_id)
+        user = user_directory.by_id(user_id)
         if not user:
             return jsonify({'success': False, 'error': 'User not found'}), 404
         
+        # Profile updates are disabled for hardcoded users
+        if user_directory.is_static(user_id):
+            return jsonify({
+                'success': False,
+                'error': 'Profile updates are disabled for test accounts'
+            }), 403
+        
+        data = request.json or {}
+        updates = {name: data[name] for name in ('full_name', 'phone', 'email') if name in data}
+        if not updates:
+            return jsonify({'success': False, 'error': 'Nothing to update (full_name, phone, email)'}), 400
+        
+        # Drops the cached profile so the next /profile reads the update
+        user = user_directory.update_user(user_id, updates)
         return jsonify({
-            'success': False,
-            'error': 'Profile updates are disabled for test accounts'
-        }), 403
+            'success': True,
+            'message': 'Profile updated successfully',
+            'user': public_profile(user)
+        })
     except Exception as e:
         logger.error(f"Profile update error: {str(e)}")
         return jsonify({'success': False, 'error': 'Failed to update profile.'}), 400
@@ -1474,22 +1595,16 @@ def save_questionnaire():
         data = request.json
         session_id = data.get('session_id')
         
-        if not session_id or session_id not in sessions:
+        session_obj = sessions.get(session_id)
+        if not session_obj:
             return jsonify({'success': False, 'error': 'Invalid session'}), 404
         
-        session_obj = sessions[session_id]
-        
-        # Generate report if not already done
+        # Reuses the memoized report unless answers changed
         report = session_obj.generate_report()
         
         if USE_SUPABASE:
-            # Check if already saved
-            existing = supabase_service.get_questionnaire_by_session_id(session_id)
-            if existing:
-                return jsonify({'success': False, 'error': 'Questionnaire already saved'}), 409
-            
-            # Save to Supabase
-            saved = supabase_service.save_questionnaire(
+            # Save to Supabase; None if this session was already saved
+            saved = supabase_service.save_questionnaire_once(
                 user_id=user_id,
                 session_id=session_id,
                 symptom=session_obj.symptom,
@@ -1498,6 +1613,10 @@ def save_questionnaire():
                 report=report,
                 severity=report.get('severity', 'Unknown')
             )
+            if not saved:
+                return jsonify({'success': False, 'error': 'Questionnaire already saved'}), 409
+            
+            etag_cache.invalidate(user_id)
             
             return jsonify({
                 'success': True,
@@ -1514,13 +1633,8 @@ def save_questionnaire():
                 }
             }), 201
         else:
-            # Check if already saved
-            existing = SavedQuestionnaire.query.filter_by(session_id=session_id).first()
-            if existing:
-                return jsonify({'success': False, 'error': 'Questionnaire already saved'}), 409
-            
-            # Save to database
-            saved = SavedQuestionnaire(
+            # Save to database; None if this session was already saved
+            saved = insert_questionnaire_once(
                 user_id=user_id,
                 session_id=session_id,
                 symptom=session_obj.symptom,
@@ -1529,14 +1643,15 @@ def save_questionnaire():
                 report=report,
                 severity=report.get('severity', 'Unknown')
             )
+            if not saved:
+                return jsonify({'success': False, 'error': 'Questionnaire already saved'}), 409
             
-            db.session.add(saved)
-            db.session.commit()
+            etag_cache.invalidate(user_id)
             
             return jsonify({
                 'success': True,
                 'message': 'Questionnaire saved successfully',
-                'questionnaire': saved.to_dict()
+                'questionnaire': saved
             }), 201
     except Exception as e:
         if not USE_SUPABASE:
@@ -1545,80 +1660,118 @@ def save_questionnaire():
         return jsonify({'success': False, 'error': 'Failed to save questionnaire.'}), 400
 
 @app.route("/my_questionnaires", methods=["GET"])
+@compressed
 @jwt_required()
 def get_my_questionnaires():
-    """Get all questionnaires for the current user"""
+    """Get the current user's questionnaires, newest first, one page at a time"""
     try:
         user_id = get_jwt_identity()
+        try:
+            limit, after = parse_page_args(request.args, parse_datetime=not USE_SUPABASE)
+            fields = parse_fields(request.args, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Revalidation from this worker's ETag cache needs no database query
+        etag = etag_cache.get(user_id, 'list')
+        if etag_cache.check(etag):
+            return not_modified(etag)
         
         if USE_SUPABASE:
-            questionnaires = supabase_service.get_user_questionnaires(user_id)
-            formatted_questionnaires = [
-                {
-                    'id': q['id'],
-                    'session_id': q['session_id'],
-                    'symptom': q['symptom'],
-                    'initial_description': q.get('initial_description'),
-                    'answers': q['answers'],
-                    'report': q.get('report'),
-                    'severity': q.get('severity'),
-                    'created_at': q.get('created_at')
-                } for q in questionnaires
-            ]
+            fingerprint = supabase_service.get_user_questionnaires_fingerprint(user_id)
+        else:
+            fingerprint = db.session.query(
+                db.func.count(SavedQuestionnaire.id), db.func.max(SavedQuestionnaire.id),
+                db.func.max(SavedQuestionnaire.created_at)
+            ).filter_by(user_id=user_id).one()
+        if fingerprint is not None:
+            etag = etag_cache.put(user_id, 'list', None, list_etag(user_id, tuple(fingerprint)))
+            if etag_cache.check(etag):
+                return not_modified(etag)
+        
+        # The fingerprint query doubles as the total count
+        count = fingerprint[0] if fingerprint is not None else None
+        
+        if USE_SUPABASE:
+            questionnaires, next_cursor = split_page(
+                supabase_service.get_user_questionnaires(user_id, limit + 1, after, questionnaire_columns(fields)),
+                limit, lambda q: (q['created_at'], q['id'])
+            )
+            formatted_questionnaires = [project(q, fields or QUESTIONNAIRE_FIELDS) for q in questionnaires]
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'questionnaires': formatted_questionnaires,
-                'count': len(formatted_questionnaires)
+                **page_fields(count, limit, next_cursor)
             })
         else:
-            questionnaires = SavedQuestionnaire.query.filter_by(user_id=user_id).order_by(SavedQuestionnaire.created_at.desc()).all()
+            query = SavedQuestionnaire.query.options(*SavedQuestionnaire.load_options(fields)).filter_by(user_id=user_id)
+            questionnaires, next_cursor = split_page(
+                keyset_page(query, SavedQuestionnaire, limit, after),
+                limit, lambda q: (q.created_at, q.id)
+            )
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
-                'questionnaires': [q.to_dict() for q in questionnaires],
-                'count': len(questionnaires)
+                'questionnaires': [q.to_dict(fields) for q in questionnaires],
+                **page_fields(count, limit, next_cursor)
             })
+        return with_etag(response, etag) if fingerprint is not None else response
     except Exception as e:
         logger.error(f"Get questionnaires error: {str(e)}")
         return jsonify({'success': False, 'error': 'Failed to retrieve questionnaires.'}), 400
 
 @app.route("/my_questionnaires/<int:questionnaire_id>", methods=["GET"])
+@compressed
 @jwt_required()
 def get_questionnaire_detail(questionnaire_id):
     """Get details of a specific questionnaire"""
     try:
         user_id = get_jwt_identity()
+        try:
+            fields = parse_fields(request.args, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Saved questionnaires never change, so a cached ETag stays valid until deletion
+        etag = etag_cache.get(user_id, 'detail', questionnaire_id)
+        if etag_cache.check(etag):
+            return not_modified(etag)
         
         if USE_SUPABASE:
-            questionnaire = supabase_service.get_questionnaire_by_id(questionnaire_id, user_id)
+            questionnaire = supabase_service.get_questionnaire_by_id(
+                questionnaire_id, user_id, questionnaire_columns(fields)
+            )
             
             if not questionnaire:
                 return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
-            return jsonify({
+            etag = etag_cache.put(user_id, 'detail', questionnaire_id,
+                                  questionnaire_etag(questionnaire['id'], questionnaire.get('created_at')))
+            if etag_cache.check(etag):
+                return not_modified(etag)
+            
+            response = jsonify({
                 'success': True,
-                'questionnaire': {
-                    'id': questionnaire['id'],
-                    'session_id': questionnaire['session_id'],
-                    'symptom': questionnaire['symptom'],
-                    'initial_description': questionnaire.get('initial_description'),
-                    'answers': questionnaire['answers'],
-                    'report': questionnaire.get('report'),
-                    'severity': questionnaire.get('severity'),
-                    'created_at': questionnaire.get('created_at')
-                }
+                'questionnaire': project(questionnaire, fields or QUESTIONNAIRE_FIELDS)
             })
         else:
-            questionnaire = SavedQuestionnaire.query.filter_by(id=questionnaire_id, user_id=user_id).first()
+            questionnaire = SavedQuestionnaire.query.options(*SavedQuestionnaire.load_options(fields))\
+                .filter_by(id=questionnaire_id, user_id=user_id).first()
             
             if not questionnaire:
                 return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
-            return jsonify({
+            etag = etag_cache.put(user_id, 'detail', questionnaire_id,
+                                  questionnaire_etag(questionnaire.id, questionnaire.created_at))
+            if etag_cache.check(etag):
+                return not_modified(etag)
+            
+            response = jsonify({
                 'success': True,
-                'questionnaire': questionnaire.to_dict()
+                'questionnaire': questionnaire.to_dict(fields)
             })
+        return with_etag(response, etag)
     except Exception as e:
         logger.error(f"Get questionnaire detail error: {str(e)}")
         return jsonify({'success': False, 'error': 'Failed to retrieve questionnaire.'}), 400
@@ -1631,25 +1784,27 @@ def delete_questionnaire(questionnaire_id):
         user_id = get_jwt_identity()
         
         if USE_SUPABASE:
-            questionnaire = supabase_service.get_questionnaire_by_id(questionnaire_id, user_id)
-            
-            if not questionnaire:
+            if not supabase_service.delete_questionnaire(questionnaire_id, user_id):
                 return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
-            supabase_service.delete_questionnaire(questionnaire_id, user_id)
+            etag_cache.invalidate(user_id, questionnaire_id)
             
             return jsonify({
                 'success': True,
                 'message': 'Questionnaire deleted successfully'
             })
         else:
-            questionnaire = SavedQuestionnaire.query.filter_by(id=questionnaire_id, user_id=user_id).first()
-            
-            if not questionnaire:
+            # One DELETE; the row count tells whether it existed
+            result = db.session.execute(
+                db.delete(SavedQuestionnaire)
+                .where(SavedQuestionnaire.id == questionnaire_id, SavedQuestionnaire.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            if result.rowcount == 0:
                 return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
-            db.session.delete(questionnaire)
-            db.session.commit()
+            etag_cache.invalidate(user_id, questionnaire_id)
             
             return jsonify({
                 'success': True,
@@ -1682,8 +1837,7 @@ def submit_feedback():
         if USE_SUPABASE:
             # If questionnaire_id is provided, verify it belongs to the user
             if questionnaire_id:
-                questionnaire = supabase_service.get_questionnaire_by_id(questionnaire_id, user_id)
-                if not questionnaire:
+                if not supabase_service.questionnaire_belongs_to(questionnaire_id, user_id):
                     return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
             feedback = supabase_service.create_feedback(
@@ -1709,8 +1863,7 @@ def submit_feedback():
         else:
             # If questionnaire_id is provided, verify it belongs to the user
             if questionnaire_id:
-                questionnaire = SavedQuestionnaire.query.filter_by(id=questionnaire_id, user_id=user_id).first()
-                if not questionnaire:
+                if not questionnaire_belongs_to(questionnaire_id, user_id):
                     return jsonify({'success': False, 'error': 'Questionnaire not found'}), 404
             
             feedback = UserFeedback(
@@ -1738,12 +1891,19 @@ def submit_feedback():
 @app.route("/my_feedback", methods=["GET"])
 @jwt_required()
 def get_my_feedback():
-    """Get all feedback submitted by the current user"""
+    """Get feedback submitted by the current user, newest first, one page at a time"""
     try:
         user_id = get_jwt_identity()
+        try:
+            limit, after = parse_page_args(request.args, parse_datetime=not USE_SUPABASE)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         if USE_SUPABASE:
-            feedback_list = supabase_service.get_user_feedback(user_id)
+            feedback_list, next_cursor = split_page(
+                supabase_service.get_user_feedback(user_id, limit + 1, after),
+                limit, lambda f: (f['created_at'], f['id'])
+            )
             formatted_feedback = [
                 {
                     'id': f['id'],
@@ -1758,15 +1918,20 @@ def get_my_feedback():
             return jsonify({
                 'success': True,
                 'feedback': formatted_feedback,
-                'count': len(formatted_feedback)
+                **page_fields(supabase_service.count_user_feedback(user_id), limit, next_cursor)
             })
         else:
-            feedback_list = UserFeedback.query.filter_by(user_id=user_id).order_by(UserFeedback.created_at.desc()).all()
+            feedback_list, next_cursor = split_page(
+                keyset_page(UserFeedback.query.filter_by(user_id=user_id), UserFeedback, limit, after),
+                limit, lambda f: (f.created_at, f.id)
+            )
+            # Separate COUNT(*) rather than counting loaded rows
+            count = db.session.query(db.func.count(UserFeedback.id)).filter_by(user_id=user_id).scalar()
             
             return jsonify({
                 'success': True,
                 'feedback': [f.to_dict() for f in feedback_list],
-                'count': len(feedback_list)
+                **page_fields(count, limit, next_cursor)
             })
     except Exception as e:
         logger.error(f"Get feedback error: {str(e)}")
@@ -1774,7 +1939,11 @@ def get_my_feedback():
 
 @app.route("/", methods=["GET"])
 def home():
-    return jsonify({
+    if frontend_assets and frontend_assets.wants_html():
+        response = frontend_assets.index_response()
+        response.vary.add('Accept')
+        return response
+    response = jsonify({
         "status": "Medical Questionnaire API is running!",
         "version": "4.0",
         "features": ["User Authentication", "Save Questionnaires", "Feedback System"],
@@ -1787,6 +1956,8 @@ def home():
             "questionnaire": [
                 "/start_questionnaire (POST)",
                 "/submit_answer (POST)", 
+                "/submit_answers (POST)",
+                "/complete_questionnaire (POST)",
                 "/get_current_question (POST)",
                 "/get_report (POST)",
                 "/save_questionnaire (POST) [Auth Required]",
@@ -1797,35 +1968,49 @@ def home():
                 "/feedback (POST) [Auth Required]",
                 "/my_feedback (GET) [Auth Required]"
             ],
+            "websocket": [
+                "/ws/questionnaire (start, resume, answer, skip, previous, question, report)"
+            ],
             "health": [
                 "/health_check (GET)"
             ]
         }
     })
+    if frontend_assets:
+        response.vary.add('Accept')
+    return response
 
 @app.route("/start_questionnaire", methods=["POST"])
+@compressed
 def start_questionnaire():
     try:
         data = request.json
         symptom = data.get('symptom', '')
         initial_description = data.get('description', symptom)
+        prefetch = bool(data.get('prefetch', False))
         
         # Generate unique session ID
         session_id = str(uuid.uuid4())
         
         # Create new questionnaire session
         session = QuestionnaireSession(session_id, symptom, initial_description)
-        sessions[session_id] = session
+        sessions.set(session_id, session)
         
-        # Get first question
-        first_question = session.get_current_question()
-        
-        return jsonify({
+        fields = {
             'success': True,
             'session_id': session_id,
-            'message': f'Starting questionnaire for: {symptom}',
-            'question': first_question
-        })
+            'message': f'Starting questionnaire for: {symptom}'
+        }
+        # Prefetch mode also returns the whole plan so the client can navigate locally
+        if prefetch:
+            return spliced_response(
+                fields,
+                question=session.get_current_question_json(),
+                plan=session.get_plan_json()
+            )
+        
+        # First question is spliced in by question_response
+        return question_response(session, **fields)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -1837,24 +2022,19 @@ def submit_answer():
         answer = data.get('answer')
         action = data.get('action', 'next')  # next, previous, or skip
         
-        if session_id not in sessions:
+        session = sessions.get(session_id)
+        if not session:
             return jsonify({'success': False, 'error': 'Invalid session'}), 404
         
-        session = sessions[session_id]
+        if action == 'next':
+            error = session.answer_error(answer)
+            if error:
+                return jsonify({'success': False, 'error': error}), 400
         
-        # Submit answer if not navigating back
-        if action != 'previous':
-            session.submit_answer(answer)
+        has_next = session.apply_action(action, answer)
         
-        # Handle navigation
-        if action == 'next':
-            has_next = session.next_question()
-        elif action == 'previous':
-            has_next = session.previous_question()
-        elif action == 'skip':
-            has_next = session.skip_question()
-        else:
-            has_next = True
+        # Write the updated state back (required by shared session backends)
+        sessions.set(session_id, session)
         
         # Check if questionnaire is completed
         if session.completed:
@@ -1862,59 +2042,219 @@ def submit_answer():
                 'success': True,
                 'completed': True,
                 'message': 'Questionnaire completed!',
-                'session_id': session_id
+                'session_id': session_id,
+                'assessment': session.get_assessment()
             })
         
-        # Get current question
-        current_question = session.get_current_question()
+        # Current question is spliced in by question_response
+        return question_response(
+            session,
+            success=True,
+            completed=False,
+            assessment=session.get_assessment()
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route("/submit_answers", methods=["POST"])
+def submit_answers():
+    """Apply a queued batch of answer/skip operations to a session in one request"""
+    try:
+        data = request.json
+        session_id = data.get('session_id')
+        operations = data.get('operations')
+        
+        session = sessions.get(session_id)
+        if not session:
+            return jsonify({'success': False, 'error': 'Invalid session'}), 404
         
-        return jsonify({
-            'success': True,
-            'completed': False,
-            'question': current_question
-        })
+        if not isinstance(operations, list):
+            return jsonify({'success': False, 'error': 'operations must be a list'}), 400
+        
+        applied = 0
+        error = None
+        for operation in operations:
+            if session.completed:
+                error = 'Questionnaire already completed'
+                break
+            if not isinstance(operation, dict):
+                error = 'Each operation must be an object'
+                break
+            
+            # Operations without a question_id apply to the current question
+            question_id = operation.get('question_id')
+            if question_id is not None:
+                index = session.question_index(question_id)
+                if index is None:
+                    error = f'Unknown question: {question_id}'
+                    break
+                session.current_index = index
+            
+            action = 'skip' if operation.get('skip') else 'next'
+            if action == 'next':
+                error = session.answer_error(operation.get('answer'))
+                if error:
+                    break
+            session.apply_action(action, operation.get('answer'))
+            applied += 1
+        
+        # Keep the operations applied so far, even if a later one failed
+        sessions.set(session_id, session)
+        
+        fields = {
+            'success': error is None,
+            'completed': session.completed,
+            'applied': applied,
+            'assessment': session.get_assessment()
+        }
+        if error:
+            fields['error'] = error
+        question_json = 'null' if session.completed else session.get_current_question_json()
+        return spliced_response(fields, status=200 if error is None else 400, question=question_json)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route("/complete_questionnaire", methods=["POST"])
+@compressed
+def complete_questionnaire():
+    """Score a questionnaire answered locally from a prefetched plan"""
+    try:
+        data = request.json
+        session_id = data.get('session_id')
+        answers = data.get('answers')
+        
+        session = sessions.get(session_id)
+        if not session:
+            return jsonify({'success': False, 'error': 'Invalid session'}), 404
+        
+        if not isinstance(answers, dict) or not all(isinstance(a, str) for a in answers.values()):
+            return jsonify({'success': False, 'error': 'answers must map question ids to answer strings'}), 400
+        
+        invalid = session.invalid_answers(answers)
+        if invalid:
+            return jsonify({
+                'success': False,
+                'error': 'Answers must be one of the question options or Skipped',
+                'invalid_answers': invalid
+            }), 400
+        
+        ignored = session.apply_answers(answers)
+        sessions.set(session_id, session)
+        
+        return report_response(
+            session, success=True, completed=True, session_id=session_id, ignored_answers=ignored
+        )
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+# WebSocket channel for questionnaire sessions (optional; requires flask-sock)
+def handle_socket_message(message: Dict, session: Optional[QuestionnaireSession]):
+    """Handle one WebSocket message; returns (reply JSON, session bound to the connection)
+    
+    Message types: start, resume, answer, skip, previous, question, report. Replies echo
+    the message's optional 'ref' so clients can match them to requests.
+    """
+    msg_type = message.get('type')
+    reply = {'type': msg_type, 'ref': message.get('ref')}
+    
+    if msg_type == 'start':
+        symptom = message.get('symptom', '')
+        session_id = str(uuid.uuid4())
+        session = QuestionnaireSession(session_id, symptom, message.get('description', symptom))
+        sessions.set(session_id, session)
+        reply.update(success=True, session_id=session_id, completed=False)
+        if message.get('prefetch'):
+            return splice_json(reply, question=session.get_current_question_json(), plan=session.get_plan_json()), session
+        return splice_json(reply, question=session.get_current_question_json()), session
+    
+    if msg_type == 'resume':
+        session = sessions.get(message.get('session_id'))
+        if not session:
+            reply.update(success=False, error='Invalid session')
+            return splice_json(reply), None
+        reply.update(success=True, session_id=session.session_id, completed=session.completed)
+        return splice_json(reply, question=session.get_current_question_json()), session
+    
+    if session is None:
+        reply.update(success=False, error='No active session; send start or resume first')
+        return splice_json(reply), None
+    
+    if msg_type in ('answer', 'skip', 'previous'):
+        error = session.answer_error(message.get('answer')) if msg_type == 'answer' else None
+        if error:
+            reply.update(success=False, error=error)
+            return splice_json(reply), session
+        action = {'answer': 'next', 'skip': 'skip', 'previous': 'previous'}[msg_type]
+        session.apply_action(action, message.get('answer'))
+        sessions.set(session.session_id, session)
+    elif msg_type == 'report':
+        reply.update(success=True, session_id=session.session_id)
+        return splice_json(reply, report=session.generate_report_json()), session
+    elif msg_type != 'question':
+        reply.update(success=False, error=f'Unknown message type: {msg_type}')
+        return splice_json(reply), session
+    
+    reply.update(success=True, completed=session.completed, assessment=session.get_assessment())
+    question_json = 'null' if session.completed else session.get_current_question_json()
+    return splice_json(reply, question=question_json), session
+
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+    
+    @sock.route('/ws/questionnaire')
+    def questionnaire_socket(ws):
+        """Persistent questionnaire channel using the same engine as the POST routes"""
+        session = None
+        while True:
+            raw = ws.receive()
+            if raw is None:
+                break
+            try:
+                message = json.loads(raw)
+                if not isinstance(message, dict):
+                    raise ValueError('message must be a JSON object')
+                reply, session = handle_socket_message(message, session)
+            except Exception as e:
+                reply = splice_json({'type': 'error', 'success': False, 'error': str(e)})
+            ws.send(reply)
+except ImportError:
+    logger.info("flask-sock not installed; /ws/questionnaire is disabled")
+
 @app.route("/get_current_question", methods=["POST"])
 def get_current_question():
     try:
         data = request.json
         session_id = data.get('session_id')
         
-        if session_id not in sessions:
+        session = sessions.get(session_id)
+        if not session:
             return jsonify({'success': False, 'error': 'Invalid session'}), 404
         
-        session = sessions[session_id]
-        current_question = session.get_current_question()
-        
-        return jsonify({
-            'success': True,
-            'question': current_question,
-            'completed': session.completed
-        })
+        return question_response(session, success=True, completed=session.completed)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route("/get_report", methods=["POST"])
+@compressed
 def get_report():
     try:
         data = request.json
         session_id = data.get('session_id')
         
-        if session_id not in sessions:
+        session = sessions.get(session_id)
+        if not session:
             return jsonify({'success': False, 'error': 'Invalid session'}), 404
         
-        session = sessions[session_id]
-        report = session.generate_report()
+        # fields=/view= from the query string or the request body
+        fields = parse_fields(request.args or data, REPORT_FIELDS, REPORT_SUMMARY_FIELDS)
+        if fields is not None:
+            return jsonify({'success': True, 'report': project(session.generate_report(), fields)})
         
         # Clean up session after generating report
         # del sessions[session_id]
         
-        return jsonify({
-            'success': True,
-            'report': report
-        })
+        return report_response(session, success=True)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -1923,17 +2263,48 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'active_sessions': len(sessions),
+        'session_store': sessions.get_stats(),
+        'report_cache': dict(report_cache_stats),
+        'compression': response_compressor.get_stats(),
+        'etag_cache': etag_cache.get_stats(),
+        'frontend': frontend_assets.get_stats() if frontend_assets else None,
+        'password_pool': password_pool.get_stats(),
+        'user_directory': user_directory.get_stats(),
         'timestamp': datetime.now().isoformat()
     })
 
-# Create database tables on app initialization (only if not using Supabase)
-if not USE_SUPABASE:
-    with app.app_context():
-        try:
-            db.create_all()
-            logger.info("Database tables created successfully!")
-        except Exception as e:
-            logger.error(f"Failed to create database tables: {e}")
+# Database tables are created on the first request rather than at import (only if not
+# using Supabase); run `flask --app app init-db` to create them ahead of deploys
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+
+def ensure_schema():
+    """Create the database tables once per process"""
+    global _schema_ready
+    if _schema_ready or USE_SUPABASE:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        with app.app_context():
+            try:
+                db.create_all()
+                logger.info("Database tables created successfully!")
+            except Exception as e:
+                logger.error(f"Failed to create database tables: {e}")
+        _schema_ready = True
+
+
+@app.before_request
+def create_schema_on_first_request():
+    ensure_schema()
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create the database tables"""
+    ensure_schema()
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
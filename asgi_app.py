@@ -0,0 +1,423 @@
+"""
+ASGI serving mode for Aushadham
+Serves login, the questionnaire loop, the questionnaire WebSocket and saved-questionnaire
+reads as async Starlette handlers; bcrypt runs on the password pool, report building in
+a thread pool, and saved questionnaires are read through async storage. Every other
+route is served by the Flask app, mounted as the fallback.
+
+Run with:
+    uvicorn asgi_app:app --workers 4
+"""
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import create_access_token, decode_token
+from jwt import ExpiredSignatureError
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app import (app as flask_app, db, sessions, QuestionnaireSession, SavedQuestionnaire, USE_SUPABASE,
+                 handle_socket_message, user_directory, response_compressor, etag_cache, password_pool,
+                 ensure_schema)
+from async_storage import get_async_questionnaire_store
+from conditional_get import variant_for, questionnaire_etag, list_etag, matching_etag
+from pagination import parse_page_args, split_page, page_fields
+from password_pool import PoolSaturated
+from projection import (parse_fields, project, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS,
+                        REPORT_FIELDS, REPORT_SUMMARY_FIELDS)
+from response_codec import decode_body, parse_accept, prefers_msgpack, render, splice_json
+from user_directory import public_profile
+
+logger = logging.getLogger(__name__)
+
+
+class AuthError(Exception):
+    """Missing or invalid access token; carries the Flask-JWT-Extended status code"""
+
+    def __init__(self, message: str, status: int = 401):
+        super().__init__(message)
+        self.status = status
+
+
+async def offload(func: Callable, *args: Any) -> Any:
+    """Run session-store work inline for the in-memory store, in the thread pool otherwise"""
+    if sessions.backend == 'memory':
+        return func(*args)
+    return await run_in_threadpool(func, *args)
+
+
+async def read_json(request: Request) -> Dict:
+    """Decode a JSON or MessagePack request body into an object"""
+    data = decode_body(await request.body(), request.headers.get('content-type', '').split(';')[0].strip())
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    return data
+
+
+def jwt_identity(request: Request) -> Any:
+    """Get the identity of a Flask-JWT-Extended access token from the Authorization header"""
+    header = request.headers.get('authorization', '')
+    if not header.startswith('Bearer '):
+        raise AuthError('Missing Authorization Header')
+    try:
+        with flask_app.app_context():
+            claims = decode_token(header[len('Bearer '):])
+    except ExpiredSignatureError:
+        raise AuthError('Token has expired')
+    except Exception as e:
+        raise AuthError(str(e), 422)
+    return claims[flask_app.config.get('JWT_IDENTITY_CLAIM', 'sub')]
+
+
+def reply(request: Request, fields: Dict, status: int = 200, compress: bool = False,
+          tail: Optional[str] = None, etag: Optional[str] = None, **encoded: str) -> Response:
+    """Encode a response as negotiated, like the Flask codec, compression and ETag layers"""
+    body, mimetype = render(fields, prefers_msgpack(parse_accept(request.headers.get('accept'))), **encoded)
+    headers = {'Vary': 'Accept'}
+    if compress:
+        headers['Vary'] = 'Accept, Accept-Encoding'
+        if status == 200:
+            accepted = parse_accept_header(request.headers.get('accept-encoding'), Accept)
+            compressed = response_compressor.encode(body, accepted, tail.encode('utf-8') if tail else None)
+            if compressed is not None:
+                body, coding = compressed
+                headers['Content-Encoding'] = coding
+                etag = f'{etag}-{coding}' if etag else None
+    if etag:
+        headers['ETag'] = f'"{etag}"'
+        headers['Cache-Control'] = 'private, no-cache'
+        headers['Vary'] += ', Authorization'
+    return Response(body, status_code=status, headers=headers, media_type=mimetype)
+
+
+def error(request: Request, message: str, status: int) -> Response:
+    """Error response in the API's {'success': False, 'error': ...} format"""
+    return reply(request, {'success': False, 'error': message}, status)
+
+
+def not_modified(request: Request, etag: str) -> Response:
+    """Empty 304 response carrying the ETag variant the client holds"""
+    held = matching_etag(etag, parse_etags(request.headers.get('if-none-match'))) or etag
+    return Response(status_code=304, headers={
+        'ETag': f'"{held}"', 'Cache-Control': 'private, no-cache', 'Vary': 'Accept, Accept-Encoding, Authorization'
+    })
+
+
+def representation(request: Request) -> str:
+    """ETag variant of a request (codec plus query parameters)"""
+    return variant_for(prefers_msgpack(parse_accept(request.headers.get('accept'))), request.query_params)
+
+
+async def find_user(field: str, value: Any) -> Optional[Dict]:
+    """Look a user up in memory, reading through to the database in the thread pool on a miss"""
+    user = user_directory.cached(field, value)
+    if user is None and user_directory.source is not None and value is not None:
+        user = await run_in_threadpool(user_directory.get, field, value)
+    return user
+
+
+# Authentication
+async def login(request: Request) -> Response:
+    """Login a user (using hardcoded users); bcrypt runs on the password pool"""
+    try:
+        data = await read_json(request)
+        username = data.get('username')
+        password = data.get('password')
+
+        if not username or not password:
+            return error(request, 'Username and password are required', 400)
+
+        user = await find_user('username', username) or await find_user('email', username)
+        if not user or not await password_pool.check_async(password, user['password_hash'], 'login'):
+            return error(request, 'Invalid username or password', 401)
+
+        with flask_app.app_context():
+            access_token = create_access_token(identity=user['id'])
+
+        return reply(request, {
+            'success': True,
+            'message': 'Login successful',
+            'user': public_profile(user),
+            'access_token': access_token
+        })
+    except PoolSaturated as e:
+        logger.warning("Login rejected: password pool saturated")
+        response = error(request, 'Too many login attempts right now. Please retry shortly.', 503)
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    except Exception as e:
+        logger.error(f"Login error: {str(e)}")
+        return error(request, 'Login failed. Please try again.', 400)
+
+
+async def get_profile(request: Request) -> Response:
+    """Get current user profile (using hardcoded users)"""
+    try:
+        user = await find_user('id', jwt_identity(request))
+        if not user:
+            return error(request, 'User not found', 404)
+        return reply(request, {'success': True, 'user': public_profile(user)})
+    except AuthError as e:
+        return reply(request, {'msg': str(e)}, e.status)
+    except Exception as e:
+        logger.error(f"Get profile error: {str(e)}")
+        return error(request, 'Failed to retrieve profile.', 400)
+
+
+# Questionnaire loop: session work is CPU-only for the in-memory store and runs inline
+def _start(data: Dict):
+    symptom = data.get('symptom', '')
+    session_id = str(uuid.uuid4())
+    session = QuestionnaireSession(session_id, symptom, data.get('description', symptom))
+    sessions.set(session_id, session)
+    fields = {'success': True, 'session_id': session_id, 'message': f'Starting questionnaire for: {symptom}'}
+    encoded = {'question': session.get_current_question_json()}
+    if data.get('prefetch'):
+        encoded['plan'] = session.get_plan_json()
+    return fields, encoded
+
+
+def _submit(data: Dict):
+    session_id = data.get('session_id')
+    session = sessions.get(session_id)
+    if not session:
+        return None
+    action = data.get('action', 'next')
+    if action == 'next':
+        answer_error = session.answer_error(data.get('answer'))
+        if answer_error:
+            raise ValueError(answer_error)
+    session.apply_action(action, data.get('answer'))
+    sessions.set(session_id, session)
+    if session.completed:
+        return {
+            'success': True,
+            'completed': True,
+            'message': 'Questionnaire completed!',
+            'session_id': session_id,
+            'assessment': session.get_assessment()
+        }, {}
+    return {'success': True, 'completed': False, 'assessment': session.get_assessment()}, \
+        {'question': session.get_current_question_json()}
+
+
+async def start_questionnaire(request: Request) -> Response:
+    try:
+        fields, encoded = await offload(_start, await read_json(request))
+        return reply(request, fields, compress=True, **encoded)
+    except Exception as e:
+        return error(request, str(e), 400)
+
+
+async def submit_answer(request: Request) -> Response:
+    try:
+        result = await offload(_submit, await read_json(request))
+        if result is None:
+            return error(request, 'Invalid session', 404)
+        fields, encoded = result
+        return reply(request, fields, **encoded)
+    except Exception as e:
+        return error(request, str(e), 400)
+
+
+async def get_current_question(request: Request) -> Response:
+    try:
+        data = await read_json(request)
+        session = await offload(sessions.get, data.get('session_id'))
+        if not session:
+            return error(request, 'Invalid session', 404)
+        return reply(request, {'success': True, 'completed': session.completed},
+                     question=session.get_current_question_json())
+    except Exception as e:
+        return error(request, str(e), 400)
+
+
+async def get_report(request: Request) -> Response:
+    try:
+        data = await read_json(request)
+        session = await offload(sessions.get, data.get('session_id'))
+        if not session:
+            return error(request, 'Invalid session', 404)
+
+        fields = parse_fields(request.query_params or data, REPORT_FIELDS, REPORT_SUMMARY_FIELDS)
+        if fields is not None:
+            report = await run_in_threadpool(session.generate_report)
+            return reply(request, {'success': True, 'report': project(report, fields)})
+
+        # Report building (scoring and serialization) runs in the thread pool
+        report_json = await run_in_threadpool(session.generate_report_json)
+        return reply(request, {'success': True}, compress=True,
+                     tail=session.get_report_static_json() + '}', report=report_json)
+    except Exception as e:
+        return error(request, str(e), 400)
+
+
+async def questionnaire_socket(websocket: WebSocket) -> None:
+    """Persistent questionnaire channel, same protocol as the Flask /ws/questionnaire route"""
+    await websocket.accept()
+    session = None
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                if not isinstance(message, dict):
+                    raise ValueError('message must be a JSON object')
+                text, session = await offload(handle_socket_message, message, session)
+            except Exception as e:
+                text = splice_json({'type': 'error', 'success': False, 'error': str(e)})
+            await websocket.send_text(text)
+    except WebSocketDisconnect:
+        pass
+
+
+# Saved questionnaire reads through async storage
+def format_questionnaire(row: Dict, fields) -> Dict:
+    """Project a stored row and render its timestamp as ISO 8601"""
+    data = project(row, fields or QUESTIONNAIRE_FIELDS)
+    created_at = data.get('created_at')
+    if created_at is not None and not isinstance(created_at, str):
+        data['created_at'] = created_at.isoformat()
+    return data
+
+
+def questionnaire_columns(fields):
+    """Columns to read for a projection (id and created_at are always needed)"""
+    if fields is None:
+        return QUESTIONNAIRE_FIELDS
+    needed = set(fields) | {'id', 'created_at'}
+    return tuple(name for name in QUESTIONNAIRE_FIELDS if name in needed)
+
+
+async def get_my_questionnaires(request: Request) -> Response:
+    """Get the current user's questionnaires, newest first, one page at a time"""
+    store = request.app.state.questionnaire_store
+    try:
+        user_id = jwt_identity(request)
+        try:
+            limit, after = parse_page_args(request.query_params, parse_datetime=not USE_SUPABASE)
+            fields = parse_fields(request.query_params, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS)
+        except ValueError as e:
+            return error(request, str(e), 400)
+
+        variant = representation(request)
+        if_none_match = parse_etags(request.headers.get('if-none-match'))
+        etag = etag_cache.get(user_id, 'list', None, variant)
+        if etag_cache.check(etag, if_none_match):
+            return not_modified(request, etag)
+
+        fingerprint = await store.fingerprint(user_id)
+        if fingerprint is not None:
+            etag = etag_cache.put(user_id, 'list', None, list_etag(user_id, tuple(fingerprint), variant), variant)
+            if etag_cache.check(etag, if_none_match):
+                return not_modified(request, etag)
+        else:
+            etag = None
+
+        rows, next_cursor = split_page(
+            await store.list_page(user_id, limit + 1, after, questionnaire_columns(fields)),
+            limit, lambda q: (q['created_at'], q['id'])
+        )
+        count = fingerprint[0] if fingerprint is not None else None
+        return reply(request, {
+            'success': True,
+            'questionnaires': [format_questionnaire(row, fields) for row in rows],
+            **page_fields(count, limit, next_cursor)
+        }, compress=True, etag=etag)
+    except AuthError as e:
+        return reply(request, {'msg': str(e)}, e.status)
+    except Exception as e:
+        logger.error(f"Get questionnaires error: {str(e)}")
+        return error(request, 'Failed to retrieve questionnaires.', 400)
+
+
+async def get_questionnaire_detail(request: Request) -> Response:
+    """Get details of a specific questionnaire"""
+    store = request.app.state.questionnaire_store
+    questionnaire_id = request.path_params['questionnaire_id']
+    try:
+        user_id = jwt_identity(request)
+        try:
+            fields = parse_fields(request.query_params, QUESTIONNAIRE_FIELDS, QUESTIONNAIRE_SUMMARY_FIELDS)
+        except ValueError as e:
+            return error(request, str(e), 400)
+
+        variant = representation(request)
+        if_none_match = parse_etags(request.headers.get('if-none-match'))
+        etag = etag_cache.get(user_id, 'detail', questionnaire_id, variant)
+        if etag_cache.check(etag, if_none_match):
+            return not_modified(request, etag)
+
+        row = await store.get(questionnaire_id, user_id, questionnaire_columns(fields))
+        if not row:
+            return error(request, 'Questionnaire not found', 404)
+
+        etag = etag_cache.put(user_id, 'detail', questionnaire_id,
+                              questionnaire_etag(row['id'], row['created_at'], variant), variant)
+        if etag_cache.check(etag, if_none_match):
+            return not_modified(request, etag)
+        return reply(request, {'success': True, 'questionnaire': format_questionnaire(row, fields)},
+                     compress=True, etag=etag)
+    except AuthError as e:
+        return reply(request, {'msg': str(e)}, e.status)
+    except Exception as e:
+        logger.error(f"Get questionnaire detail error: {str(e)}")
+        return error(request, 'Failed to retrieve questionnaire.', 400)
+
+
+def create_app() -> Starlette:
+    """Build the ASGI app: native async routes first, then the Flask app for everything else"""
+    with flask_app.app_context():
+        database_url = db.engine.url.render_as_string(hide_password=False)
+    store = get_async_questionnaire_store(USE_SUPABASE, database_url, SavedQuestionnaire.__table__)
+
+    routes = [
+        Route('/login', login, methods=['POST']),
+        Route('/profile', get_profile, methods=['GET']),
+        Route('/start_questionnaire', start_questionnaire, methods=['POST']),
+        Route('/submit_answer', submit_answer, methods=['POST']),
+        Route('/get_current_question', get_current_question, methods=['POST']),
+        Route('/get_report', get_report, methods=['POST']),
+        WebSocketRoute('/ws/questionnaire', questionnaire_socket),
+    ]
+    if store is not None:
+        routes += [
+            Route('/my_questionnaires', get_my_questionnaires, methods=['GET']),
+            Route('/my_questionnaires/{questionnaire_id:int}', get_questionnaire_detail, methods=['GET']),
+        ]
+        logger.info(f"ASGI mode: saved questionnaires are read through async {store.backend}")
+    else:
+        logger.info("ASGI mode: no async storage driver; history reads are served by Flask")
+    # Writes, feedback, health check and any other route
+    routes.append(Mount('/', app=WSGIMiddleware(flask_app)))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Native routes read tables without passing through Flask's first-request hook
+        await run_in_threadpool(ensure_schema)
+        yield
+        if store is not None:
+            await store.close()
+
+    # Replaces the Flask-CORS headers on mounted responses with the same policy
+    middleware = [Middleware(CORSMiddleware, allow_origin_regex='.*', allow_credentials=True,
+                             allow_methods=['*'], allow_headers=['*'],
+                             max_age=flask_app.config['CORS_MAX_AGE'])]
+    application = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+    application.state.questionnaire_store = store
+    return application
+
+
+app = create_app()
@@ -0,0 +1,202 @@
+"""
+Async storage backends for Aushadham
+Provides read access to saved questionnaires for the ASGI serving mode, using the
+async Supabase client or SQLAlchemy's asyncio engine, so a slow database round trip
+suspends a coroutine instead of pinning a worker thread
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from sqlalchemy import and_, func, or_, select
+
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine
+except ImportError:  # pragma: no cover - greenlet missing; history reads stay on Flask
+    create_async_engine = None
+
+from supabase_service import SupabaseService, QUESTIONNAIRE_COLUMNS, session_options, transport_settings
+
+logger = logging.getLogger(__name__)
+
+# Sync driver -> asyncio driver for SQLAlchemy URLs
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql'
+}
+
+
+class AsyncQuestionnaireStore:
+    """Interface of the async saved-questionnaire readers"""
+
+    backend = 'base'
+
+    async def fingerprint(self, user_id: int) -> Optional[Tuple[int, Optional[int], Any]]:
+        """Get (count, max id, latest created_at) of a user's questionnaires"""
+        raise NotImplementedError
+
+    async def list_page(self, user_id: int, limit: int, after: Optional[Tuple],
+                        columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> List[Dict]:
+        """Get up to limit questionnaires, newest first, after a (created_at, id) keyset"""
+        raise NotImplementedError
+
+    async def get(self, questionnaire_id: int, user_id: int,
+                  columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> Optional[Dict]:
+        """Get one of a user's questionnaires"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections"""
+
+
+class AsyncSQLAlchemyQuestionnaireStore(AsyncQuestionnaireStore):
+    """Reads saved questionnaires through SQLAlchemy's asyncio engine"""
+
+    backend = 'sqlalchemy'
+
+    def __init__(self, url: str, table):
+        """Create an async engine for a sync database URL and the saved_questionnaires table"""
+        self.table = table
+        self.engine = create_async_engine(url)
+
+    async def fingerprint(self, user_id: int) -> Optional[Tuple[int, Optional[int], Any]]:
+        t = self.table
+        async with self.engine.connect() as conn:
+            result = await conn.execute(
+                select(func.count(t.c.id), func.max(t.c.id), func.max(t.c.created_at))
+                .where(t.c.user_id == user_id)
+            )
+            count, max_id, latest = result.one()
+        return count, max_id, latest
+
+    async def list_page(self, user_id: int, limit: int, after: Optional[Tuple],
+                        columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> List[Dict]:
+        t = self.table
+        query = select(*[t.c[name] for name in columns]).where(t.c.user_id == user_id)
+        if after is not None:
+            created_at, row_id = after
+            query = query.where(or_(
+                t.c.created_at < created_at,
+                and_(t.c.created_at == created_at, t.c.id < row_id)
+            ))
+        query = query.order_by(t.c.created_at.desc(), t.c.id.desc()).limit(limit)
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+    async def get(self, questionnaire_id: int, user_id: int,
+                  columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> Optional[Dict]:
+        t = self.table
+        query = select(*[t.c[name] for name in columns]).where(t.c.id == questionnaire_id, t.c.user_id == user_id)
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(query)).mappings().first()
+        return dict(row) if row else None
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+
+class AsyncSupabaseQuestionnaireStore(AsyncQuestionnaireStore):
+    """Reads saved questionnaires through the async Supabase client"""
+
+    backend = 'supabase'
+
+    def __init__(self, supabase_url: str, supabase_key: str):
+        self._url = supabase_url
+        self._key = supabase_key
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    async def client(self):
+        """Create the async PostgREST client on first use, inside the serving event loop"""
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    from postgrest import AsyncPostgrestClient
+                    from httpx import AsyncClient
+
+                    # Same pool sizing and timeouts as SupabaseService
+                    options = session_options(transport_settings())
+                    client = AsyncPostgrestClient(f"{self._url.rstrip('/')}/rest/v1", headers={
+                        'apiKey': self._key, 'Authorization': f'Bearer {self._key}'
+                    }, timeout=options['timeout'])
+                    default_session = client.session
+                    client.session = AsyncClient(base_url=default_session.base_url,
+                                                 headers=default_session.headers, **options)
+                    await default_session.aclose()
+                    self._client = client
+                    logger.info("Async Supabase client initialized successfully")
+        return self._client
+
+    async def fingerprint(self, user_id: int) -> Optional[Tuple[int, Optional[int], Any]]:
+        try:
+            client = await self.client()
+            response = await client.table('saved_questionnaires')\
+                .select('id', 'created_at', count='exact')\
+                .eq('user_id', user_id)\
+                .order('id', desc=True)\
+                .limit(1)\
+                .execute()
+            newest = response.data[0] if response.data else {}
+            return (response.count or 0, newest.get('id'), newest.get('created_at'))
+        except Exception as e:
+            logger.error(f"Error getting user questionnaires fingerprint: {e}")
+            return None
+
+    async def list_page(self, user_id: int, limit: int, after: Optional[Tuple],
+                        columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> List[Dict]:
+        client = await self.client()
+        query = client.table('saved_questionnaires').select(*columns).eq('user_id', user_id)
+        # Same ordering, keyset filter and Range header as the sync service
+        response = await SupabaseService._newest_first(query, limit, after).execute()
+        return response.data if response.data else []
+
+    async def get(self, questionnaire_id: int, user_id: int,
+                  columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> Optional[Dict]:
+        client = await self.client()
+        response = await client.table('saved_questionnaires')\
+            .select(*columns)\
+            .eq('id', questionnaire_id)\
+            .eq('user_id', user_id)\
+            .execute()
+        return response.data[0] if response.data else None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.session.aclose()
+
+
+def async_database_url(url: str) -> Optional[str]:
+    """Translate a sync SQLAlchemy URL to its asyncio driver, or None if there is none"""
+    scheme, sep, rest = url.partition('://')
+    dialect = scheme.split('+', 1)[0]
+    driver = ASYNC_DRIVERS.get(dialect)
+    return f'{driver}{sep}{rest}' if driver and sep else None
+
+
+def get_async_questionnaire_store(use_supabase: bool, database_url: str,
+                                  table=None) -> Optional[AsyncQuestionnaireStore]:
+    """Create the async store matching the sync backend, or None if no async driver is available"""
+    if use_supabase:
+        supabase_url = os.getenv('SUPABASE_URL')
+        supabase_key = os.getenv('SUPABASE_KEY')
+        if not supabase_url or not supabase_key:
+            logger.warning("Supabase credentials not found in environment")
+            return None
+        return AsyncSupabaseQuestionnaireStore(supabase_url, supabase_key)
+
+    url = async_database_url(database_url)
+    if create_async_engine is None:
+        logger.warning("SQLAlchemy asyncio support unavailable (install sqlalchemy[asyncio])")
+        return None
+    if url is None:
+        logger.warning(f"No asyncio driver known for {database_url.split('://')[0]}")
+        return None
+    try:
+        return AsyncSQLAlchemyQuestionnaireStore(url, table)
+    except Exception as e:
+        # Typically the async driver package (aiosqlite, asyncpg, aiomysql) is not installed
+        logger.warning(f"Async SQLAlchemy engine unavailable: {e}")
+        return None
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API: import time of app.py and latency of the first request
+
+Each run starts a fresh interpreter with python -X importtime, as a gunicorn worker or a
+test process would, then serves one /health_check through the Flask test client. Runs use
+a scratch directory and SQLite database, so the checkout is left untouched.
+
+    python bench_startup.py [runs] [budget_ms]
+
+Exits non-zero if the median import time exceeds budget_ms, so it can guard startup in CI.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CHILD = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "import app\n"
+    "imported = time.perf_counter()\n"
+    "app.app.test_client().get('/health_check')\n"
+    "print(imported - started, time.perf_counter() - imported)\n"
+)
+# import time: self [us] | cumulative | imported package
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_once():
+    """Start one interpreter; returns (import seconds, first request seconds, {module: cumulative us})"""
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, PYTHONWARNINGS='ignore', PYTHONPATH=ROOT,
+                   DATABASE_URL='sqlite:///' + os.path.join(scratch, 'bench.db'))
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=scratch, env=env,
+                                capture_output=True, text=True, check=True)
+    import_s, first_request_s = map(float, result.stdout.split()[-2:])
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        # app.py itself and the modules it imports directly
+        if match and len(match.group(3)) <= 3:
+            modules[match.group(4)] = int(match.group(2))
+    return import_s, first_request_s, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(f"Cold-starting app.py {runs} times\n")
+
+    run_once()  # Warm the bytecode cache, as a deployed worker would find it
+    samples = [run_once() for _ in range(runs)]
+    import_ms = [s[0] * 1000 for s in samples]
+    first_ms = [s[1] * 1000 for s in samples]
+    print(f"import app:     median {statistics.median(import_ms):7.1f} ms   min {min(import_ms):7.1f} ms")
+    print(f"first request:  median {statistics.median(first_ms):7.1f} ms   min {min(first_ms):7.1f} ms")
+
+    print("\nSlowest imports (cumulative, median over runs):")
+    names = set().union(*(s[2] for s in samples))
+    cumulative = {name: statistics.median(s[2].get(name, 0) for s in samples) / 1000 for name in names}
+    for name, ms in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:12]:
+        print(f"  {ms:7.1f} ms  {name}")
+
+    if budget_ms is not None and statistics.median(import_ms) > budget_ms:
+        print(f"\nFAIL: median import time exceeds the {budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+SupabaseService transport benchmark against a local PostgREST stand-in
+
+Starts a stub HTTP/1.1 server answering the saved_questionnaires reads, then compares
+the pooled keep-alive transport with one connection per request (SUPABASE_MAX_KEEPALIVE=0),
+sequentially and from concurrent threads, and checks that a stalled response is cut off
+by the read timeout instead of holding the worker.
+
+    python bench_supabase.py [requests] [threads]
+"""
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from supabase_service import SupabaseService, transport_settings
+
+ROW = {
+    'id': 1, 'user_id': 1, 'session_id': 'bench', 'symptom': 'headache', 'initial_description': '',
+    'answers': {}, 'report': {}, 'severity': 'Low', 'created_at': '2024-01-01T00:00:00'
+}
+
+
+class StubPostgREST(BaseHTTPRequestHandler):
+    """Answers every GET with one row; user_id=eq.0 stalls to exercise the read timeout"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY, delayed ACKs add ~40 ms
+    disable_nagle_algorithm = True
+    connections = 0
+    stall = 5.0
+
+    def setup(self):
+        super().setup()
+        StubPostgREST.connections += 1
+
+    def do_GET(self):
+        # postgrest-py sends a body with GETs; drain it to keep the connection usable
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if 'user_id=eq.0' in self.path:
+            time.sleep(self.stall)
+        body = json.dumps([ROW]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(service, requests, threads):
+    """Read one questionnaire requests times; returns per-request latencies"""
+    def one(_):
+        started = time.perf_counter()
+        assert service.get_questionnaire_by_id(1, 1) is not None
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def summarize(label, latencies, connections):
+    ms = sorted(l * 1000 for l in latencies)
+    print(f"{label:<28} median {statistics.median(ms):6.2f} ms   p95 {ms[int(len(ms) * 0.95) - 1]:6.2f} ms"
+          f"   {connections:4d} connections")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubPostgREST)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    print(f"{requests} reads against the PostgREST stand-in at {url}\n")
+
+    pooled = transport_settings()
+    churn = dict(pooled, max_keepalive=0)
+    for label, settings, workers in (
+        ('pooled keep-alive', pooled, 1),
+        ('new connection per request', churn, 1),
+        (f'pooled keep-alive, {threads} threads', pooled, threads),
+        (f'per request, {threads} threads', churn, threads),
+    ):
+        service = SupabaseService(url, 'bench-key', settings)
+        StubPostgREST.connections = 0
+        latencies = run(service, requests, workers)
+        summarize(label, latencies, StubPostgREST.connections)
+        service.close()
+
+    read_timeout = 1.0
+    service = SupabaseService(url, 'bench-key', dict(pooled, read_timeout=read_timeout))
+    started = time.perf_counter()
+    service.get_questionnaire_by_id(1, 0)
+    print(f"\nStalled response ({StubPostgREST.stall:.0f} s) abandoned after {time.perf_counter() - started:.2f} s"
+          f" (read timeout {read_timeout:.0f} s)")
+    service.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
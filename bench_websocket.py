@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Latency comparison between the /submit_answer HTTP loop and the /ws/questionnaire channel
+
+Start the API first (python app.py), then run:
+    python bench_websocket.py [rounds]
+"""
+import json
+import statistics
+import sys
+import time
+
+import requests
+from simple_websocket import Client
+
+BASE_URL = "http://127.0.0.1:5000"
+WS_URL = BASE_URL.replace('http', 'ws', 1) + "/ws/questionnaire"
+SYMPTOM = "stomach pain"
+
+
+def pick_answer(data):
+    """Answer the question in a reply with its last option ("No" for yes/no questions)"""
+    if not data.get('success'):
+        raise RuntimeError(f"Questionnaire request failed: {data.get('error')}")
+    return data['question']['options'][-1]
+
+
+def is_completed(data):
+    """Whether a reply completed the questionnaire; raises if it was rejected"""
+    if not data.get('success'):
+        raise RuntimeError(f"Answer rejected: {data.get('error')}")
+    return data['completed']
+
+
+def run_http(rounds):
+    """Answer every question through POST /submit_answer; returns per-answer latencies"""
+    latencies = []
+    with requests.Session() as http:
+        for _ in range(rounds):
+            data = http.post(f"{BASE_URL}/start_questionnaire", json={"symptom": SYMPTOM}).json()
+            session_id = data['session_id']
+            completed = False
+            while not completed:
+                answer = pick_answer(data)
+                started = time.perf_counter()
+                data = http.post(f"{BASE_URL}/submit_answer", json={
+                    "session_id": session_id,
+                    "answer": answer,
+                    "action": "next"
+                }).json()
+                latencies.append(time.perf_counter() - started)
+                completed = is_completed(data)
+    return latencies
+
+
+def run_websocket(rounds):
+    """Answer every question over one WebSocket connection; returns per-answer latencies"""
+    latencies = []
+    ws = Client.connect(WS_URL)
+    try:
+        for _ in range(rounds):
+            ws.send(json.dumps({"type": "start", "symptom": SYMPTOM}))
+            data = json.loads(ws.receive())
+            completed = False
+            while not completed:
+                answer = pick_answer(data)
+                started = time.perf_counter()
+                ws.send(json.dumps({"type": "answer", "answer": answer}))
+                data = json.loads(ws.receive())
+                latencies.append(time.perf_counter() - started)
+                completed = is_completed(data)
+    finally:
+        ws.close()
+    return latencies
+
+
+def summarize(name, latencies):
+    """Print median and p95 latency in milliseconds"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:>10}: {len(latencies)} answers, "
+          f"median {statistics.median(ordered) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms")
+    return statistics.median(ordered)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"Benchmarking {rounds} questionnaires against {BASE_URL}\n")
+    http_median = summarize("HTTP", run_http(rounds))
+    ws_median = summarize("WebSocket", run_websocket(rounds))
+    print(f"\nWebSocket per-answer latency is {http_median / ws_median:.1f}x lower (median)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except requests.exceptions.ConnectionError:
+        print(f"Error: Could not connect to API. Make sure the server is running at {BASE_URL}")
+        sys.exit(1)
@@ -0,0 +1,201 @@
+"""
+Response compression for Aushadham
+Provides gzip/brotli compression of large JSON responses for routes that opt in with
+@compressed, with a size threshold and a cache of pre-compressed static fragments
+"""
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+from flask import Response, request
+from werkzeug.datastructures import Accept
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - only gzip is offered
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Fixed gzip member header: deflate, no flags, no mtime, unknown OS
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+# Final, empty fixed-Huffman deflate block
+DEFLATE_END = b'\x03\x00'
+
+
+def compressed(view: Callable) -> Callable:
+    """Opt a view into response compression (apply above @jwt_required)"""
+    view.compress = True
+    return view
+
+
+def static_tail(response: Response, tail: str) -> Response:
+    """Mark the static suffix of a response body so its compressed form can be reused"""
+    response.static_tail = tail.encode('utf-8')
+    return response
+
+
+class FragmentCache:
+    """Bounded cache of static fragments as standalone raw deflate segments
+
+    Each segment is compressed by a fresh compressor and ends with a sync flush, so it
+    holds no back-references and can be appended to any byte-aligned deflate stream.
+    """
+
+    def __init__(self, level: int, max_entries: int = 256):
+        self.level = level
+        self.max_entries = max_entries
+        # fragment bytes -> (raw deflate segment, crc32, length)
+        self._segments: "OrderedDict[bytes, Tuple[bytes, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fragment: bytes) -> Tuple[bytes, int, int]:
+        """Get the deflate segment, crc32 and length of a fragment, compressing it once"""
+        with self._lock:
+            entry = self._segments.get(fragment)
+            if entry is not None:
+                self._segments.move_to_end(fragment)
+                self.hits += 1
+                return entry
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        segment = compressor.compress(fragment) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        entry = (segment, zlib.crc32(fragment), len(fragment))
+        with self._lock:
+            self.misses += 1
+            self._segments[fragment] = entry
+            while len(self._segments) > self.max_entries:
+                self._segments.popitem(last=False)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+
+class ResponseCompressor:
+    """after_request hook compressing opted-in responses above a size threshold"""
+
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.fragments = FragmentCache(gzip_level)
+        # compressed = br + gzip; spliced counts the gzip bodies built from a cached tail
+        self._stats = {'compressed': 0, 'br': 0, 'gzip': 0, 'spliced': 0, 'skipped_small': 0,
+                       'bytes_in': 0, 'bytes_out': 0}
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        """Register the compression hook on a Flask app"""
+        self._app = app
+        app.after_request(self.after_request)
+
+    @staticmethod
+    def choose_encoding(accepted: Accept, prefer_gzip: bool = False) -> Optional[str]:
+        """Pick the best content coding an Accept-Encoding header allows, or None
+
+        prefer_gzip ranks gzip above br, for bodies whose gzip form is mostly cached.
+        """
+        if prefer_gzip and accepted['gzip']:
+            return 'gzip'
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def encode(self, data: bytes, accepted: Accept, tail: Optional[bytes] = None) -> Optional[Tuple[bytes, str]]:
+        """Compress a body for an Accept-Encoding header; returns (body, coding) or None
+
+        tail is the body's static suffix, if any, whose gzip segment is cached. Such
+        bodies are sent as gzip even to clients that also accept br, so the cached
+        segment is reused instead of compressing the whole body with brotli.
+        """
+        spliceable = bool(tail) and data.endswith(tail)
+        encoding = self.choose_encoding(accepted, prefer_gzip=spliceable)
+        if encoding is None:
+            return None
+        if len(data) < self.min_size:
+            self._count(skipped_small=1)
+            return None
+
+        if encoding == 'gzip' and spliceable:
+            body = self.gzip_spliced(data[:-len(tail)], tail)
+            self._count(spliced=1)
+        elif encoding == 'gzip':
+            body = self.gzip(data)
+        else:
+            body = brotli.compress(data, quality=self.brotli_quality)
+        self._count(compressed=1, bytes_in=len(data), bytes_out=len(body), **{encoding: 1})
+        return body, encoding
+
+    def after_request(self, response: Response) -> Response:
+        """Compress the response if its view opted in and it is large enough"""
+        view = self._app.view_functions.get(request.endpoint)
+        if not getattr(view, 'compress', False):
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        encoded = self.encode(response.get_data(), request.accept_encodings, getattr(response, 'static_tail', None))
+        if encoded is None:
+            return response
+        body, encoding = encoded
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        # Each content coding is a distinct representation and needs its own strong ETag
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+        return response
+
+    def gzip(self, data: bytes) -> bytes:
+        """Compress a whole body as a gzip member"""
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(data) + compressor.flush(zlib.Z_FINISH)
+        return GZIP_HEADER + deflated + struct.pack('<II', zlib.crc32(data), len(data) & 0xffffffff)
+
+    def gzip_spliced(self, head: bytes, tail: bytes) -> bytes:
+        """Compress only the dynamic head and append the cached segment of the static tail"""
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(head) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        segment, _, tail_size = self.fragments.get(tail)
+        # Running crc32 over head then tail; the tail is only checksummed, not recompressed
+        crc = zlib.crc32(tail, zlib.crc32(head))
+        size = (len(head) + tail_size) & 0xffffffff
+        return GZIP_HEADER + deflated + segment + DEFLATE_END + struct.pack('<II', crc, size)
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._stats[name] += delta
+
+    def get_stats(self) -> Dict:
+        """Get compression counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['encodings'] = ['br', 'gzip'] if brotli is not None else ['gzip']
+        stats['min_size'] = self.min_size
+        stats['cached_fragments'] = len(self.fragments)
+        stats['fragment_hits'] = self.fragments.hits
+        return stats
+
+
+def get_response_compressor() -> ResponseCompressor:
+    """Create the response compressor configured from environment variables"""
+    compressor = ResponseCompressor(
+        min_size=int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+        gzip_level=int(os.getenv('COMPRESSION_GZIP_LEVEL', '6')),
+        brotli_quality=int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    )
+    logger.info(f"Response compression: {', '.join(compressor.get_stats()['encodings'])}"
+                f" above {compressor.min_size} bytes")
+    return compressor
@@ -0,0 +1,187 @@
+"""
+Conditional GET support for Aushadham
+Provides strong ETags for saved questionnaires and a small per-user ETag cache, so
+If-None-Match revalidations can be answered with 304 Not Modified without a
+database round trip
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+import logging
+
+from flask import Response, request
+from werkzeug.datastructures import ETags
+
+from response_codec import wants_msgpack
+
+logger = logging.getLogger(__name__)
+
+# Suffixes the response compressor appends to the ETag of encoded variants
+ENCODING_SUFFIXES = ('', '-gzip', '-br')
+
+
+def _digest(*parts: Any) -> str:
+    """Short stable hash of ETag inputs"""
+    return hashlib.blake2b('|'.join(str(p) for p in parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+# Query parameters that change a read endpoint's response body
+VARIANT_PARAMS = ('view', 'fields', 'limit', 'cursor')
+
+
+def variant_for(as_msgpack: bool, args: Mapping[str, str]) -> str:
+    """Identify a representation by codec and the query parameters that shape it
+
+    Other parameters are ignored, so they cannot multiply ETags or cache entries.
+    """
+    shaping = '&'.join(f'{name}={args[name]}' for name in VARIANT_PARAMS if args.get(name) is not None)
+    return ('msgpack' if as_msgpack else 'json') + '?' + shaping
+
+
+def representation() -> str:
+    """Identify the representation the current Flask request asks for"""
+    return variant_for(wants_msgpack(), request.args)
+
+
+def questionnaire_etag(questionnaire_id: int, created_at: Any, variant: Optional[str] = None) -> str:
+    """Strong ETag for a saved questionnaire; rows never change after they are saved"""
+    return _digest('q', questionnaire_id, created_at, variant or representation())
+
+
+def list_etag(user_id: Any, fingerprint: Tuple, variant: Optional[str] = None) -> str:
+    """Strong ETag for a user's questionnaire list, from its (count, max id, latest created_at) fingerprint
+
+    created_at is part of it because SQLite reuses the rowid of a deleted newest row,
+    so a delete followed by a save can leave count and max id unchanged.
+    """
+    return _digest('l', user_id, *fingerprint, variant or representation())
+
+
+def matching_etag(etag: str, if_none_match: Optional[ETags] = None) -> Optional[str]:
+    """Get the variant of an ETag (any content coding) held by If-None-Match
+
+    if_none_match defaults to the current Flask request's header.
+    """
+    if if_none_match is None:
+        if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    for suffix in ENCODING_SUFFIXES:
+        if if_none_match.contains(etag + suffix):
+            return etag + suffix
+    return None
+
+
+def is_not_modified(etag: str) -> bool:
+    """Whether the request's If-None-Match already holds this ETag"""
+    return matching_etag(etag) is not None
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the ETag variant the client holds"""
+    response = Response(status=304)
+    return with_etag(response, matching_etag(etag) or etag)
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Attach an ETag and revalidation headers to a response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Accept')
+    response.vary.add('Authorization')
+    return response
+
+
+class ETagCache:
+    """Per-user cache of list and detail ETags
+
+    Entries expire after ttl seconds, which bounds how long another worker's
+    save or delete can go unnoticed; this worker's own writes invalidate the
+    user's cached ETags immediately. Each user keeps at most max_entries ETags,
+    least recently used first out.
+    """
+
+    def __init__(self, ttl: float = 10, max_users: int = 10000, max_entries: int = 64):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.max_entries = max_entries
+        # user id -> {(kind, key, representation): (etag, expires_at)}, in LRU order
+        self._users: Dict[Any, "OrderedDict[Tuple, Tuple[str, float]]"] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+
+    def get(self, user_id: Any, kind: str, key: Any = None, variant: Optional[str] = None) -> Optional[str]:
+        """Get a cached ETag for a representation (default: the current request's)"""
+        now = time.monotonic()
+        cache_key = (kind, key, variant or representation())
+        with self._lock:
+            etags = self._users.get(user_id)
+            cached = etags.get(cache_key) if etags else None
+            if cached and cached[1] > now:
+                etags.move_to_end(cache_key)
+                self._stats['hits'] += 1
+                return cached[0]
+            if cached:
+                del etags[cache_key]
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, user_id: Any, kind: str, key: Any, etag: str, variant: Optional[str] = None) -> str:
+        """Cache an ETag for a representation (default: the current request's)"""
+        cache_key = (kind, key, variant or representation())
+        now = time.monotonic()
+        with self._lock:
+            if user_id not in self._users and len(self._users) >= self.max_users:
+                # Drop the oldest user (dicts keep insertion order)
+                self._users.pop(next(iter(self._users)))
+            etags = self._users.setdefault(user_id, OrderedDict())
+            # Expired entries are otherwise only dropped when the same key is read again
+            for stale in [k for k, (_, expires_at) in etags.items() if expires_at <= now]:
+                del etags[stale]
+            etags[cache_key] = (etag, now + self.ttl)
+            etags.move_to_end(cache_key)
+            while len(etags) > self.max_entries:
+                etags.popitem(last=False)
+        return etag
+
+    def invalidate(self, user_id: Any, questionnaire_id: Optional[int] = None) -> None:
+        """Record a write for a user: drop their list ETags (and a deleted row's ETags)"""
+        with self._lock:
+            etags = self._users.get(user_id)
+            if not etags:
+                return
+            stale = [
+                cache_key for cache_key in etags
+                if cache_key[0] == 'list' or (questionnaire_id is not None and cache_key[1] == questionnaire_id)
+            ]
+            for cache_key in stale:
+                del etags[cache_key]
+
+    def check(self, etag: Optional[str], if_none_match: Optional[ETags] = None) -> bool:
+        """Whether If-None-Match holds the ETag, counting 304s"""
+        if etag and matching_etag(etag, if_none_match) is not None:
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return True
+        return False
+
+    def get_stats(self) -> Dict:
+        """Get cache counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['users'] = len(self._users)
+            stats['entries'] = sum(len(etags) for etags in self._users.values())
+        stats['ttl'] = self.ttl
+        return stats
+
+
+def get_etag_cache() -> ETagCache:
+    """Create the ETag cache configured from environment variables"""
+    return ETagCache(
+        ttl=float(os.getenv('ETAG_CACHE_TTL', '10')),
+        max_users=int(os.getenv('ETAG_CACHE_MAX_USERS', '10000')),
+        max_entries=int(os.getenv('ETAG_CACHE_MAX_ENTRIES', '64'))
+    )
@@ -0,0 +1,160 @@
+"""
+Frontend serving for Aushadham
+Provides a same-origin serving mode for index.html and its static assets, with
+content-hashed asset URLs cached as immutable, precompressed gzip/brotli variants
+and ETags, so the browser calls the API without CORS preflights
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from typing import Dict, Optional
+import logging
+
+from flask import Response, abort, request
+
+from compression import ResponseCompressor
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - only gzip variants are built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Relative asset references in index.html, rewritten to their hashed URLs
+ASSET_REF = re.compile(r'(src|href)="static/([^"]+)"')
+
+
+class Asset:
+    """One file with its hash, ETag and lazily built compressed variants"""
+
+    def __init__(self, name: str, data: bytes, mimetype: str):
+        self.name = name
+        self.data = data
+        self.mimetype = mimetype
+        self.digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        stem, ext = os.path.splitext(name)
+        self.hashed_name = f'{stem}.{self.digest}{ext}'
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        """Get the body for a content coding, compressing at maximum level on first use"""
+        if encoding is None:
+            return self.data
+        body = self._variants.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self._variants.get(encoding)
+                if body is None:
+                    if encoding == 'br':
+                        body = brotli.compress(self.data, quality=11)
+                    else:
+                        body = gzip.compress(self.data, compresslevel=9, mtime=0)
+                    self._variants[encoding] = body
+        return body
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """Strong ETag of a variant, suffixed like compressed API responses"""
+        return f'{self.digest}-{encoding}' if encoding else self.digest
+
+
+class FrontendAssets:
+    """Serves index.html at / for browsers and its assets under /static/"""
+
+    def __init__(self, root: str, index: str = 'index.html', static_dir: str = 'static'):
+        self.root = root
+        self.static_dir = os.path.join(root, static_dir)
+        self.assets: Dict[str, Asset] = {}
+        self.by_hashed_name: Dict[str, Asset] = {}
+        for name in sorted(os.listdir(self.static_dir)) if os.path.isdir(self.static_dir) else []:
+            path = os.path.join(self.static_dir, name)
+            if os.path.isfile(path):
+                self._add(name, path)
+
+        with open(os.path.join(root, index), 'r', encoding='utf-8') as f:
+            html = f.read()
+        html = ASSET_REF.sub(self._hashed_ref, html)
+        # Tells the page to call the API on its own origin
+        html = re.sub(r'<html\b', '<html data-api-base=""', html, count=1)
+        self.index = Asset(index, html.encode('utf-8'), 'text/html')
+
+    def _add(self, name: str, path: str) -> None:
+        with open(path, 'rb') as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        asset = Asset(name, data, mimetype)
+        self.assets[name] = asset
+        self.by_hashed_name[asset.hashed_name] = asset
+
+    def _hashed_ref(self, match: re.Match) -> str:
+        attr, name = match.groups()
+        asset = self.assets.get(name)
+        if asset is None:
+            logger.warning(f"index.html references missing asset static/{name}")
+            return match.group(0)
+        return f'{attr}="/static/{asset.hashed_name}"'
+
+    def init_app(self, app) -> None:
+        """Register the asset routes on a Flask app (created with static_folder=None)"""
+        app.add_url_rule('/index.html', 'frontend_index', self.index_response)
+        app.add_url_rule('/static/<path:filename>', 'frontend_static', self.static_response)
+
+    @staticmethod
+    def wants_html() -> bool:
+        """Whether the client prefers an HTML page over JSON (i.e. it is a browser)"""
+        accepted = request.accept_mimetypes
+        return accepted['text/html'] > accepted['application/json']
+
+    def index_response(self) -> Response:
+        """Serve index.html; revalidated on every load so new asset hashes are picked up"""
+        return self._serve(self.index, REVALIDATE)
+
+    def static_response(self, filename: str) -> Response:
+        """Serve a hashed asset as immutable, or an unhashed one with revalidation"""
+        asset = self.by_hashed_name.get(filename)
+        if asset is not None:
+            return self._serve(asset, IMMUTABLE)
+        asset = self.assets.get(filename)
+        if asset is None:
+            abort(404)
+        return self._serve(asset, REVALIDATE)
+
+    def _serve(self, asset: Asset, cache_control: str) -> Response:
+        encoding = ResponseCompressor.choose_encoding(request.accept_encodings)
+        etag = asset.etag(encoding)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(asset.variant(encoding), mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def get_stats(self) -> Dict:
+        """Get the served assets and their hashed names"""
+        return {'assets': {name: asset.hashed_name for name, asset in self.assets.items()},
+                'index_bytes': len(self.index.data)}
+
+
+def get_frontend_assets(root: str) -> Optional[FrontendAssets]:
+    """Load the frontend unless SERVE_FRONTEND is false or index.html is missing"""
+    if os.getenv('SERVE_FRONTEND', 'true').lower() != 'true':
+        logger.info("Frontend serving disabled")
+        return None
+    try:
+        assets = FrontendAssets(root)
+    except OSError as e:
+        logger.warning(f"Frontend not served: {e}")
+        return None
+    logger.info(f"Serving frontend with {len(assets.assets)} hashed assets")
+    return assets
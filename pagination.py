@@ -0,0 +1,67 @@
+"""
+Keyset pagination helpers for Aushadham
+Provides opaque cursors over (created_at, id) for newest-first list endpoints and
+parsing of the limit/cursor query parameters
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# (created_at, id) of the last row on the previous page
+Cursor = Tuple[Any, int]
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    """Encode a row's sort key as an opaque URL-safe cursor"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, parse_datetime: bool = False) -> Cursor:
+    """Decode a cursor; raises ValueError if it was not produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(created_at, str) or not isinstance(row_id, int):
+        raise ValueError('Invalid cursor')
+    return (datetime.fromisoformat(created_at) if parse_datetime else created_at), row_id
+
+
+def parse_page_args(args: Mapping[str, str], parse_datetime: bool = False) -> Tuple[int, Optional[Cursor]]:
+    """Read limit and cursor from query parameters; raises ValueError on bad input"""
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except (TypeError, ValueError) as e:
+        raise ValueError('limit must be an integer') from e
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    cursor = args.get('cursor')
+    after = decode_cursor(cursor, parse_datetime) if cursor else None
+    return min(limit, MAX_LIMIT), after
+
+
+def split_page(rows: List, limit: int, key) -> Tuple[List, Optional[str]]:
+    """Trim a limit + 1 fetch to one page and build the cursor for the next page
+
+    key(row) returns the row's (created_at, id).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+def page_fields(count: Optional[int], limit: int, next_cursor: Optional[str]) -> Dict:
+    """Pagination members shared by list responses"""
+    return {'count': count, 'limit': limit, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
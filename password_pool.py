@@ -0,0 +1,144 @@
+"""
+Password verification pool for Aushadham
+Provides a bounded bcrypt worker pool with admission control, so a login burst
+uses at most a fixed number of cores and excess attempts fail fast with a 503
+instead of queueing behind request threads
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(Exception):
+    """No capacity to verify a password now; the client should retry after retry_after seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password verification is saturated')
+        self.retry_after = retry_after
+
+
+def checkpw(password: str, password_hash: str) -> bool:
+    """bcrypt check of a plain-text password against a stored hash"""
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+class PasswordPool:
+    """Runs bcrypt on a dedicated thread pool with a bounded queue
+
+    bcrypt releases the GIL while hashing, so workers bounds the cores spent on
+    hashing. At most max_queue checks wait for a worker; any more are rejected at
+    once, and a check that waited longer than max_wait is dropped before hashing.
+    """
+
+    def __init__(self, workers: int, max_queue: int = 16, max_wait: float = 2.0, retry_after: int = 1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # path -> counters; time is accumulated in seconds
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork, so each (gunicorn) worker process starts its own
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+                    self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, path: str, func: Callable[..., Any], *args: Any) -> Future:
+        """Queue func(*args) on the pool; raises PoolSaturated if the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            self._count(path, rejected=1)
+            raise PoolSaturated(self.retry_after)
+        queued_at = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            try:
+                if started - queued_at > self.max_wait:
+                    self._count(path, expired=1, queued_time=started - queued_at)
+                    raise PoolSaturated(self.retry_after)
+                result = func(*args)
+                self._count(path, calls=1, queued_time=started - queued_at,
+                            hash_time=time.perf_counter() - started)
+                return result
+            finally:
+                self._slots.release()
+
+        try:
+            return self._pool().submit(run)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def check(self, password: str, password_hash: str, path: str = 'login') -> bool:
+        """Verify a password on the pool, blocking the calling thread until it is done"""
+        future = self.submit(path, checkpw, password, password_hash)
+        try:
+            # The job itself gives up after max_wait in the queue; this only guards a stuck worker
+            return future.result(timeout=self.max_wait + 5)
+        except FutureTimeoutError:
+            raise PoolSaturated(self.retry_after)
+
+    async def check_async(self, password: str, password_hash: str, path: str = 'login') -> bool:
+        """Verify a password on the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(path, checkpw, password, password_hash))
+
+    def _count(self, path: str, **deltas: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(path, {
+                'calls': 0, 'rejected': 0, 'expired': 0, 'queued_time': 0.0, 'hash_time': 0.0,
+                'max_queued_time': 0.0
+            })
+            for name, delta in deltas.items():
+                stats[name] += delta
+            if 'queued_time' in deltas:
+                stats['max_queued_time'] = max(stats['max_queued_time'], deltas['queued_time'])
+
+    def get_stats(self) -> Dict:
+        """Get per-path counts and mean/max milliseconds spent queued versus hashing"""
+        with self._lock:
+            paths = {path: dict(stats) for path, stats in self._stats.items()}
+        for stats in paths.values():
+            dequeued = max(1, stats['calls'] + stats['expired'])
+            stats['avg_queued_ms'] = round(stats.pop('queued_time') * 1000 / dequeued, 2)
+            stats['avg_hash_ms'] = round(stats.pop('hash_time') * 1000 / max(1, stats['calls']), 2)
+            stats['max_queued_ms'] = round(stats.pop('max_queued_time') * 1000, 2)
+        return {'workers': self.workers, 'max_queue': self.max_queue, 'paths': paths}
+
+
+_password_pool: Optional[PasswordPool] = None
+_password_pool_lock = threading.Lock()
+
+
+def get_password_pool() -> PasswordPool:
+    """Get the process-wide password pool, configured from environment variables on first use"""
+    global _password_pool
+    if _password_pool is None:
+        with _password_pool_lock:
+            if _password_pool is None:
+                default_workers = max(1, (os.cpu_count() or 2) // 2)
+                _password_pool = PasswordPool(
+                    workers=int(os.getenv('PASSWORD_POOL_WORKERS', str(default_workers))),
+                    max_queue=int(os.getenv('PASSWORD_POOL_MAX_QUEUE', '16')),
+                    max_wait=float(os.getenv('PASSWORD_POOL_MAX_WAIT', '2')),
+                    retry_after=int(os.getenv('PASSWORD_POOL_RETRY_AFTER', '1'))
+                )
+                logger.info(f"Password pool: {_password_pool.workers} workers, "
+                            f"queue limit {_password_pool.max_queue}")
+    return _password_pool
@@ -0,0 +1,63 @@
+"""
+Sparse fieldsets for Aushadham read endpoints
+Provides parsing of the fields= and view= parameters into the set of members a
+response should carry, so large JSON blobs are neither loaded nor serialized when
+the client does not render them
+"""
+from typing import Any, Iterable, Mapping, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Saved questionnaire members, in response order
+QUESTIONNAIRE_FIELDS = (
+    'id', 'session_id', 'symptom', 'initial_description', 'answers', 'report', 'severity', 'created_at'
+)
+# Large JSON columns a summary leaves out
+QUESTIONNAIRE_BLOB_FIELDS = frozenset(['answers', 'report'])
+QUESTIONNAIRE_SUMMARY_FIELDS = tuple(f for f in QUESTIONNAIRE_FIELDS if f not in QUESTIONNAIRE_BLOB_FIELDS)
+
+# Report members, in response order
+REPORT_FIELDS = (
+    'session_id', 'symptom', 'initial_description', 'assessment_date', 'questions_answered',
+    'total_questions', 'severity', 'urgency', 'risk_score', 'recommendations',
+    'suggested_medications', 'answers', 'detailed_answers', 'disclaimer'
+)
+REPORT_SUMMARY_FIELDS = (
+    'session_id', 'symptom', 'assessment_date', 'questions_answered', 'total_questions',
+    'severity', 'urgency', 'risk_score'
+)
+
+VIEWS = ('full', 'summary')
+
+
+def parse_fields(params: Mapping[str, Any], allowed: Tuple[str, ...],
+                 summary: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """Read fields= (comma-separated or a list) or view= into the members to return
+
+    Returns None for the full representation; raises ValueError on unknown names.
+    fields= takes precedence over view=.
+    """
+    fields = params.get('fields')
+    if fields:
+        names = fields.split(',') if isinstance(fields, str) else fields
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError('fields must be a comma-separated list of field names')
+        requested = {name.strip() for name in names if name.strip()}
+        unknown = requested.difference(allowed)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        # Keep the canonical member order
+        return tuple(name for name in allowed if name in requested)
+
+    view = params.get('view', 'full')
+    if view not in VIEWS:
+        raise ValueError(f"view must be one of: {', '.join(VIEWS)}")
+    return summary if view == 'summary' else None
+
+
+def project(record: Mapping[str, Any], fields: Optional[Iterable[str]]) -> dict:
+    """Restrict a record to the requested members (all members when fields is None)"""
+    if fields is None:
+        return dict(record)
+    return {name: record.get(name) for name in fields}
@@ -0,0 +1,212 @@
+"""
+Questionnaire plan registry for Aushadham
+Compiles the questionnaire templates once into immutable question plans with O(1)
+lookup tables; plans are shared by every session, which only keeps a small overlay
+of inserted conditional questions
+"""
+import re
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import logging
+
+from response_codec import encode_json
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_OPTIONS = ('Yes', 'No')
+DEFAULT_WEIGHT = 'low'
+
+
+def normalize_answer(answer: Optional[str]) -> Optional[str]:
+    """Normalize an answer for table lookups"""
+    return answer.strip().lower() if isinstance(answer, str) else None
+
+
+def _freeze_question(question: Dict) -> Mapping:
+    """Return a read-only copy of a template question with defaults filled in"""
+    frozen = dict(question)
+    frozen['options'] = tuple(frozen.get('options', DEFAULT_OPTIONS))
+    frozen.setdefault('weight', DEFAULT_WEIGHT)
+    return MappingProxyType(frozen)
+
+
+class QuestionPlan:
+    """Immutable question plan for one template, shared by all sessions using it"""
+
+    # Upper bound on memoized question sequences per plan
+    MAX_SEQUENCES = 256
+
+    def __init__(self, key: str, template: Dict):
+        """Compile a template dict into frozen questions and conditional branches"""
+        self.key = key
+        self.initial: Tuple[Mapping, ...] = tuple(
+            _freeze_question(q) for q in template.get('initial_questions', [])
+        )
+
+        # parent question id -> normalized answer -> conditional questions
+        branches = {}
+        # (parent question id, normalized answer) -> conditional question ids
+        conditional_table = {}
+        # conditional question id -> (parent question id, question)
+        conditionals = {}
+        for parent_id, answers in template.get('conditional_questions', {}).items():
+            frozen_answers = {}
+            for answer, questions in answers.items():
+                frozen = tuple(_freeze_question(q) for q in questions)
+                frozen_answers[normalize_answer(answer)] = frozen
+                conditional_table[(parent_id, normalize_answer(answer))] = tuple(q['id'] for q in frozen)
+                for q in frozen:
+                    conditionals.setdefault(q['id'], (parent_id, q))
+            branches[parent_id] = MappingProxyType(frozen_answers)
+        self.branches: Mapping[str, Mapping[str, Tuple[Mapping, ...]]] = MappingProxyType(branches)
+        self.conditional_table: Mapping[Tuple[str, str], Tuple[str, ...]] = MappingProxyType(conditional_table)
+        self.conditionals: Mapping[str, Tuple[str, Mapping]] = MappingProxyType(conditionals)
+        self.initial_ids = frozenset(q['id'] for q in self.initial)
+
+        # question id -> question, for initial and conditional questions
+        by_id = {q['id']: q for q in self.initial}
+        for conditional_id, (_, question) in conditionals.items():
+            by_id.setdefault(conditional_id, question)
+        self.questions_by_id: Mapping[str, Mapping] = MappingProxyType(by_id)
+        # question id -> normalized answer options
+        self.option_sets: Mapping[str, frozenset] = MappingProxyType({
+            question_id: frozenset(normalize_answer(option) for option in q['options'])
+            for question_id, q in by_id.items()
+        })
+        # question id -> immutable part of the client payload, and its JSON members
+        self.payloads: Mapping[str, Mapping] = MappingProxyType({
+            question_id: MappingProxyType({'question': q['question'], 'type': q['type'], 'options': q['options']})
+            for question_id, q in by_id.items()
+        })
+        self.payload_fragments: Mapping[str, str] = MappingProxyType({
+            question_id: encode_json(payload)[1:-1]
+            for question_id, payload in self.payloads.items()
+        })
+
+        # Whole-plan decision graph for clients that navigate locally
+        self.graph: Mapping = MappingProxyType({
+            'template': key,
+            'questions': tuple(self._graph_node(q) for q in self.initial),
+            'conditionals': {
+                conditional_id: self._graph_node(question)
+                for conditional_id, (_, question) in conditionals.items()
+            },
+            'branches': {
+                parent_id: {answer: tuple(q['id'] for q in questions) for answer, questions in answers.items()}
+                for parent_id, answers in branches.items()
+            }
+        })
+        self.graph_json: str = encode_json(self.graph)
+
+        # overlay -> (ordered questions, question id -> index)
+        self._resolved: Dict[Tuple[str, ...], Tuple[Tuple[Mapping, ...], Mapping[str, int]]] = {
+            (): (self.initial, self._index(self.initial))
+        }
+        self._lock = threading.Lock()
+
+    def _graph_node(self, question: Mapping) -> Dict:
+        """Client payload for a question in the decision graph, including its id"""
+        return {'id': question['id'], **self.payloads[question['id']]}
+
+    @staticmethod
+    def _index(questions: Tuple[Mapping, ...]) -> Mapping[str, int]:
+        """Map question ids to their first position in a sequence"""
+        index = {}
+        for position, question in enumerate(questions):
+            index.setdefault(question['id'], position)
+        return MappingProxyType(index)
+
+    def accepts(self, question_id: str, answer: Optional[str]) -> bool:
+        """Whether an answer is one of a question's options (case-insensitive)"""
+        options = self.option_sets.get(question_id)
+        return options is not None and normalize_answer(answer) in options
+
+    def conditional_ids_for(self, question_id: str, answer: Optional[str]) -> Tuple[str, ...]:
+        """Get the ids of conditional questions triggered by an answer"""
+        return self.conditional_table.get((question_id, normalize_answer(answer)), ())
+
+    def expand(self, inserted: Tuple[str, ...], question_id: str, answer: Optional[str]) -> Tuple[str, ...]:
+        """Return the overlay after answering a question; already inserted ids are kept once"""
+        new_ids = tuple(
+            conditional_id for conditional_id in self.conditional_ids_for(question_id, answer)
+            if conditional_id not in inserted and conditional_id not in self.initial_ids
+        )
+        return inserted + new_ids if new_ids else inserted
+
+    def sequence(self, inserted: Tuple[str, ...]) -> Tuple[Mapping, ...]:
+        """Resolve an overlay of inserted conditional ids into the ordered question list"""
+        return self._resolve(inserted)[0]
+
+    def index_of(self, inserted: Tuple[str, ...]) -> Mapping[str, int]:
+        """Get the question id -> position map for an overlay"""
+        return self._resolve(inserted)[1]
+
+    def _resolve(self, inserted: Tuple[str, ...]) -> Tuple[Tuple[Mapping, ...], Mapping[str, int]]:
+        """Resolve and memoize the question sequence and index for an overlay"""
+        cached = self._resolved.get(inserted)
+        if cached is not None:
+            return cached
+
+        # Each conditional question follows its parent, in insertion order
+        children: Dict[str, list] = {}
+        for conditional_id in inserted:
+            parent_id, question = self.conditionals[conditional_id]
+            children.setdefault(parent_id, []).append(question)
+
+        resolved = []
+
+        def emit(question):
+            resolved.append(question)
+            for child in children.get(question['id'], ()):
+                emit(child)
+
+        for question in self.initial:
+            emit(question)
+        resolved = tuple(resolved)
+        entry = (resolved, self._index(resolved))
+
+        with self._lock:
+            if len(self._resolved) < self.MAX_SEQUENCES:
+                self._resolved[inserted] = entry
+        return entry
+
+
+class SymptomMatcher:
+    """Single-pass matcher from a free-text symptom to a template key
+
+    All keywords are compiled into one alternation regex, ordered by template
+    priority, inside a lookahead so overlapping occurrences are still seen. The
+    first template (in keyword-table order) with any keyword occurring as a
+    substring wins, exactly as the per-template substring scan did.
+    """
+
+    def __init__(self, keywords: Dict[str, list], default: str):
+        """Compile a template key -> keywords table (dict order is the priority)"""
+        self.default = default
+        # keyword -> (priority, template key); a keyword keeps its highest priority
+        self._keywords: Dict[str, Tuple[int, str]] = {}
+        for priority, (key, words) in enumerate(keywords.items()):
+            for word in words:
+                self._keywords.setdefault(word.lower(), (priority, key))
+        ordered = sorted(self._keywords, key=lambda word: (self._keywords[word][0], -len(word)))
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(word) for word in ordered) + '))')
+
+    def find(self, symptom: Optional[str]) -> Optional[str]:
+        """Get the template key for a symptom, or None if no keyword occurs in it"""
+        best = None
+        for found in self._pattern.finditer((symptom or '').lower()):
+            candidate = self._keywords[found.group(1)]
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+                if best[0] == 0:
+                    break
+        return best[1] if best else None
+
+
+def build_question_plans(templates: Dict[str, Dict]) -> Mapping[str, QuestionPlan]:
+    """Compile every questionnaire template into a shared QuestionPlan"""
+    plans = {key: QuestionPlan(key, template) for key, template in templates.items()}
+    logger.info(f"Compiled {len(plans)} questionnaire plans")
+    return MappingProxyType(plans)
@@ -0,0 +1,193 @@
+"""
+Recommendation and medication catalog for Aushadham reports
+Static report content keyed by questionnaire template id, held as frozen tuples with
+pre-encoded JSON fragments that are spliced into serialized reports
+"""
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from response_codec import encode_json
+
+DISCLAIMER = 'This assessment is for informational purposes only and does not replace professional medical advice. Please consult a healthcare provider for proper diagnosis and treatment.'
+
+# Report keys whose values come from the catalog rather than the session
+STATIC_REPORT_KEYS = frozenset(['recommendations', 'suggested_medications', 'disclaimer'])
+
+# Recommendations and suggested medications by questionnaire template id
+recommendation_catalog = {
+    'stomach': {
+        'recommendations': [
+            'Stay hydrated with small sips of water',
+            'Eat bland foods (BRAT diet: Bananas, Rice, Applesauce, Toast)',
+            'Avoid dairy, caffeine, and fatty foods',
+            'Rest and avoid strenuous activities'
+        ],
+        'medications': [
+            {'name': 'Antacids (Tums, Mylanta)', 'purpose': 'For acid reflux or indigestion'},
+            {'name': 'Bismuth subsalicylate (Pepto-Bismol)', 'purpose': 'For general stomach upset'},
+            {'name': 'Simethicone (Gas-X)', 'purpose': 'For gas and bloating'}
+        ]
+    },
+    'headache': {
+        'recommendations': [
+            'Rest in a quiet, dark room',
+            'Apply cold compress to forehead',
+            'Stay hydrated',
+            'Practice relaxation techniques',
+            'Maintain regular sleep schedule'
+        ],
+        'medications': [
+            {'name': 'Acetaminophen (Tylenol)', 'purpose': 'For mild to moderate pain'},
+            {'name': 'Ibuprofen (Advil, Motrin)', 'purpose': 'For inflammation and pain'},
+            {'name': 'Aspirin', 'purpose': 'For tension headaches'}
+        ]
+    },
+    'fever': {
+        'recommendations': [
+            'Rest and get plenty of sleep',
+            'Stay hydrated with water and electrolyte drinks',
+            'Use cool compresses',
+            'Wear light clothing',
+            'Monitor temperature regularly'
+        ],
+        'medications': [
+            {'name': 'Acetaminophen (Tylenol)', 'purpose': 'To reduce fever'},
+            {'name': 'Ibuprofen (Advil, Motrin)', 'purpose': 'To reduce fever and body aches'}
+        ]
+    },
+    'cough': {
+        'recommendations': [
+            'Stay hydrated to thin mucus',
+            'Use a humidifier',
+            'Gargle with warm salt water',
+            'Avoid irritants like smoke',
+            'Elevate head while sleeping'
+        ],
+        'medications': [
+            {'name': 'Dextromethorphan (Robitussin)', 'purpose': 'For dry cough'},
+            {'name': 'Guaifenesin (Mucinex)', 'purpose': 'For productive cough'},
+            {'name': 'Throat lozenges', 'purpose': 'For throat irritation'}
+        ]
+    },
+    'cancer': {
+        'recommendations': [
+            'Schedule an appointment with a healthcare provider immediately',
+            'Keep a detailed symptom diary',
+            'Prepare questions for your doctor visit',
+            'Bring a family member or friend to appointments',
+            'Request appropriate screening tests',
+            'Do not delay seeking medical attention'
+        ],
+        'medications': [
+            {'name': 'Consult oncologist', 'purpose': 'Professional evaluation and treatment plan required'},
+            {'name': 'Screening tests', 'purpose': 'May include blood work, imaging, or biopsy as recommended'}
+        ]
+    },
+    'diabetes': {
+        'recommendations': [
+            'Monitor blood glucose levels regularly',
+            'Follow a balanced diet - limit simple carbohydrates',
+            'Exercise regularly (30 minutes daily)',
+            'Maintain a healthy weight',
+            'Stay hydrated',
+            'Get regular check-ups and A1C tests',
+            'Check feet daily for cuts or sores'
+        ],
+        'medications': [
+            {'name': 'Metformin', 'purpose': 'First-line medication for Type 2 diabetes (prescription required)'},
+            {'name': 'Insulin', 'purpose': 'For Type 1 diabetes and some Type 2 cases (prescription required)'},
+            {'name': 'Blood glucose meter', 'purpose': 'For self-monitoring'}
+        ]
+    },
+    'hypertension': {
+        'recommendations': [
+            'Monitor blood pressure regularly at home',
+            'Reduce salt intake (less than 2,300 mg/day)',
+            'Maintain a healthy weight',
+            'Exercise regularly (150 minutes/week)',
+            'Limit alcohol consumption',
+            'Manage stress through relaxation techniques',
+            'Quit smoking if applicable',
+            'Follow DASH diet (Dietary Approaches to Stop Hypertension)'
+        ],
+        'medications': [
+            {'name': 'ACE inhibitors or ARBs', 'purpose': 'First-line blood pressure medication (prescription required)'},
+            {'name': 'Diuretics', 'purpose': 'Help reduce fluid retention (prescription required)'},
+            {'name': 'Home blood pressure monitor', 'purpose': 'For regular monitoring'}
+        ]
+    },
+    'asthma': {
+        'recommendations': [
+            'Keep track of triggers and avoid them',
+            'Use air purifiers to reduce allergens',
+            'Take medications as prescribed',
+            'Have an asthma action plan',
+            'Get regular check-ups',
+            'Get annual flu vaccination',
+            'Avoid smoke and air pollution',
+            'Use proper inhaler technique'
+        ],
+        'medications': [
+            {'name': 'Albuterol (rescue inhaler)', 'purpose': 'For quick relief of symptoms (prescription required)'},
+            {'name': 'Inhaled corticosteroids', 'purpose': 'For long-term control (prescription required)'},
+            {'name': 'Peak flow meter', 'purpose': 'To monitor lung function'}
+        ]
+    },
+    'arthritis': {
+        'recommendations': [
+            'Stay physically active with low-impact exercises',
+            'Maintain a healthy weight to reduce joint stress',
+            'Apply heat or cold therapy',
+            'Use assistive devices if needed',
+            'Practice gentle stretching',
+            'Get adequate rest',
+            'Consider physical therapy',
+            'Protect joints during activities'
+        ],
+        'medications': [
+            {'name': 'Acetaminophen (Tylenol)', 'purpose': 'For mild to moderate pain'},
+            {'name': 'NSAIDs (Ibuprofen, Naproxen)', 'purpose': 'For pain and inflammation'},
+            {'name': 'Topical pain relievers', 'purpose': 'For localized joint pain'}
+        ]
+    }
+}
+
+
+class CatalogEntry:
+    """Static report content for one template, with its pre-encoded JSON members"""
+
+    __slots__ = ('key', 'recommendations', 'medications', 'fragment')
+
+    def __init__(self, key: Optional[str], recommendations: Tuple[str, ...], medications: Tuple[Dict, ...]):
+        self.key = key
+        self.recommendations: Tuple[str, ...] = tuple(recommendations)
+        # Shared between reports; treated as read-only
+        self.medications: Tuple[Dict, ...] = tuple(dict(m) for m in medications)
+        # '"recommendations":[...],"suggested_medications":[...],"disclaimer":"..."'
+        self.fragment: str = encode_json(self.static_fields())[1:-1]
+
+    def static_fields(self) -> Dict:
+        """Get the static report fields as a dict"""
+        return {
+            'recommendations': self.recommendations,
+            'suggested_medications': self.medications,
+            'disclaimer': DISCLAIMER
+        }
+
+    def splice(self, dynamic_json: str) -> str:
+        """Splice the static fragment into a JSON object holding the dynamic report fields"""
+        if dynamic_json == '{}':
+            return '{' + self.fragment + '}'
+        return dynamic_json[:-1] + ',' + self.fragment + '}'
+
+
+# Used when the symptom did not match any template keyword
+EMPTY_ENTRY = CatalogEntry(None, (), ())
+
+
+def build_catalog(catalog: Dict[str, Dict]) -> Mapping[str, CatalogEntry]:
+    """Freeze the catalog data into CatalogEntry objects keyed by template id"""
+    return MappingProxyType({
+        key: CatalogEntry(key, entry.get('recommendations', ()), entry.get('medications', ()))
+        for key, entry in catalog.items()
+    })
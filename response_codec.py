@@ -0,0 +1,184 @@
+"""
+Response codec layer for Aushadham
+Encodes API responses with orjson (falling back to the stdlib json module) and
+negotiates MessagePack for clients sending ``Accept: application/msgpack``;
+request bodies sent as ``Content-Type: application/msgpack`` are decoded as well
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Mapping, Optional, Tuple
+import logging
+
+from flask import Request, Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - MessagePack negotiation is disabled
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = frozenset([MSGPACK_MIMETYPE, 'application/x-msgpack'])
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Convert values the encoders do not support natively"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+def encode_json(value: Any) -> str:
+    """Encode a value as compact JSON text"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS).decode('utf-8')
+    return json.dumps(value, default=_default, separators=(',', ':'))
+
+
+def encode_json_bytes(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def decode_json(data) -> Any:
+    """Decode JSON text or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def prefers_msgpack(accept: MIMEAccept) -> bool:
+    """Whether an Accept header prefers MessagePack over JSON"""
+    if msgpack is None:
+        return False
+    best = accept.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE, 'application/x-msgpack'])
+    return best in MSGPACK_MIMETYPES and accept[best] > accept[JSON_MIMETYPE]
+
+
+def parse_accept(value: Optional[str]) -> MIMEAccept:
+    """Parse a raw Accept header (for servers without werkzeug request objects)"""
+    return parse_accept_header(value, MIMEAccept)
+
+
+def wants_msgpack() -> bool:
+    """Whether the current Flask request prefers a MessagePack response"""
+    if msgpack is None or not has_request_context():
+        return False
+    return prefers_msgpack(request.accept_mimetypes)
+
+
+def render(fields: Dict, as_msgpack: bool, **encoded: str) -> Tuple[bytes, str]:
+    """Encode fields plus pre-encoded JSON members; returns (body, mimetype)
+
+    JSON bodies get the members spliced in without re-encoding them; MessagePack
+    bodies get them decoded and packed with the rest of the object.
+    """
+    if as_msgpack:
+        obj = dict(fields)
+        obj.update({name: decode_json(value) for name, value in encoded.items()})
+        return msgpack.packb(obj, default=_default, use_bin_type=True), MSGPACK_MIMETYPE
+    if encoded:
+        return splice_json(fields, **encoded).encode('utf-8'), JSON_MIMETYPE
+    return encode_json_bytes(fields), JSON_MIMETYPE
+
+
+def decode_body(body: bytes, mimetype: Optional[str]) -> Any:
+    """Decode a JSON or MessagePack request body"""
+    if mimetype in MSGPACK_MIMETYPES and msgpack is not None:
+        return msgpack.unpackb(body, raw=False)
+    return decode_json(body)
+
+
+def encode_response(obj: Any, status: int = 200) -> Response:
+    """Encode an object as a JSON or MessagePack response, as negotiated"""
+    body, mimetype = render(obj, wants_msgpack())
+    response = Response(body, status=status, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def spliced_response(fields: Dict, status: int = 200, **encoded: str) -> Response:
+    """Response built from fields plus pre-encoded JSON members (see render())"""
+    body, mimetype = render(fields, wants_msgpack(), **encoded)
+    response = Response(body, status=status, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def splice_json(fields: Dict, **encoded: str) -> str:
+    """Encode fields as a JSON object and splice pre-encoded JSON members into it"""
+    body = encode_json(fields)
+    members = ','.join(f'"{name}":{value}' for name, value in encoded.items())
+    if members:
+        body = body[:-1] + (',' if len(body) > 2 else '') + members + '}'
+    return body
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson, with MessagePack content negotiation for jsonify()"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs.get('indent'):
+            return encode_json(obj)
+        kwargs.setdefault('default', _default)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if self._app.debug and not wants_msgpack():
+            # Indented JSON while debugging
+            return super().response(obj)
+        return encode_response(obj)
+
+
+class CodecRequest(Request):
+    """Request that also parses MessagePack bodies through get_json()/request.json"""
+
+    def get_json(self, force: bool = False, silent: bool = False, cache: bool = True) -> Any:
+        if self.mimetype in MSGPACK_MIMETYPES:
+            if msgpack is None:
+                if silent:
+                    return None
+                return self.on_json_loading_failed(None)
+            try:
+                return decode_body(self.get_data(cache=cache), self.mimetype)
+            except Exception as e:
+                if silent:
+                    return None
+                return self.on_json_loading_failed(e)
+        return super().get_json(force=force, silent=silent, cache=cache)
+
+
+def init_codecs(app) -> None:
+    """Install the codec layer on a Flask app"""
+    app.json = CodecJSONProvider(app)
+    app.request_class = CodecRequest
+    logger.info(f"Response codecs: {'orjson' if orjson else 'json'}"
+                f"{' + msgpack' if msgpack else ''}")
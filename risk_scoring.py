@@ -0,0 +1,138 @@
+"""
+Risk scoring for Aushadham questionnaires
+Compiles each question plan into an answer -> points table and scores single
+sessions on the request path or many stored assessments at once with NumPy
+"""
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import logging
+
+from questionnaire_registry import QuestionPlan, normalize_answer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - batch scoring falls back to pure Python
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Answers that indicate risk, normalized
+RISK_ANSWERS = frozenset([
+    'yes', 'severe', 'more than 3 days', 'above 103°f', '7-9 (severe)', '10 (unbearable)'
+])
+
+# Points added for a risk answer, by question weight
+WEIGHT_POINTS = MappingProxyType({'high': 3, 'medium': 2, 'low': 1})
+
+# (minimum risk score, severity, urgency), highest band first
+SEVERITY_BANDS = (
+    (15, 'High', 'Seek immediate medical attention'),
+    (8, 'Moderate', 'Consult a doctor within 24 hours'),
+    (0, 'Low', 'Monitor symptoms, see doctor if worsens')
+)
+
+
+def severity_for(risk_score: int) -> Tuple[str, str]:
+    """Get the (severity, urgency) band for a risk score"""
+    for threshold, severity, urgency in SEVERITY_BANDS:
+        if risk_score >= threshold:
+            return severity, urgency
+    return SEVERITY_BANDS[-1][1], SEVERITY_BANDS[-1][2]
+
+
+class ScoringTable:
+    """Answer -> points table for one question plan"""
+
+    def __init__(self, plan: QuestionPlan):
+        """Compile the points each (question, answer) pair contributes"""
+        self.key = plan.key
+        # Column order for the batch answers matrix
+        self.question_ids: Tuple[str, ...] = tuple(plan.questions_by_id)
+        self.columns: Mapping[str, int] = MappingProxyType(
+            {question_id: column for column, question_id in enumerate(self.question_ids)}
+        )
+        # question id -> points for a risk answer
+        self.weights: Mapping[str, int] = MappingProxyType({
+            question_id: WEIGHT_POINTS.get(question['weight'], WEIGHT_POINTS['low'])
+            for question_id, question in plan.questions_by_id.items()
+        })
+        # (question id, normalized answer) -> points
+        self.points: Mapping[Tuple[str, str], int] = MappingProxyType({
+            (question_id, answer): weight
+            for question_id, weight in self.weights.items()
+            for answer in RISK_ANSWERS
+        })
+        self.weight_vector = np.array([self.weights[q] for q in self.question_ids], dtype=np.int32) if np else None
+
+    def points_for(self, question_id: str, answer: Optional[str]) -> int:
+        """Get the points a single answer contributes"""
+        return self.points.get((question_id, normalize_answer(answer)), 0)
+
+    def score(self, answers: Mapping[str, str]) -> int:
+        """Score one session's answers"""
+        points = self.points
+        return sum(points.get((question_id, normalize_answer(answer)), 0) for question_id, answer in answers.items())
+
+    def answers_matrix(self, answers_list: Sequence[Mapping[str, str]]):
+        """Build the (sessions x questions) risk-answer indicator matrix"""
+        matrix = np.zeros((len(answers_list), len(self.question_ids)), dtype=np.int32)
+        columns = self.columns
+        for row, answers in enumerate(answers_list):
+            for question_id, answer in answers.items():
+                column = columns.get(question_id)
+                if column is not None and normalize_answer(answer) in RISK_ANSWERS:
+                    matrix[row, column] = 1
+        return matrix
+
+    def score_batch(self, answers_list: Sequence[Mapping[str, str]]) -> List[int]:
+        """Score many sessions' answers at once"""
+        if not answers_list:
+            return []
+        if np is None:
+            return [self.score(answers) for answers in answers_list]
+        return (self.answers_matrix(answers_list) @ self.weight_vector).tolist()
+
+
+class RiskScorer:
+    """Scoring tables for every question plan"""
+
+    def __init__(self, plans: Mapping[str, QuestionPlan]):
+        self.tables: Mapping[str, ScoringTable] = MappingProxyType(
+            {key: ScoringTable(plan) for key, plan in plans.items()}
+        )
+
+    def score(self, template_key: str, answers: Mapping[str, str]) -> Dict:
+        """Score one session and return its risk score, severity and urgency"""
+        risk_score = self.tables[template_key].score(answers)
+        severity, urgency = severity_for(risk_score)
+        return {'risk_score': risk_score, 'severity': severity, 'urgency': urgency}
+
+    def score_batch(self, assessments: Iterable[Tuple[str, Mapping[str, str]]]) -> List[Dict]:
+        """Score many (template key, answers) pairs, vectorized per template
+
+        Results are returned in input order.
+        """
+        assessments = list(assessments)
+        grouped: Dict[str, List[int]] = {}
+        for position, (template_key, _) in enumerate(assessments):
+            grouped.setdefault(template_key, []).append(position)
+
+        scores = [0] * len(assessments)
+        for template_key, positions in grouped.items():
+            batch = self.tables[template_key].score_batch([assessments[p][1] for p in positions])
+            for position, risk_score in zip(positions, batch):
+                scores[position] = risk_score
+
+        if np is not None and scores:
+            # Vectorized banding: SEVERITY_BANDS is ordered high -> low
+            thresholds = np.array([band[0] for band in SEVERITY_BANDS])
+            bands = np.argmax(np.array(scores)[:, None] >= thresholds[None, :], axis=1).tolist()
+        else:
+            bands = [
+                next(i for i, band in enumerate(SEVERITY_BANDS) if s >= band[0] or i == len(SEVERITY_BANDS) - 1)
+                for s in scores
+            ]
+        return [
+            {'risk_score': s, 'severity': SEVERITY_BANDS[b][1], 'urgency': SEVERITY_BANDS[b][2]}
+            for s, b in zip(scores, bands)
+        ]
@@ -0,0 +1,348 @@
+"""
+Questionnaire session storage for Aushadham
+Provides bounded, expiring stores for active questionnaire sessions: an in-memory
+store for single-worker deployments and a SQLite (WAL) store shared by all workers
+on a host
+"""
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Base class for session stores: expiry rules, eviction counters and the sweeper"""
+
+    backend = 'base'
+
+    def __init__(self, idle_ttl: float = 1800, max_lifetime: float = 7200,
+                 max_entries: int = 10000, sweep_interval: float = 60):
+        """Initialize store limits; limits are in seconds and entries"""
+        self.idle_ttl = idle_ttl
+        self.max_lifetime = max_lifetime
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'expired_idle': 0,
+            'expired_lifetime': 0,
+            'evicted_lru': 0,
+            'sweeps': 0
+        }
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_pid: Optional[int] = None
+        self._stop_event = threading.Event()
+
+    def _expiry_reason(self, created_at: float, last_access: float, now: float) -> Optional[str]:
+        """Return the stats key an entry should expire under, if any"""
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return 'expired_lifetime'
+        if self.idle_ttl and now - last_access > self.idle_ttl:
+            return 'expired_idle'
+        return None
+
+    def get(self, session_id: Optional[str]) -> Optional[Any]:
+        """Get a live session and mark it as recently used"""
+        raise NotImplementedError
+
+    def set(self, session_id: str, session: Any) -> None:
+        """Store (or write back) a session"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; returns False if it was not stored"""
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Drop every expired session and return how many were removed"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, session_id: Optional[str]) -> bool:
+        return self.get(session_id) is not None
+
+    def _sweep_loop(self):
+        """Background loop that sweeps expired sessions until stopped"""
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.info(f"Session sweeper removed {removed} expired sessions")
+            except Exception as e:
+                logger.error(f"Session sweeper error: {e}")
+
+    def _ensure_sweeper(self):
+        """Start the sweeper in this process (threads do not survive a fork)"""
+        if self._sweeper_pid != os.getpid() and self.sweep_interval:
+            self.start_sweeper()
+
+    def start_sweeper(self) -> None:
+        """Start the background sweeper thread for the current process"""
+        with self._lock:
+            if self._sweeper_pid == os.getpid() and self._sweeper and self._sweeper.is_alive():
+                return
+            self._stop_event = threading.Event()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name='session-sweeper', daemon=True)
+            self._sweeper_pid = os.getpid()
+            self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread"""
+        self._stop_event.set()
+        if self._sweeper and self._sweeper.is_alive():
+            self._sweeper.join(timeout=1)
+        self._sweeper = None
+        self._sweeper_pid = None
+
+    def get_stats(self) -> Dict:
+        """Get store size, limits and eviction counters (counters are per process)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['active'] = len(self)
+        stats['backend'] = self.backend
+        stats['evicted_total'] = stats['expired_idle'] + stats['expired_lifetime'] + stats['evicted_lru']
+        stats['limits'] = {
+            'idle_ttl': self.idle_ttl,
+            'max_lifetime': self.max_lifetime,
+            'max_entries': self.max_entries
+        }
+        return stats
+
+
+class MemorySessionStore(SessionStore):
+    """Thread-safe in-process LRU store; sessions are only visible to this worker"""
+
+    backend = 'memory'
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        # session_id -> [session, created_at, last_access]; order is LRU -> MRU
+        self._entries: 'OrderedDict[str, list]' = OrderedDict()
+
+    def get(self, session_id: Optional[str]) -> Optional[Any]:
+        """Get a live session and mark it as recently used"""
+        if not session_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            reason = self._expiry_reason(entry[1], entry[2], now)
+            if reason:
+                del self._entries[session_id]
+                self._stats[reason] += 1
+                return None
+            entry[2] = now
+            self._entries.move_to_end(session_id)
+            return entry[0]
+
+    def set(self, session_id: str, session: Any) -> None:
+        """Store a session, evicting the least recently used ones over the cap"""
+        self._ensure_sweeper()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry[0] = session
+                entry[2] = now
+                self._entries.move_to_end(session_id)
+                return
+            self._entries[session_id] = [session, now, now]
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evicted_lru'] += 1
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; returns False if it was not stored"""
+        with self._lock:
+            return self._entries.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sweep(self) -> int:
+        """Drop every expired session and return how many were removed"""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for session_id, entry in list(self._entries.items()):
+                reason = self._expiry_reason(entry[1], entry[2], now)
+                if reason:
+                    del self._entries[session_id]
+                    self._stats[reason] += 1
+                    removed += 1
+            self._stats['sweeps'] += 1
+        return removed
+
+
+class SQLiteSessionStore(SessionStore):
+    """Host-local store shared by every worker process through a SQLite database in WAL mode
+
+    Sessions are persisted as compact JSON state produced by ``serialize`` and rebuilt
+    with ``deserialize``, so callers must ``set()`` a session again after mutating it.
+    """
+
+    backend = 'sqlite'
+
+    # Skip the last_access write when a session was touched this recently (seconds)
+    TOUCH_RESOLUTION = 1.0
+    # Enforce the entry cap every N writes instead of counting rows on each one
+    CAP_CHECK_EVERY = 100
+
+    def __init__(self, path: str, serialize: Callable[[Any], Dict],
+                 deserialize: Callable[[Dict], Any], **limits):
+        super().__init__(**limits)
+        self.path = path
+        self._serialize = serialize
+        self._deserialize = deserialize
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS questionnaire_sessions ('
+                ' session_id TEXT PRIMARY KEY,'
+                ' state BLOB NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' last_access REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_questionnaire_sessions_last_access'
+                ' ON questionnaire_sessions (last_access)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, reopening it after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, session_id: Optional[str]) -> Optional[Any]:
+        """Load a live session and mark it as recently used"""
+        if not session_id:
+            return None
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT state, created_at, last_access FROM questionnaire_sessions WHERE session_id = ?',
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        state, created_at, last_access = row
+        now = time.time()
+        reason = self._expiry_reason(created_at, last_access, now)
+        if reason:
+            if conn.execute('DELETE FROM questionnaire_sessions WHERE session_id = ?', (session_id,)).rowcount:
+                with self._lock:
+                    self._stats[reason] += 1
+            return None
+        if now - last_access > self.TOUCH_RESOLUTION:
+            conn.execute('UPDATE questionnaire_sessions SET last_access = ? WHERE session_id = ?', (now, session_id))
+        return self._deserialize(json.loads(state))
+
+    def set(self, session_id: str, session: Any) -> None:
+        """Persist a session's state, keeping its original creation time"""
+        self._ensure_sweeper()
+        state = json.dumps(self._serialize(session), separators=(',', ':'))
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            'INSERT INTO questionnaire_sessions (session_id, state, created_at, last_access) VALUES (?, ?, ?, ?)'
+            ' ON CONFLICT(session_id) DO UPDATE SET state = excluded.state, last_access = excluded.last_access',
+            (session_id, state, now, now)
+        )
+        with self._lock:
+            self._writes += 1
+            check_cap = self._writes >= self.CAP_CHECK_EVERY
+            if check_cap:
+                self._writes = 0
+        if check_cap:
+            self._enforce_cap(conn)
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; returns False if it was not stored"""
+        return self._connect().execute(
+            'DELETE FROM questionnaire_sessions WHERE session_id = ?', (session_id,)
+        ).rowcount > 0
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM questionnaire_sessions').fetchone()[0]
+
+    def _enforce_cap(self, conn: sqlite3.Connection) -> int:
+        """Evict least recently used sessions above max_entries"""
+        if not self.max_entries:
+            return 0
+        evicted = conn.execute(
+            'DELETE FROM questionnaire_sessions WHERE session_id IN ('
+            ' SELECT session_id FROM questionnaire_sessions ORDER BY last_access'
+            ' LIMIT MAX((SELECT COUNT(*) FROM questionnaire_sessions) - ?, 0))',
+            (self.max_entries,)
+        ).rowcount
+        with self._lock:
+            self._stats['evicted_lru'] += evicted
+        return evicted
+
+    def sweep(self) -> int:
+        """Drop every expired session and return how many were removed"""
+        now = time.time()
+        conn = self._connect()
+        expired_lifetime = expired_idle = 0
+        if self.max_lifetime:
+            expired_lifetime = conn.execute(
+                'DELETE FROM questionnaire_sessions WHERE created_at < ?', (now - self.max_lifetime,)
+            ).rowcount
+        if self.idle_ttl:
+            expired_idle = conn.execute(
+                'DELETE FROM questionnaire_sessions WHERE last_access < ?', (now - self.idle_ttl,)
+            ).rowcount
+        evicted = self._enforce_cap(conn)
+        with self._lock:
+            self._stats['expired_lifetime'] += expired_lifetime
+            self._stats['expired_idle'] += expired_idle
+            self._stats['sweeps'] += 1
+        return expired_lifetime + expired_idle + evicted
+
+
+def get_session_store(serialize: Optional[Callable[[Any], Dict]] = None,
+                      deserialize: Optional[Callable[[Dict], Any]] = None) -> SessionStore:
+    """Factory function to create the session store selected by SESSION_BACKEND
+
+    ``serialize``/``deserialize`` convert sessions to and from JSON-compatible state
+    and are required by the shared (sqlite) backend.
+    """
+    limits = {
+        'idle_ttl': float(os.getenv('SESSION_IDLE_TTL', '1800')),
+        'max_lifetime': float(os.getenv('SESSION_MAX_LIFETIME', '7200')),
+        'max_entries': int(os.getenv('SESSION_MAX_ENTRIES', '10000')),
+        'sweep_interval': float(os.getenv('SESSION_SWEEP_INTERVAL', '60'))
+    }
+    backend = os.getenv('SESSION_BACKEND', 'memory').lower()
+
+    if backend == 'sqlite':
+        if serialize is None or deserialize is None:
+            raise ValueError('The sqlite session backend requires serialize and deserialize functions')
+        path = os.getenv('SESSION_DB_PATH', 'aushadham_sessions.db')
+        try:
+            store = SQLiteSessionStore(path, serialize, deserialize, **limits)
+            logger.info(f"Using shared SQLite session store at {path}")
+            return store
+        except Exception as e:
+            logger.error(f"Failed to open SQLite session store: {e}. Falling back to in-memory sessions.")
+    elif backend != 'memory':
+        logger.warning(f"Unknown SESSION_BACKEND '{backend}'. Using in-memory sessions.")
+
+    return MemorySessionStore(**limits)
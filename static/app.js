@@ -0,0 +1,577 @@
+// --- DOM Elements ---
+const startBtn = document.getElementById('start-btn');
+const restartBtn = document.getElementById('restart-btn');
+const evaluateBtn = document.getElementById('evaluate-btn');
+const backBtn = document.getElementById('back-btn');
+const homeBtn = document.getElementById('home-btn');
+const historyBtn = document.getElementById('history-btn');
+const loginBtn = document.getElementById('login-btn');
+const logoutBtn = document.getElementById('logout-btn');
+const userDisplay = document.getElementById('user-display');
+const backQuestionBtn = document.getElementById('back-question-btn');
+const skipQuestionBtn = document.getElementById('skip-question-btn');
+const symptomInput = document.getElementById('symptom-input');
+const descriptionInput = document.getElementById('description-input');
+
+const startSection = document.getElementById('start-section');
+const questionSection = document.getElementById('question-section');
+const reportSection = document.getElementById('report-section');
+const historySection = document.getElementById('history-section');
+
+const questionText = document.getElementById('question-text');
+const categoryLabel = document.getElementById('category-label');
+const skipLabel = document.getElementById('skip-label');
+const helperText = document.getElementById('helper-text');
+const optionsContainer = document.getElementById('options-container');
+const progressBarFill = document.getElementById('progress-bar-fill');
+const progressText = document.getElementById('progress-text');
+const reportContent = document.getElementById('report-content');
+const historyContent = document.getElementById('history-content');
+const noHistory = document.getElementById('no-history');
+const loadMoreBtn = document.getElementById('load-more-btn');
+
+const saveSection = document.getElementById('save-section');
+const loginPrompt = document.getElementById('login-prompt');
+const saveTestBtn = document.getElementById('save-test-btn');
+const loginToSaveBtn = document.getElementById('login-to-save-btn');
+
+const authModal = document.getElementById('auth-modal');
+const authModalTitle = document.getElementById('auth-modal-title');
+const closeAuthModal = document.getElementById('close-auth-modal');
+const loginForm = document.getElementById('login-form');
+const registerForm = document.getElementById('register-form');
+const switchToRegister = document.getElementById('switch-to-register');
+const switchToLogin = document.getElementById('switch-to-login');
+const loginSubmitBtn = document.getElementById('login-submit-btn');
+const registerSubmitBtn = document.getElementById('register-submit-btn');
+
+const errorBanner = document.getElementById('error-banner');
+const errorMessage = document.getElementById('error-message');
+const modalErrorBanner = document.getElementById('modal-error-banner');
+const modalErrorMessage = document.getElementById('modal-error-message');
+
+// --- State ---
+let sessionId = null;
+let currentQuestion = null;
+let currentUser = null;
+let authToken = null;
+// Cursor for the next page of history; null once every page is shown
+let historyCursor = null;
+// Same origin when the page is served by the API (data-api-base=""), otherwise the deployed API
+const API_BASE_URL = document.documentElement.dataset.apiBase
+    ?? (window.location.hostname === 'localhost' ? 'http://127.0.0.1:5000' : 'https://aushadham.onrender.com');
+
+// --- UI Control Functions ---
+const showSection = (sectionToShow) => {
+    [startSection, questionSection, reportSection, historySection].forEach(section => {
+        if (section.id === sectionToShow) {
+            section.classList.remove('section-hidden');
+            section.classList.add('section-visible');
+        } else {
+            section.classList.add('section-hidden');
+            section.classList.remove('section-visible');
+        }
+    });
+
+    // Show/hide navigation buttons
+    const showNav = sectionToShow !== 'start-section';
+    backBtn.classList.toggle('hidden', !showNav);
+    homeBtn.classList.toggle('hidden', !showNav);
+    historyBtn.classList.toggle('hidden', !showNav || !authToken);
+};
+
+const setLoading = (button, isLoading) => {
+    const btnText = button.querySelector('.btn-text');
+    const spinner = button.querySelector('.loader-spinner');
+    button.disabled = isLoading;
+    if (isLoading) {
+        btnText.textContent = 'Processing...';
+        spinner.classList.remove('hidden');
+    } else {
+        btnText.textContent = 'Start Assessment';
+        spinner.classList.add('hidden');
+    }
+};
+
+const showError = (message) => {
+    errorMessage.textContent = message || 'An unexpected error occurred.';
+    errorBanner.classList.remove('hidden');
+    setTimeout(() => {
+        errorBanner.classList.add('hidden');
+    }, 5000);
+};
+
+const showModalError = (message) => {
+    modalErrorMessage.textContent = message || 'An unexpected error occurred.';
+    modalErrorBanner.classList.remove('hidden');
+    setTimeout(() => {
+        modalErrorBanner.classList.add('hidden');
+    }, 5000);
+};
+
+const showSuccess = (message) => {
+    const successBanner = document.createElement('div');
+    successBanner.className = 'fixed top-4 right-4 bg-green-50 border-2 border-green-400 text-green-800 px-6 py-4 rounded-xl shadow-lg z-50';
+    successBanner.innerHTML = `<strong class="font-bold">Success: </strong><span>${message}</span>`;
+    document.body.appendChild(successBanner);
+    setTimeout(() => {
+        successBanner.remove();
+    }, 3000);
+};
+
+// --- API Call Wrapper ---
+const apiCall = async (endpoint, body, method = 'POST', requiresAuth = false, useModalError = false) => {
+    try {
+        // Content-Type only with a body: a bodyless cross-origin GET then needs no preflight
+        const headers = {};
+        if (body && method !== 'GET') {
+            headers['Content-Type'] = 'application/json';
+        }
+        if (requiresAuth && authToken) {
+            headers['Authorization'] = `Bearer ${authToken}`;
+        }
+        
+        const options = {
+            method: method,
+            headers: headers
+        };
+        
+        if (body && method !== 'GET') {
+            options.body = JSON.stringify(body);
+        }
+        
+        const response = await fetch(`${API_BASE_URL}/${endpoint}`, options);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || 'API request failed');
+        }
+        return data;
+    } catch (error) {
+        console.error(`API Error on ${endpoint}:`, error);
+        if (useModalError) {
+            showModalError(error.message);
+        } else {
+            showError(error.message);
+        }
+        return null;
+    }
+};
+
+// --- Authentication Functions ---
+const initAuth = () => {
+    const storedToken = localStorage.getItem('authToken');
+    const storedUser = localStorage.getItem('currentUser');
+    if (storedToken && storedUser) {
+        authToken = storedToken;
+        currentUser = JSON.parse(storedUser);
+        updateAuthUI();
+    }
+};
+
+const updateAuthUI = () => {
+    if (authToken && currentUser) {
+        loginBtn.classList.add('hidden');
+        logoutBtn.classList.remove('hidden');
+        userDisplay.classList.remove('hidden');
+        userDisplay.textContent = `👤 ${currentUser.username}`;
+        historyBtn.classList.remove('hidden');
+    } else {
+        loginBtn.classList.remove('hidden');
+        logoutBtn.classList.add('hidden');
+        userDisplay.classList.add('hidden');
+        historyBtn.classList.add('hidden');
+    }
+};
+
+const openAuthModal = (isRegister = false) => {
+    authModal.classList.remove('hidden');
+    // Clear any previous error messages
+    modalErrorBanner.classList.add('hidden');
+    if (isRegister) {
+        authModalTitle.textContent = 'Register';
+        loginForm.classList.add('hidden');
+        registerForm.classList.remove('hidden');
+    } else {
+        authModalTitle.textContent = 'Login';
+        loginForm.classList.remove('hidden');
+        registerForm.classList.add('hidden');
+    }
+};
+
+const closeAuthModalFn = () => {
+    authModal.classList.add('hidden');
+    // Clear form fields
+    document.getElementById('login-username').value = '';
+    document.getElementById('login-password').value = '';
+    document.getElementById('register-username').value = '';
+    document.getElementById('register-email').value = '';
+    document.getElementById('register-fullname').value = '';
+    document.getElementById('register-password').value = '';
+};
+
+const handleLogin = async () => {
+    const username = document.getElementById('login-username').value.trim();
+    const password = document.getElementById('login-password').value;
+    
+    if (!username || !password) {
+        showModalError('Please enter username and password');
+        return;
+    }
+    
+    loginSubmitBtn.disabled = true;
+    loginSubmitBtn.textContent = 'Logging in...';
+    
+    const data = await apiCall('login', { username, password }, 'POST', false, true);
+    
+    loginSubmitBtn.disabled = false;
+    loginSubmitBtn.textContent = 'Login';
+    
+    if (data) {
+        authToken = data.access_token;
+        currentUser = data.user;
+        localStorage.setItem('authToken', authToken);
+        localStorage.setItem('currentUser', JSON.stringify(currentUser));
+        updateAuthUI();
+        closeAuthModalFn();
+        showSuccess('Login successful!');
+    }
+};
+
+const handleRegister = async () => {
+    const username = document.getElementById('register-username').value.trim();
+    const email = document.getElementById('register-email').value.trim();
+    const password = document.getElementById('register-password').value;
+    const full_name = document.getElementById('register-fullname').value.trim();
+    
+    if (!username || !email || !password) {
+        showModalError('Please fill in all required fields');
+        return;
+    }
+    
+    registerSubmitBtn.disabled = true;
+    registerSubmitBtn.textContent = 'Registering...';
+    
+    const data = await apiCall('register', { username, email, password, full_name }, 'POST', false, true);
+    
+    registerSubmitBtn.disabled = false;
+    registerSubmitBtn.textContent = 'Register';
+    
+    if (data) {
+        authToken = data.access_token;
+        currentUser = data.user;
+        localStorage.setItem('authToken', authToken);
+        localStorage.setItem('currentUser', JSON.stringify(currentUser));
+        updateAuthUI();
+        closeAuthModalFn();
+        showSuccess('Registration successful!');
+    }
+};
+
+const handleLogout = () => {
+    authToken = null;
+    currentUser = null;
+    localStorage.removeItem('authToken');
+    localStorage.removeItem('currentUser');
+    updateAuthUI();
+    showSuccess('Logged out successfully');
+    if (historySection.classList.contains('section-visible')) {
+        showSection('start-section');
+    }
+};
+
+// --- Core Application Logic ---
+const startQuestionnaire = async () => {
+    const symptom = symptomInput.value.trim();
+    const description = descriptionInput.value.trim();
+    if (!symptom) {
+        showError('Please enter your main symptom to begin.');
+        return;
+    }
+
+    setLoading(startBtn, true);
+    const data = await apiCall('start_questionnaire', { symptom, description });
+    setLoading(startBtn, false);
+
+    if (data) {
+        sessionId = data.session_id;
+        showSection('question-section');
+        displayQuestion(data.question);
+    }
+};
+
+const submitAnswer = async (answer, action = 'next') => {
+    if (!sessionId) return;
+    
+    const buttons = optionsContainer.querySelectorAll('button');
+    buttons.forEach(btn => btn.disabled = true);
+    
+    const data = await apiCall('submit_answer', { session_id: sessionId, answer, action });
+    
+    if (data) {
+        if (data.completed) {
+            showReport();
+        } else {
+            displayQuestion(data.question);
+        }
+    } else {
+        buttons.forEach(btn => btn.disabled = false);
+    }
+};
+
+const displayQuestion = (question) => {
+    currentQuestion = question;
+    
+    categoryLabel.textContent = question.category || 'Assessment';
+    skipLabel.textContent = question.skipped ? '(skipped)' : '';
+    skipLabel.className = question.skipped ? 'text-xs text-gray-500 ml-2' : 'text-xs text-gray-500 ml-2 hidden';
+    
+    helperText.textContent = question.helper_text || '';
+    questionText.textContent = question.question;
+    optionsContainer.innerHTML = '';
+
+    question.options.forEach((opt, idx) => {
+        const colors = ['yellow', 'green', 'red', 'cyan'];
+        const color = colors[idx % colors.length];
+        
+        const btn = document.createElement('button');
+        btn.textContent = opt;
+        btn.className = `w-full bg-white hover:bg-${color}-50 hover:border-${color}-500 text-gray-900 font-semibold py-5 px-6 rounded-xl transition duration-200 border-2 border-${color}-400 card-hover text-lg shadow-md`;
+        btn.onclick = () => submitAnswer(opt, 'next');
+        optionsContainer.appendChild(btn);
+    });
+
+    const totalQuestions = 10;
+    const answered = Math.round((question.progress / 100) * totalQuestions);
+    progressText.textContent = `${answered}/${totalQuestions} questions answered`;
+    progressBarFill.style.width = `${question.progress}%`;
+};
+
+const showReport = async () => {
+    const data = await apiCall('get_report', { session_id: sessionId });
+
+    if (data) {
+        showSection('report-section');
+        const { report } = data;
+        
+        let html = `
+            <div class="bg-white rounded-2xl p-6 border-l-4 border-cyan-500 shadow-md">
+                <h3 class="font-bold text-lg mb-2 text-cyan-600">Symptom Summary</h3>
+                <p class="text-gray-700">${report.symptom}</p>
+            </div>
+            
+            <div class="grid grid-cols-2 gap-4">
+                <div class="bg-white rounded-2xl p-6 text-center shadow-md">
+                    <div class="text-3xl font-bold text-blue-600 mb-2">${report.severity}</div>
+                    <h3 class="text-sm font-semibold text-gray-600">Severity Level</h3>
+                </div>
+                <div class="bg-white rounded-2xl p-6 text-center shadow-md">
+                    <div class="text-3xl font-bold text-amber-600 mb-2">${report.urgency}</div>
+                    <h3 class="text-sm font-semibold text-gray-600">Urgency</h3>
+                </div>
+            </div>
+        `;
+        
+        const createList = (title, items, color = 'cyan') => {
+            if (!items || items.length === 0) return '';
+            return `
+                <div class="bg-white rounded-2xl p-6 shadow-md">
+                    <h4 class="font-bold text-lg mb-4 text-${color}-600">${title}</h4>
+                    <div class="space-y-3">
+                        ${items.map(item => `
+                            <div class="bg-gray-50 rounded-lg p-4 border-l-4 border-${color}-400">
+                                ${typeof item === 'object' 
+                                    ? `<div class="font-semibold text-gray-900 mb-1">${item.name}</div>
+                                       <div class="text-sm text-gray-600">${item.purpose}</div>`
+                                    : `<div class="text-gray-700">${item}</div>`
+                                }
+                            </div>
+                        `).join('')}
+                    </div>
+                </div>
+            `;
+        };
+
+        html += createList('Recommendations', report.recommendations, 'green');
+        html += createList('Suggested Medications', report.suggested_medications, 'purple');
+
+        reportContent.innerHTML = html;
+        
+        // Show save/login prompt
+        if (authToken) {
+            saveSection.classList.remove('hidden');
+            loginPrompt.classList.add('hidden');
+        } else {
+            saveSection.classList.add('hidden');
+            loginPrompt.classList.remove('hidden');
+        }
+    }
+};
+
+const saveTest = async () => {
+    if (!authToken) {
+        showError('Please login to save your test');
+        return;
+    }
+    
+    saveTestBtn.disabled = true;
+    saveTestBtn.textContent = 'Saving...';
+    
+    const data = await apiCall('save_questionnaire', { session_id: sessionId }, 'POST', true);
+    
+    saveTestBtn.disabled = false;
+    saveTestBtn.textContent = 'Save Test Results';
+    
+    if (data) {
+        showSuccess('Test results saved successfully!');
+        saveSection.classList.add('hidden');
+        saveTestBtn.textContent = '✓ Saved';
+    }
+};
+
+const loadHistory = async (more = false) => {
+    if (!authToken) {
+        showError('Please login to view history');
+        return;
+    }
+    
+    // The list is paged; "Load more" follows next_cursor to the following page
+    const cursor = more === true && historyCursor ? `&cursor=${encodeURIComponent(historyCursor)}` : '';
+    loadMoreBtn.disabled = true;
+    const data = await apiCall(`my_questionnaires?view=summary${cursor}`, null, 'GET', true);
+    loadMoreBtn.disabled = false;
+    
+    if (data) {
+        showSection('history-section');
+        historyCursor = data.next_cursor || null;
+        loadMoreBtn.classList.toggle('hidden', !historyCursor);
+        
+        if (cursor || (data.questionnaires && data.questionnaires.length > 0)) {
+            historyContent.classList.remove('hidden');
+            noHistory.classList.add('hidden');
+            
+            let html = '';
+            data.questionnaires.forEach(q => {
+                const date = new Date(q.created_at).toLocaleDateString('en-US', { 
+                    year: 'numeric', 
+                    month: 'short', 
+                    day: 'numeric',
+                    hour: '2-digit',
+                    minute: '2-digit'
+                });
+                
+                const severityColor = {
+                    'High': 'red',
+                    'Moderate': 'yellow',
+                    'Low': 'green'
+                }[q.severity] || 'gray';
+                
+                html += `
+                    <div class="bg-white rounded-2xl p-6 shadow-md border-l-4 border-${severityColor}-400 card-hover">
+                        <div class="flex justify-between items-start mb-3">
+                            <div>
+                                <h3 class="font-bold text-xl text-gray-900 mb-1">${q.symptom}</h3>
+                                <p class="text-sm text-gray-500">${date}</p>
+                            </div>
+                            <span class="px-3 py-1 rounded-full text-sm font-semibold bg-${severityColor}-100 text-${severityColor}-700">
+                                ${q.severity}
+                            </span>
+                        </div>
+                        ${q.initial_description ? `<p class="text-gray-600 mb-3">${q.initial_description}</p>` : ''}
+                        <div class="text-sm text-gray-500">
+                            Session: ${q.session_id.substring(0, 8)}...
+                        </div>
+                    </div>
+                `;
+            });
+            
+            if (cursor) {
+                historyContent.insertAdjacentHTML('beforeend', html);
+            } else {
+                historyContent.innerHTML = html;
+            }
+        } else {
+            historyContent.classList.add('hidden');
+            noHistory.classList.remove('hidden');
+        }
+    }
+};
+
+// --- Event Listeners ---
+startBtn.addEventListener('click', startQuestionnaire);
+restartBtn.addEventListener('click', () => location.reload());
+evaluateBtn.addEventListener('click', () => showReport());
+backBtn.addEventListener('click', () => showSection('start-section'));
+homeBtn.addEventListener('click', () => showSection('start-section'));
+historyBtn.addEventListener('click', () => loadHistory());
+loadMoreBtn.addEventListener('click', () => loadHistory(true));
+backQuestionBtn.addEventListener('click', () => submitAnswer('', 'previous'));
+skipQuestionBtn.addEventListener('click', () => submitAnswer('Skipped', 'skip'));
+
+// Authentication event listeners
+loginBtn.addEventListener('click', () => openAuthModal(false));
+logoutBtn.addEventListener('click', handleLogout);
+closeAuthModal.addEventListener('click', closeAuthModalFn);
+switchToRegister.addEventListener('click', () => openAuthModal(true));
+switchToLogin.addEventListener('click', () => openAuthModal(false));
+loginSubmitBtn.addEventListener('click', handleLogin);
+registerSubmitBtn.addEventListener('click', handleRegister);
+
+// Save test listeners
+saveTestBtn.addEventListener('click', saveTest);
+loginToSaveBtn.addEventListener('click', () => openAuthModal(false));
+
+// Close modal on outside click
+authModal.addEventListener('click', (e) => {
+    if (e.target === authModal) {
+        closeAuthModalFn();
+    }
+});
+
+// Allow Enter key to submit forms
+document.getElementById('login-password').addEventListener('keypress', (e) => {
+    if (e.key === 'Enter') handleLogin();
+});
+document.getElementById('register-password').addEventListener('keypress', (e) => {
+    if (e.key === 'Enter') handleRegister();
+});
+
+// Initialize authentication on page load
+initAuth();
+
+// --- Theme Management ---
+const themeToggleBtn = document.getElementById('theme-toggle-btn');
+const themeIconSun = document.getElementById('theme-icon-sun');
+const themeIconMoon = document.getElementById('theme-icon-moon');
+
+const initTheme = () => {
+    const savedTheme = localStorage.getItem('theme');
+    if (savedTheme === 'dark') {
+        document.body.classList.add('dark-mode');
+        themeIconSun.classList.remove('hidden');
+        themeIconMoon.classList.add('hidden');
+    } else {
+        document.body.classList.remove('dark-mode');
+        themeIconSun.classList.add('hidden');
+        themeIconMoon.classList.remove('hidden');
+    }
+};
+
+const toggleTheme = () => {
+    document.body.classList.toggle('dark-mode');
+    const isDark = document.body.classList.contains('dark-mode');
+    
+    if (isDark) {
+        localStorage.setItem('theme', 'dark');
+        themeIconSun.classList.remove('hidden');
+        themeIconMoon.classList.add('hidden');
+    } else {
+        localStorage.setItem('theme', 'light');
+        themeIconSun.classList.add('hidden');
+        themeIconMoon.classList.remove('hidden');
+    }
+};
+
+themeToggleBtn.addEventListener('click', toggleTheme);
+
+// Initialize theme on page load
+initTheme();
@@ -36,6 +36,8 @@ CREATE TABLE IF NOT EXISTS saved_questionnaires (
 CREATE INDEX IF NOT EXISTS idx_saved_questionnaires_user_id ON saved_questionnaires(user_id);
 CREATE INDEX IF NOT EXISTS idx_saved_questionnaires_session_id ON saved_questionnaires(session_id);
 CREATE INDEX IF NOT EXISTS idx_saved_questionnaires_created_at ON saved_questionnaires(created_at DESC);
+-- Keyset pagination of a user's questionnaires on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_saved_questionnaires_user_page ON saved_questionnaires(user_id, created_at DESC, id DESC);
 
 -- User feedback table
 CREATE TABLE IF NOT EXISTS user_feedback (
@@ -52,6 +54,8 @@ CREATE TABLE IF NOT EXISTS user_feedback (
 CREATE INDEX IF NOT EXISTS idx_user_feedback_user_id ON user_feedback(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_feedback_questionnaire_id ON user_feedback(questionnaire_id);
 CREATE INDEX IF NOT EXISTS idx_user_feedback_created_at ON user_feedback(created_at DESC);
+-- Keyset pagination of a user's feedback on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_user_feedback_user_page ON user_feedback(user_id, created_at DESC, id DESC);
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
@@ -3,27 +3,116 @@ Supabase database service layer for Aushadham
 Provides an abstraction layer for database operations using Supabase
 """
 import os
+import re
+import threading
 import bcrypt
 from datetime import datetime
-from typing import Dict, List, Optional
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from password_pool import get_password_pool, PoolSaturated
 import logging
 
+if TYPE_CHECKING:
+    from postgrest import SyncPostgrestClient
+
 logger = logging.getLogger(__name__)
 
+# Explicit column lists instead of select('*')
+QUESTIONNAIRE_COLUMNS = (
+    'id', 'user_id', 'session_id', 'symptom', 'initial_description', 'answers', 'report', 'severity', 'created_at'
+)
+USER_COLUMNS = ('id', 'username', 'email', 'password_hash', 'full_name', 'phone', 'created_at')
+FEEDBACK_COLUMNS = ('id', 'user_id', 'questionnaire_id', 'rating', 'comment', 'feedback_type', 'created_at')
+
+
+def transport_settings() -> Dict:
+    """Connection pool, protocol and timeout settings for PostgREST calls, from environment variables"""
+    return {
+        'max_connections': int(os.getenv('SUPABASE_MAX_CONNECTIONS', '20')),
+        'max_keepalive': int(os.getenv('SUPABASE_MAX_KEEPALIVE', '10')),
+        'keepalive_expiry': float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', '60')),
+        'http2': os.getenv('SUPABASE_HTTP2', 'false').lower() == 'true',
+        'connect_timeout': float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '3')),
+        'read_timeout': float(os.getenv('SUPABASE_READ_TIMEOUT', '10')),
+        'write_timeout': float(os.getenv('SUPABASE_WRITE_TIMEOUT', '10')),
+        'pool_timeout': float(os.getenv('SUPABASE_POOL_TIMEOUT', '2'))
+    }
+
+
+def session_options(transport: Dict) -> Dict:
+    """httpx client arguments (timeout, limits, http2) for transport settings"""
+    import httpx
+
+    http2 = transport['http2']
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("SUPABASE_HTTP2 needs the h2 package (pip install httpx[http2]); using HTTP/1.1")
+            http2 = False
+    return {
+        'timeout': httpx.Timeout(connect=transport['connect_timeout'], read=transport['read_timeout'],
+                                 write=transport['write_timeout'], pool=transport['pool_timeout']),
+        'limits': httpx.Limits(max_connections=transport['max_connections'],
+                               max_keepalive_connections=transport['max_keepalive'],
+                               keepalive_expiry=transport['keepalive_expiry']),
+        'http2': http2
+    }
+
 
 class SupabaseService:
     """Service class to handle all Supabase database operations"""
     
-    def __init__(self, supabase_url: str, supabase_key: str):
-        """Initialize Supabase client"""
+    def __init__(self, supabase_url: str, supabase_key: str, transport: Optional[Dict] = None):
+        """Initialize the PostgREST client of the Supabase project"""
+        if not re.match(r'^https?://.+', supabase_url or ''):
+            raise ValueError('Invalid Supabase URL')
+        self.rest_url = f"{supabase_url.rstrip('/')}/rest/v1"
+        self._headers = {'apiKey': supabase_key, 'Authorization': f'Bearer {supabase_key}'}
+        self.transport = transport or transport_settings()
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
         try:
-            self.client: Client = create_client(supabase_url, supabase_key)
+            # Built now so configuration errors surface at startup; rebuilt in each forked worker
+            self.client
             logger.info("Supabase client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Supabase client: {e}")
             raise
     
+    @property
+    def client(self) -> "SyncPostgrestClient":
+        """PostgREST client of this worker process, created on first use after a fork"""
+        # Pooled sockets must not be shared across gunicorn's fork
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._client = self._create_client()
+                    self._pid = os.getpid()
+        return self._client
+    
+    def _create_client(self) -> "SyncPostgrestClient":
+        # Only the REST API is used, so the auth, storage and realtime clients of
+        # supabase.create_client are skipped. Imported here: the client library costs
+        # ~0.4 s to import and SQLAlchemy deployments never need it.
+        from postgrest import SyncPostgrestClient
+        from postgrest.utils import SyncClient
+
+        options = session_options(self.transport)
+        client = SyncPostgrestClient(self.rest_url, headers=self._headers, timeout=options['timeout'])
+        # Replace the default session with a sized keep-alive pool
+        default_session = client.session
+        client.session = SyncClient(base_url=default_session.base_url, headers=default_session.headers, **options)
+        default_session.close()
+        return client
+    
+    def close(self) -> None:
+        """Close this worker's pooled connections"""
+        if self._client is not None and self._pid == os.getpid():
+            self._client.session.close()
+            self._client = None
+            self._pid = None
+    
     # User Management
     def create_user(self, username: str, email: str, password: str, 
                    full_name: str = '', phone: str = '') -> Optional[Dict]:
@@ -54,7 +143,7 @@ class SupabaseService:
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
-            response = self.client.table('users').select('*').eq('username', username).execute()
+            response = self.client.table('users').select(*USER_COLUMNS).eq('username', username).execute()
             if response.data:
                 return response.data[0]
             return None
@@ -65,7 +154,7 @@ class SupabaseService:
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         try:
-            response = self.client.table('users').select('*').eq('email', email).execute()
+            response = self.client.table('users').select(*USER_COLUMNS).eq('email', email).execute()
             if response.data:
                 return response.data[0]
             return None
@@ -76,7 +165,7 @@ class SupabaseService:
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Get user by ID"""
         try:
-            response = self.client.table('users').select('*').eq('id', user_id).execute()
+            response = self.client.table('users').select(*USER_COLUMNS).eq('id', user_id).execute()
             if response.data:
                 return response.data[0]
             return None
@@ -96,18 +185,24 @@ class SupabaseService:
             raise
     
     def verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against hash on the shared password pool (raises PoolSaturated)"""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+            return get_password_pool().check(password, password_hash, 'supabase')
+        except PoolSaturated:
+            raise
         except Exception as e:
             logger.error(f"Error verifying password: {e}")
             return False
     
     # Questionnaire Management
-    def save_questionnaire(self, user_id: int, session_id: str, symptom: str,
-                          initial_description: str, answers: Dict, report: Dict,
-                          severity: str) -> Optional[Dict]:
-        """Save a completed questionnaire"""
+    def save_questionnaire_once(self, user_id: int, session_id: str, symptom: str,
+                                initial_description: str, answers: Dict, report: Dict,
+                                severity: str) -> Optional[Dict]:
+        """Save a completed questionnaire unless its session was already saved, in one request
+
+        INSERT ... ON CONFLICT (session_id) DO NOTHING: returns the saved row, or None
+        if the session_id exists (skipped rows are not returned).
+        """
         try:
             data = {
                 'user_id': user_id,
@@ -120,7 +215,9 @@ class SupabaseService:
                 'created_at': datetime.utcnow().isoformat()
             }
             
-            response = self.client.table('saved_questionnaires').insert(data).execute()
+            response = self.client.table('saved_questionnaires')\
+                .upsert(data, on_conflict='session_id', ignore_duplicates=True)\
+                .execute()
             
             if response.data:
                 return response.data[0]
@@ -129,35 +226,58 @@ class SupabaseService:
             logger.error(f"Error saving questionnaire: {e}")
             raise
     
-    def get_questionnaire_by_session_id(self, session_id: str) -> Optional[Dict]:
-        """Get questionnaire by session ID"""
+    @staticmethod
+    def _newest_first(query, limit: Optional[int], after: Optional[Tuple[str, int]]):
+        """Order a query by (created_at, id) descending and apply a keyset page"""
+        # One order parameter for both keys, set explicitly rather than through order()
+        query.params = query.params.set('order', 'created_at.desc,id.desc')
+        if after is not None:
+            created_at, row_id = after
+            keyset = f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{int(row_id)}))'
+            if hasattr(query, 'or_'):
+                query = query.or_(keyset[1:-1])
+            else:
+                query.params = query.params.add('or', keyset)
+        if limit is not None:
+            # Range header; rows 0..limit-1 of the keyset page
+            query = query.range(0, limit)
+        return query
+    
+    def get_user_questionnaires(self, user_id: int, limit: Optional[int] = None,
+                                after: Optional[Tuple[str, int]] = None,
+                                columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> List[Dict]:
+        """Get a user's questionnaires, newest first, optionally one keyset page at a time"""
         try:
-            response = self.client.table('saved_questionnaires').select('*').eq('session_id', session_id).execute()
-            if response.data:
-                return response.data[0]
-            return None
+            query = self.client.table('saved_questionnaires')\
+                .select(*columns)\
+                .eq('user_id', user_id)
+            response = self._newest_first(query, limit, after).execute()
+            return response.data if response.data else []
         except Exception as e:
-            logger.error(f"Error getting questionnaire by session ID: {e}")
-            return None
+            logger.error(f"Error getting user questionnaires: {e}")
+            return []
     
-    def get_user_questionnaires(self, user_id: int) -> List[Dict]:
-        """Get all questionnaires for a user"""
+    def get_user_questionnaires_fingerprint(self, user_id: int) -> Optional[Tuple[int, Optional[int], Any]]:
+        """Get (count, max id, its created_at) of a user's questionnaires in one request, without row data"""
         try:
             response = self.client.table('saved_questionnaires')\
-                .select('*')\
+                .select('id', 'created_at', count='exact')\
                 .eq('user_id', user_id)\
-                .order('created_at', desc=True)\
+                .order('id', desc=True)\
+                .limit(1)\
                 .execute()
-            return response.data if response.data else []
+            newest = response.data[0] if response.data else {}
+            return (response.count or 0, newest.get('id'), newest.get('created_at'))
         except Exception as e:
-            logger.error(f"Error getting user questionnaires: {e}")
-            return []
+            logger.error(f"Error getting user questionnaires fingerprint: {e}")
+            return None
     
-    def get_questionnaire_by_id(self, questionnaire_id: int, user_id: int) -> Optional[Dict]:
+    def get_questionnaire_by_id(self, questionnaire_id: int, user_id: int,
+                                columns: Sequence[str] = QUESTIONNAIRE_COLUMNS) -> Optional[Dict]:
         """Get a specific questionnaire by ID for a user"""
         try:
             response = self.client.table('saved_questionnaires')\
-                .select('*')\
+                .select(*columns)\
                 .eq('id', questionnaire_id)\
                 .eq('user_id', user_id)\
                 .execute()
@@ -168,15 +288,31 @@ class SupabaseService:
             logger.error(f"Error getting questionnaire by ID: {e}")
             return None
     
-    def delete_questionnaire(self, questionnaire_id: int, user_id: int) -> bool:
-        """Delete a questionnaire"""
+    def questionnaire_belongs_to(self, questionnaire_id: int, user_id: int) -> bool:
+        """Whether a questionnaire exists and belongs to a user, fetching only its id"""
         try:
             response = self.client.table('saved_questionnaires')\
-                .delete()\
+                .select('id')\
                 .eq('id', questionnaire_id)\
                 .eq('user_id', user_id)\
+                .limit(1)\
                 .execute()
-            return True
+            return bool(response.data)
+        except Exception as e:
+            logger.error(f"Error checking questionnaire ownership: {e}")
+            return False
+    
+    def delete_questionnaire(self, questionnaire_id: int, user_id: int) -> bool:
+        """Delete a user's questionnaire in one request; returns False if there was none"""
+        try:
+            query = self.client.table('saved_questionnaires')\
+                .delete()\
+                .eq('id', questionnaire_id)\
+                .eq('user_id', user_id)
+            # DELETE ... RETURNING id: an empty result means nothing matched
+            query.params = query.params.add('select', 'id')
+            response = query.execute()
+            return bool(response.data)
         except Exception as e:
             logger.error(f"Error deleting questionnaire: {e}")
             raise
@@ -204,18 +340,31 @@ class SupabaseService:
             logger.error(f"Error creating feedback: {e}")
             raise
     
-    def get_user_feedback(self, user_id: int) -> List[Dict]:
-        """Get all feedback submitted by a user"""
+    def get_user_feedback(self, user_id: int, limit: Optional[int] = None,
+                          after: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """Get feedback submitted by a user, newest first, optionally one keyset page at a time"""
         try:
-            response = self.client.table('user_feedback')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .order('created_at', desc=True)\
-                .execute()
+            query = self.client.table('user_feedback')\
+                .select(*FEEDBACK_COLUMNS)\
+                .eq('user_id', user_id)
+            response = self._newest_first(query, limit, after).execute()
             return response.data if response.data else []
         except Exception as e:
             logger.error(f"Error getting user feedback: {e}")
             return []
+    
+    def count_user_feedback(self, user_id: int) -> Optional[int]:
+        """Count a user's feedback without fetching rows"""
+        try:
+            response = self.client.table('user_feedback')\
+                .select('id', count='exact')\
+                .eq('user_id', user_id)\
+                .limit(1)\
+                .execute()
+            return response.count or 0
+        except Exception as e:
+            logger.error(f"Error counting user feedback: {e}")
+            return None
 
 
 def get_supabase_service() -> Optional[SupabaseService]:
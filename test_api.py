@@ -75,13 +75,20 @@ def test_questionnaire_flow(token):
     session_id = data.get('session_id')
     print(f"Questionnaire started: {session_id}")
     
-    # Answer some questions
-    for i in range(3):
+    # Answer some questions with the first of each question's options
+    answered = 0
+    while answered < 3 and data.get('question'):
         response = requests.post(f"{BASE_URL}/submit_answer", json={
             "session_id": session_id,
-            "answer": "Yes",
+            "answer": data['question']['options'][0],
             "action": "next"
         })
+        data = response.json()
+        if response.status_code != 200:
+            print(f"❌ Answer rejected ({response.status_code}): {data.get('error')}")
+            return None
+        answered += 1
+    print(f"Answered {answered} questions")
     
     # Get report
     response = requests.post(f"{BASE_URL}/get_report", json={
@@ -101,6 +108,28 @@ def test_questionnaire_flow(token):
     
     return save_data.get('questionnaire', {}).get('id')
 
+def test_batch_answers():
+    """Test submitting queued answers in one request"""
+    print("\n=== Testing Batch Answer Submission ===")
+    response = requests.post(f"{BASE_URL}/start_questionnaire", json={
+        "symptom": "stomach pain"
+    })
+    session_id = response.json().get('session_id')
+    
+    response = requests.post(f"{BASE_URL}/submit_answers", json={
+        "session_id": session_id,
+        "operations": [
+            {"question_id": "hydration", "answer": "No"},
+            {"question_id": "recent_meal", "answer": "Yes"},
+            {"answer": "Street food"},
+            {"skip": True}
+        ]
+    })
+    print(f"Status: {response.status_code}")
+    data = response.json()
+    print(f"Success: {data.get('success')}")
+    print(f"Applied: {data.get('applied')}, Severity: {data.get('assessment', {}).get('severity')}")
+
 def test_get_questionnaires(token):
     """Test getting saved questionnaires"""
     print("\n=== Testing Get Questionnaires ===")
@@ -155,6 +184,7 @@ def main():
     # Test authenticated endpoints
     test_profile(token)
     questionnaire_id = test_questionnaire_flow(token)
+    test_batch_answers()
     test_get_questionnaires(token)
     
     if questionnaire_id:
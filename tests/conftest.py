@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the Aushadham unit tests
+Runs app.py against a scratch SQLite database with in-memory sessions
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app.py reads its configuration at import time; keep the tests off the checkout's files
+SCRATCH = tempfile.mkdtemp(prefix='aushadham-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(SCRATCH, 'aushadham.db')
+os.environ['USE_SUPABASE'] = 'false'
+os.environ['DATABASE_USERS'] = 'false'
+os.environ['SESSION_BACKEND'] = 'memory'
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(SCRATCH, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post('/login', json={'username': 'user1', 'password': 'password123'})
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def completed_session_id(client):
+    """Start a questionnaire and complete it in one request"""
+    session_id = client.post('/start_questionnaire', json={'symptom': 'headache'}).get_json()['session_id']
+    client.post('/complete_questionnaire', json={'session_id': session_id, 'answers': {}})
+    return session_id
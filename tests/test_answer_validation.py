@@ -0,0 +1,46 @@
+"""
+Tests that every answer route only records one of the current question's options
+"""
+import pytest
+
+
+def test_submit_answers_rejects_missing_and_unknown_answers(client):
+    session_id = client.post('/start_questionnaire', json={'symptom': 'stomach pain'}).get_json()['session_id']
+    for operations in ([{}], [{'answer': 5}], [{'answer': ''}], [{'answer': 'Maybe'}]):
+        response = client.post('/submit_answers', json={'session_id': session_id, 'operations': operations})
+        assert response.status_code == 400
+        assert response.get_json()['applied'] == 0
+
+    response = client.post('/submit_answers', json={
+        'session_id': session_id, 'operations': [{'answer': 'yes'}, {'skip': True}]
+    })
+    assert response.status_code == 200
+    assert response.get_json()['applied'] == 2
+
+    response = client.post('/submit_answer', json={'session_id': session_id, 'action': 'next'})
+    assert response.status_code == 400
+
+
+def test_complete_questionnaire_rejects_answers_outside_the_options(client):
+    session_id = client.post('/start_questionnaire', json={'symptom': 'stomach pain'}).get_json()['session_id']
+    response = client.post('/complete_questionnaire', json={
+        'session_id': session_id,
+        'answers': {'hydration': 'Maybe', 'recent_meal': '', 'nausea': 'yes', 'not_a_question': 'x'}
+    })
+    assert response.status_code == 400
+    assert response.get_json()['invalid_answers'] == ['hydration', 'recent_meal']
+
+    # Nothing was recorded, so a valid retry completes the session
+    response = client.post('/complete_questionnaire', json={
+        'session_id': session_id, 'answers': {'hydration': 'No', 'nausea': 'Yes', 'pain_location': 'Skipped'}
+    })
+    assert response.status_code == 200
+    report = response.get_json()['report']
+    assert report['answers'] == {'hydration': 'No', 'nausea': 'Yes', 'pain_location': 'Skipped'}
+
+
+def test_apply_answers_leaves_the_session_unchanged_on_invalid_answers(app_module):
+    session = app_module.QuestionnaireSession('invalid-batch', 'fever', '')
+    with pytest.raises(ValueError):
+        session.apply_answers({'temperature': 'Lukewarm'})
+    assert session.answers == {} and not session.completed
@@ -0,0 +1,63 @@
+"""
+Tests for response compression and the spliced gzip path
+"""
+import gzip
+import json
+
+import pytest
+from werkzeug.http import parse_accept_header
+
+from compression import ResponseCompressor, brotli
+
+
+def accept(header):
+    return parse_accept_header(header)
+
+
+@pytest.mark.parametrize('head,tail', [
+    (b'{"dynamic":1,', b'"static":"' + b'x' * 5000 + b'"}'),
+    (b'', b'{"only":"tail"}'),
+    (b'{"a":"' + bytes(range(32, 127)) * 40 + b'",', b'"b":[1,2,3]}'),
+])
+def test_gzip_splice_round_trips(head, tail):
+    compressor = ResponseCompressor()
+    first = compressor.gzip_spliced(head, tail)
+    second = compressor.gzip_spliced(head, tail)
+    assert gzip.decompress(first) == head + tail
+    assert second == first
+    assert compressor.fragments.hits == 1
+
+
+def test_spliceable_body_prefers_gzip_even_when_br_is_accepted():
+    compressor = ResponseCompressor(min_size=0)
+    tail = b'"static":"' + b'y' * 2000 + b'"}'
+    data = b'{"risk_score":3,' + tail
+    body, encoding = compressor.encode(data, accept('gzip, deflate, br'), tail)
+    assert encoding == 'gzip'
+    assert gzip.decompress(body) == data
+    stats = compressor.get_stats()
+    assert stats['spliced'] == 1 and stats['gzip'] == 1 and stats['br'] == 0
+
+
+@pytest.mark.skipif(brotli is None, reason='Brotli is not installed')
+def test_body_without_tail_uses_br():
+    compressor = ResponseCompressor(min_size=0)
+    data = b'{"x":"' + b'z' * 2000 + b'"}'
+    body, encoding = compressor.encode(data, accept('gzip, br'))
+    assert encoding == 'br'
+    assert brotli.decompress(body) == data
+    assert compressor.get_stats()['br'] == 1
+
+
+def test_small_bodies_are_not_compressed():
+    compressor = ResponseCompressor(min_size=1024)
+    assert compressor.encode(b'{}', accept('gzip')) is None
+    assert compressor.get_stats()['skipped_small'] == 1
+
+
+def test_report_decompresses_to_the_uncompressed_report(client, completed_session_id):
+    plain = client.post('/get_report', json={'session_id': completed_session_id})
+    packed = client.post('/get_report', json={'session_id': completed_session_id},
+                         headers={'Accept-Encoding': 'gzip, br'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(packed.data)) == plain.get_json()
@@ -0,0 +1,89 @@
+"""
+Tests for ETags, 304 revalidation and the per-user ETag cache
+"""
+from werkzeug.datastructures import ETags
+
+from conditional_get import ETagCache, matching_etag, variant_for
+
+
+def save_questionnaire(client, headers):
+    session_id = client.post('/start_questionnaire', json={'symptom': 'fever'}).get_json()['session_id']
+    client.post('/complete_questionnaire', json={'session_id': session_id, 'answers': {}})
+    return client.post('/save_questionnaire', json={'session_id': session_id}, headers=headers).get_json()
+
+
+def test_list_revalidation_returns_304_until_a_save(client, auth_headers):
+    save_questionnaire(client, auth_headers)
+    first = client.get('/my_questionnaires?view=summary', headers=auth_headers)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    revalidated = client.get('/my_questionnaires?view=summary', headers={**auth_headers, 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+
+    # Parameters that do not shape the body do not change the ETag
+    junk = client.get('/my_questionnaires?view=summary&_=123', headers={**auth_headers, 'If-None-Match': etag})
+    assert junk.status_code == 304
+
+    save_questionnaire(client, auth_headers)
+    changed = client.get('/my_questionnaires?view=summary', headers={**auth_headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_detail_revalidation_accepts_the_compressed_variant(client, auth_headers):
+    questionnaire_id = save_questionnaire(client, auth_headers)['questionnaire']['id']
+    url = f'/my_questionnaires/{questionnaire_id}'
+    compressed = client.get(url, headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+    etag = compressed.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    revalidated = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+
+
+def test_variant_ignores_non_shaping_parameters():
+    assert variant_for(False, {'view': 'summary', 'utm': 'x'}) == variant_for(False, {'view': 'summary'})
+    assert variant_for(False, {'limit': '5'}) != variant_for(False, {'limit': '6'})
+    assert variant_for(True, {}) != variant_for(False, {})
+
+
+def test_matching_etag_finds_encoded_variants():
+    assert matching_etag('abc', ETags(['abc-br'])) == 'abc-br'
+    assert matching_etag('abc', ETags(['abd'])) is None
+
+
+def test_etag_cache_bounds_entries_per_user():
+    cache = ETagCache(ttl=60, max_entries=3)
+    for n in range(10):
+        cache.put(1, 'detail', n, f'etag-{n}', variant='json?')
+    assert cache.get_stats()['entries'] == 3
+    assert cache.get(1, 'detail', 0, variant='json?') is None
+    assert cache.get(1, 'detail', 9, variant='json?') == 'etag-9'
+
+
+def test_etag_cache_invalidate_drops_lists_and_the_written_row():
+    cache = ETagCache(ttl=60)
+    cache.put(1, 'list', None, 'list-etag', variant='json?')
+    cache.put(1, 'detail', 5, 'row-5', variant='json?')
+    cache.put(1, 'detail', 6, 'row-6', variant='json?')
+    cache.invalidate(1, questionnaire_id=5)
+    assert cache.get(1, 'list', None, variant='json?') is None
+    assert cache.get(1, 'detail', 5, variant='json?') is None
+    assert cache.get(1, 'detail', 6, variant='json?') == 'row-6'
+
+
+def test_list_etag_changes_when_a_deleted_newest_id_is_reused(client, auth_headers):
+    # SQLite hands the rowid of a deleted newest row to the next insert
+    save_questionnaire(client, auth_headers)
+    newest = save_questionnaire(client, auth_headers)['questionnaire']['id']
+    etag = client.get('/my_questionnaires', headers=auth_headers).headers['ETag']
+
+    assert client.delete(f'/my_questionnaires/{newest}', headers=auth_headers).status_code == 200
+    assert save_questionnaire(client, auth_headers)['questionnaire']['id'] == newest
+
+    response = client.get('/my_questionnaires', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,64 @@
+"""
+Tests for keyset cursors and the paged questionnaire list
+"""
+from datetime import datetime
+
+import pytest
+
+from pagination import MAX_LIMIT, decode_cursor, encode_cursor, parse_page_args, split_page
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor) == (created_at.isoformat(), 42)
+    assert decode_cursor(cursor, parse_datetime=True) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor('2024-01-01', 1)[:-3], 'WzEsMl0'])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_page_args():
+    assert parse_page_args({}) == (20, None)
+    assert parse_page_args({'limit': '1000'}) == (MAX_LIMIT, None)
+    with pytest.raises(ValueError):
+        parse_page_args({'limit': '0'})
+    with pytest.raises(ValueError):
+        parse_page_args({'limit': 'ten'})
+
+
+def test_split_page_trims_the_lookahead_row():
+    rows = [('2024-01-03', 3), ('2024-01-02', 2), ('2024-01-01', 1)]
+    page, cursor = split_page(rows, 2, key=lambda row: row)
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == ('2024-01-02', 2)
+    assert split_page(rows, 3, key=lambda row: row) == (rows, None)
+
+
+def test_pages_follow_created_at_then_id_descending(app_module, client, auth_headers):
+    user_id = client.get('/profile', headers=auth_headers).get_json()['user']['id']
+    # Several rows share a timestamp, so the id tiebreak decides their order
+    timestamps = [datetime(2023, 1, 1), datetime(2023, 1, 2), datetime(2023, 1, 2), datetime(2023, 1, 2),
+                  datetime(2023, 1, 3)]
+    with app_module.app.app_context():
+        for n, created_at in enumerate(timestamps):
+            app_module.db.session.add(app_module.SavedQuestionnaire(
+                user_id=user_id, session_id=f'page-order-{n}', symptom='cough', answers={},
+                report={}, severity='Low', created_at=created_at
+            ))
+        app_module.db.session.commit()
+
+    listed, cursor = [], ''
+    while True:
+        page = client.get(f'/my_questionnaires?view=summary&limit=2{cursor}', headers=auth_headers).get_json()
+        assert len(page['questionnaires']) <= 2
+        listed.extend((q['created_at'], q['id']) for q in page['questionnaires'])
+        if not page['has_more']:
+            break
+        cursor = f"&cursor={page['next_cursor']}"
+
+    assert listed == sorted(listed, reverse=True)
+    assert len(set(listed)) == len(listed) == page['count']
@@ -0,0 +1,53 @@
+"""
+Tests for the bounded bcrypt verification pool
+"""
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from password_pool import PasswordPool, PoolSaturated
+
+HASH = bcrypt.hashpw(b'secret', bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+
+def test_check_verifies_passwords():
+    pool = PasswordPool(workers=1)
+    assert pool.check('secret', HASH)
+    assert not pool.check('wrong', HASH)
+    stats = pool.get_stats()['paths']['login']
+    assert stats['calls'] == 2 and stats['rejected'] == 0
+
+
+def test_check_async_verifies_passwords():
+    pool = PasswordPool(workers=1)
+    assert asyncio.run(pool.check_async('secret', HASH))
+
+
+def test_full_queue_is_rejected_at_once():
+    pool = PasswordPool(workers=1, max_queue=0, retry_after=3)
+    release = threading.Event()
+    busy = pool.submit('login', release.wait)
+    try:
+        with pytest.raises(PoolSaturated) as raised:
+            pool.check('secret', HASH)
+        assert raised.value.retry_after == 3
+        assert pool.get_stats()['paths']['login']['rejected'] == 1
+    finally:
+        release.set()
+        busy.result()
+    # The slot is free again once the busy job finished
+    assert pool.check('secret', HASH)
+
+
+def test_job_that_waited_too_long_is_dropped():
+    pool = PasswordPool(workers=1, max_queue=1, max_wait=0.05)
+    release = threading.Event()
+    busy = pool.submit('login', release.wait)
+    queued = pool.submit('login', lambda: True)
+    threading.Timer(0.2, release.set).start()
+    busy.result()
+    with pytest.raises(PoolSaturated):
+        queued.result()
+    assert pool.get_stats()['paths']['login']['expired'] == 1
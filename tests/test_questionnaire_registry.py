@@ -0,0 +1,43 @@
+"""
+Tests for compiled question plans, their answer options and symptom matching
+"""
+from questionnaire_registry import QuestionPlan, SymptomMatcher
+
+TEMPLATE = {
+    'initial_questions': [
+        {'id': 'pain', 'question': 'Pain?', 'type': 'yes_no', 'weight': 'high'},
+        {'id': 'duration', 'question': 'How long?', 'type': 'choice', 'options': ['A day', 'A week']},
+    ],
+    'conditional_questions': {
+        'pain': {'yes': [{'id': 'where', 'question': 'Where?', 'type': 'choice', 'options': ['Left', 'Right']}]}
+    }
+}
+
+
+def test_conditional_questions_follow_their_parent_once():
+    plan = QuestionPlan('test', TEMPLATE)
+    inserted = plan.expand((), 'pain', 'Yes')
+    assert inserted == ('where',)
+    assert plan.expand(inserted, 'pain', 'YES') == inserted
+    assert plan.expand((), 'pain', 'No') == ()
+    assert [q['id'] for q in plan.sequence(inserted)] == ['pain', 'where', 'duration']
+    assert plan.index_of(inserted)['duration'] == 2
+
+
+def test_accepts_only_the_question_options():
+    plan = QuestionPlan('test', TEMPLATE)
+    assert plan.accepts('pain', 'yes')
+    assert plan.accepts('duration', ' A Week ')
+    assert plan.accepts('where', 'Left')
+    assert not plan.accepts('duration', 'Yes')
+    assert not plan.accepts('pain', None)
+    assert not plan.accepts('unknown', 'Yes')
+
+
+def test_symptom_matcher_uses_template_priority():
+    matcher = SymptomMatcher({'headache': ['head', 'migraine'], 'fever': ['fever', 'hot head']}, default='fever')
+    assert matcher.find('hot head and fever') == 'headache'
+    assert matcher.find('MIGRAINE') == 'headache'
+    assert matcher.find('high fever') == 'fever'
+    assert matcher.find('sore knee') is None
+    assert matcher.find(None) is None
@@ -0,0 +1,105 @@
+"""
+Tests that the running (incremental) and batch risk scores equal a full recomputation
+"""
+import random
+
+import pytest
+
+import risk_scoring
+from risk_scoring import SEVERITY_BANDS, severity_for
+
+SYMPTOMS = ['stomach pain', 'headache', 'fever', 'cough', 'lump', 'chest pain', 'rash', 'tired', 'dizzy']
+
+
+def assert_matches_full_score(session):
+    assert session.risk_score == session._scoring.score(session.answers)
+    assert session.answered_count == sum(answer != 'Skipped' for answer in session.answers.values())
+    assert (session.severity, session.urgency) == severity_for(session.risk_score)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_incremental_score_matches_full_score(app_module, seed):
+    rng = random.Random(seed)
+    session = app_module.QuestionnaireSession(f'parity-{seed}', rng.choice(SYMPTOMS), '')
+    for _ in range(60):
+        if session.completed:
+            break
+        move = rng.random()
+        if move < 0.15:
+            session.apply_action('skip')
+        elif move < 0.3:
+            session.apply_action('previous')
+        elif move < 0.4 and session.answers:
+            # Go back to an answered question and change the answer
+            session.current_index = session.question_index(rng.choice(list(session.answers)))
+            question = session.questions[session.current_index]
+            session.apply_action('next', rng.choice(question['options']))
+        else:
+            question = session.questions[session.current_index]
+            session.apply_action('next', rng.choice(question['options']))
+        assert_matches_full_score(session)
+
+    restored = type(session).from_state(session.to_state())
+    assert_matches_full_score(restored)
+    assert restored.risk_score == session.risk_score
+
+
+def test_apply_answers_matches_full_score(app_module):
+    session = app_module.QuestionnaireSession('parity-batch', 'fever', '')
+    answers = {q['id']: q['options'][0] for q in session._plan.questions_by_id.values()}
+    session.apply_answers(answers)
+    assert session.completed
+    assert_matches_full_score(session)
+
+
+def test_severity_bands():
+    for threshold, severity, urgency in SEVERITY_BANDS:
+        assert severity_for(threshold) == (severity, urgency)
+    assert severity_for(-1) == SEVERITY_BANDS[-1][1:]
+
+
+def random_assessments(app_module, count, seed=0):
+    """(template key, answers) pairs with random options, skips and unknown answers"""
+    rng = random.Random(seed)
+    plans = list(app_module.question_plans.values())
+    assessments = []
+    for _ in range(count):
+        plan = rng.choice(plans)
+        answers = {}
+        for question_id, question in plan.questions_by_id.items():
+            roll = rng.random()
+            if roll < 0.1:
+                answers[question_id] = 'Skipped'
+            elif roll < 0.15:
+                answers[question_id] = 'YES '
+            elif roll < 0.9:
+                answers[question_id] = rng.choice(question['options'])
+        answers['not_a_question'] = 'Yes'
+        assessments.append((plan.key, answers))
+    return assessments
+
+
+def expected(app_module, template_key, answers):
+    risk_score = app_module.risk_scorer.tables[template_key].score(answers)
+    severity, urgency = severity_for(risk_score)
+    return {'risk_score': risk_score, 'severity': severity, 'urgency': urgency}
+
+
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_batch_scores_match_single_scores(app_module, monkeypatch, vectorized):
+    if vectorized and risk_scoring.np is None:
+        pytest.skip('NumPy is not installed')
+    if not vectorized:
+        monkeypatch.setattr(risk_scoring, 'np', None)
+    assessments = random_assessments(app_module, 500)
+    results = app_module.risk_scorer.score_batch(assessments)
+    assert results == [expected(app_module, key, answers) for key, answers in assessments]
+    assert app_module.risk_scorer.score_batch([]) == []
+
+
+def test_batch_covers_every_severity_band(app_module):
+    table = app_module.risk_scorer.tables['stomach']
+    everything = {question_id: 'Yes' for question_id in table.weights}
+    results = app_module.risk_scorer.score_batch([('stomach', {}), ('stomach', everything)])
+    assert results[0]['severity'] == 'Low'
+    assert results[1] == expected(app_module, 'stomach', everything)
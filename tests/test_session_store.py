@@ -0,0 +1,64 @@
+"""
+Tests for the in-memory and shared SQLite session stores
+"""
+import os
+import time
+
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_entries=2)
+    store.set('a', 'A')
+    store.set('b', 'B')
+    assert store.get('a') == 'A'
+    store.set('c', 'C')
+    assert 'b' not in store
+    assert store.get('a') == 'A' and store.get('c') == 'C'
+    assert store.get_stats()['evicted_lru'] == 1
+
+
+def test_memory_store_expires_idle_sessions():
+    store = MemorySessionStore(idle_ttl=0.05)
+    store.set('a', 'A')
+    time.sleep(0.1)
+    assert store.get('a') is None
+    assert store.get_stats()['expired_idle'] == 1
+
+
+def sqlite_store(app_module, tmp_path):
+    session_class = app_module.QuestionnaireSession
+    return SQLiteSessionStore(os.path.join(tmp_path, 'sessions.db'), session_class.to_state, session_class.from_state)
+
+
+def test_sqlite_store_round_trips_sessions(app_module, tmp_path):
+    store = sqlite_store(app_module, tmp_path)
+    session = app_module.QuestionnaireSession('shared-1', 'stomach pain', 'cramps')
+    session.apply_action('next', session.questions[0]['options'][0])
+    store.set(session.session_id, session)
+
+    restored = store.get('shared-1')
+    assert restored is not session
+    assert restored.answers == session.answers
+    assert restored.current_index == session.current_index
+    assert restored.get_current_question_json() == session.get_current_question_json()
+    assert restored.get_assessment() == session.get_assessment()
+
+    assert store.delete('shared-1')
+    assert store.get('shared-1') is None
+
+
+def test_sqlite_store_keeps_the_memoized_report(app_module, tmp_path):
+    store = sqlite_store(app_module, tmp_path)
+    session = app_module.QuestionnaireSession('shared-2', 'cough', 'dry cough')
+    session.apply_answers({})
+    report = session.generate_report()
+    store.set(session.session_id, session)
+
+    misses = app_module.report_cache_stats['misses']
+    restored = store.get('shared-2')
+    assert restored.completed
+    # The memoized report survives the round trip instead of being rebuilt
+    assert restored.generate_report() == report
+    assert restored.generate_report_json() == session.generate_report_json()
+    assert app_module.report_cache_stats['misses'] == misses
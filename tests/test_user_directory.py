@@ -0,0 +1,73 @@
+"""
+Tests for the user directory indexes and its read-through cache
+"""
+import time
+
+import pytest
+
+from user_directory import UserDirectory, public_profile
+
+STATIC = [{'id': 1, 'username': 'user1', 'email': 'user1@example.com', 'password_hash': 'x'}]
+
+
+class FakeSource:
+    """In-memory user table counting reads"""
+
+    def __init__(self, users):
+        self.users = {user['id']: dict(user) for user in users}
+        self.reads = 0
+
+    def get(self, field, value):
+        self.reads += 1
+        return next((dict(u) for u in self.users.values() if u[field] == value), None)
+
+    def update(self, user_id, updates):
+        self.users[user_id].update(updates)
+        return dict(self.users[user_id])
+
+
+def directory(ttl=300):
+    source = FakeSource([{'id': 7, 'username': 'dana', 'email': 'dana@example.com', 'full_name': 'Dana'}])
+    return UserDirectory(STATIC, source=source, ttl=ttl), source
+
+
+def test_static_users_are_found_by_every_field_without_the_source():
+    users, source = directory()
+    assert users.by_id(1)['username'] == 'user1'
+    assert users.by_login('user1')['id'] == 1
+    assert users.get('email', 'user1@example.com')['id'] == 1
+    assert source.reads == 0
+    assert 'password_hash' not in public_profile(users.by_id(1))
+
+
+def test_database_users_are_cached_under_all_their_keys():
+    users, source = directory()
+    assert users.by_login('dana')['id'] == 7
+    assert users.by_id(7)['email'] == 'dana@example.com'
+    assert users.get('email', 'dana@example.com')['username'] == 'dana'
+    assert source.reads == 1
+    assert users.get_stats()['hits'] == 2
+
+
+def test_update_invalidates_the_cached_user():
+    users, source = directory()
+    users.by_id(7)
+    users.update_user(7, {'full_name': 'Dana S.'})
+    assert users.by_id(7)['full_name'] == 'Dana S.'
+    assert source.reads == 2
+    with pytest.raises(ValueError):
+        users.update_user(1, {'full_name': 'nope'})
+
+
+def test_cached_users_expire_after_ttl():
+    users, source = directory(ttl=0.05)
+    users.by_id(7)
+    time.sleep(0.1)
+    users.by_id(7)
+    assert source.reads == 2
+
+
+def test_unknown_users_are_not_cached():
+    users, source = directory()
+    assert users.by_login('nobody') is None
+    assert users.get_stats()['cached'] == 0
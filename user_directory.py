@@ -0,0 +1,198 @@
+"""
+User directory for Aushadham
+Provides user lookups by id, username or email: hash indexes over the hardcoded
+accounts, and a TTL+LRU read-through cache in front of the SQLAlchemy or Supabase
+users table, so resolving a JWT identity to a profile is a memory hit
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_FIELDS = ('id', 'username', 'email')
+
+
+def public_profile(user: Dict) -> Dict:
+    """Profile fields of a user that may be returned to clients (no password hash)"""
+    return {
+        'id': user['id'],
+        'username': user['username'],
+        'email': user['email'],
+        'full_name': user.get('full_name', ''),
+        'phone': user.get('phone', ''),
+        'created_at': user.get('created_at')
+    }
+
+
+class SQLAlchemyUserSource:
+    """Reads and updates users through the SQLAlchemy User model"""
+
+    def __init__(self, app, db, model):
+        self.app = app
+        self.db = db
+        self.model = model
+
+    def _record(self, user) -> Dict:
+        return {**user.to_dict(), 'password_hash': user.password_hash}
+
+    def get(self, field: str, value: Any) -> Optional[Dict]:
+        """Get a user by one of LOOKUP_FIELDS"""
+        with self.app.app_context():
+            user = self.model.query.filter_by(**{field: value}).first()
+            return self._record(user) if user else None
+
+    def update(self, user_id: Any, updates: Dict) -> Optional[Dict]:
+        """Update a user's columns; returns the updated user"""
+        with self.app.app_context():
+            user = self.db.session.get(self.model, user_id)
+            if not user:
+                return None
+            for name, value in updates.items():
+                setattr(user, name, value)
+            self.db.session.commit()
+            return self._record(user)
+
+
+class SupabaseUserSource:
+    """Reads and updates users through SupabaseService"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, field: str, value: Any) -> Optional[Dict]:
+        """Get a user by one of LOOKUP_FIELDS"""
+        return getattr(self.service, f'get_user_by_{field}')(value)
+
+    def update(self, user_id: Any, updates: Dict) -> Optional[Dict]:
+        """Update a user's columns; returns the updated user"""
+        return self.service.update_user(user_id, updates)
+
+
+class UserDirectory:
+    """Looks users up in the hardcoded accounts, then in a cached database source
+
+    Hardcoded accounts take precedence and never expire. Database users are cached
+    for ttl seconds (bounding how long another worker's update goes unnoticed) in an
+    LRU of max_entries users; this worker's own update_user invalidates at once.
+    """
+
+    def __init__(self, static_users: Iterable[Dict], source=None, ttl: float = 300, max_entries: int = 10000):
+        self.source = source
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._static = {field: {} for field in LOOKUP_FIELDS}
+        for user in static_users:
+            for field in LOOKUP_FIELDS:
+                self._static[field][user[field]] = user
+        # user id -> (user, expires_at); username/email -> user id for cached users
+        self._entries: "OrderedDict[Any, Tuple[Dict, float]]" = OrderedDict()
+        self._aliases = {'username': {}, 'email': {}}
+        self._lock = threading.Lock()
+        self._stats = {'static_hits': 0, 'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def cached(self, field: str, value: Any) -> Optional[Dict]:
+        """Get a user from memory only (hardcoded or cached), without reaching the source"""
+        user = self._static[field].get(value)
+        if user is not None:
+            self._count('static_hits')
+            return user
+        if self.source is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            user_id = value if field == 'id' else self._aliases[field].get(value)
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                self._stats['hits'] += 1
+                return entry[0]
+            if entry is not None:
+                self._drop(user_id)
+        return None
+
+    def get(self, field: str, value: Any) -> Optional[Dict]:
+        """Get a user by id, username or email, reading through to the source on a miss"""
+        if value is None:
+            return None
+        user = self.cached(field, value)
+        if user is not None or self.source is None:
+            return user
+        self._count('misses')
+        user = self.source.get(field, value)
+        if user is not None:
+            self._store(user)
+        return user
+
+    def by_id(self, user_id: Any) -> Optional[Dict]:
+        """Get a user by id (e.g. a JWT identity)"""
+        return self.get('id', user_id)
+
+    def by_login(self, name: str) -> Optional[Dict]:
+        """Get a user by username or, failing that, email"""
+        return self.get('username', name) or self.get('email', name)
+
+    def is_static(self, user_id: Any) -> bool:
+        """Whether a user id belongs to a hardcoded account"""
+        return user_id in self._static['id']
+
+    def update_user(self, user_id: Any, updates: Dict) -> Optional[Dict]:
+        """Update a database user through the source and drop their cached entry"""
+        if self.is_static(user_id):
+            raise ValueError('Hardcoded users cannot be updated')
+        try:
+            return self.source.update(user_id, updates)
+        finally:
+            self.invalidate(user_id)
+
+    def invalidate(self, user_id: Any) -> None:
+        """Forget a cached database user"""
+        with self._lock:
+            if self._drop(user_id):
+                self._stats['invalidations'] += 1
+
+    def _store(self, user: Dict) -> None:
+        with self._lock:
+            self._drop(user['id'])
+            self._entries[user['id']] = (user, time.monotonic() + self.ttl)
+            for field in self._aliases:
+                if user.get(field) is not None:
+                    self._aliases[field][user[field]] = user['id']
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, user_id: Any) -> bool:
+        # Caller holds the lock
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        for field, aliases in self._aliases.items():
+            if aliases.get(entry[0].get(field)) == user_id:
+                del aliases[entry[0][field]]
+        return True
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> Dict:
+        """Get lookup counters and cache size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached'] = len(self._entries)
+        stats['static'] = len(self._static['id'])
+        stats['source'] = type(self.source).__name__ if self.source else None
+        return stats
+
+
+def get_user_directory(static_users: Iterable[Dict], source=None) -> UserDirectory:
+    """Create the user directory configured from environment variables"""
+    return UserDirectory(
+        static_users,
+        source=source,
+        ttl=float(os.getenv('USER_CACHE_TTL', '300')),
+        max_entries=int(os.getenv('USER_CACHE_MAX_ENTRIES', '10000'))
+    )